@@ -68,10 +68,7 @@ class TractorSiteStatusFilter(TrStatusFilter):
 
         # site status filters are called frequently, so don't perform a rediscovery of plugins and a selector
         # reload all the time
-        self._plugins_initialize = CallIntervalLimiter(
-            lambda: self._plugins.initialize(ignore_duplicates=True),
-            interval=300
-        )
+        self._plugins_refresh = CallIntervalLimiter(self._plugins.refresh, interval=300)
         self._reload_selector = CallIntervalLimiter(reload_selector, interval=300)
 
     def _delegate(self, function, function_args=(), function_kwargs={}, keep_cache=False):
@@ -107,7 +104,7 @@ class TractorSiteStatusFilter(TrStatusFilter):
             # enforce bypassing the plugin cache to ensure implemented sites status filter methods
             # are always up to date
             if ENABLE_PLUGIN_CACHE and not keep_cache:
-                self._plugins_initialize()
+                self._plugins_refresh()
 
             for plugin_name in plugin_names:
 
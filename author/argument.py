@@ -31,9 +31,11 @@ import base64
 from collections import namedtuple
 import json
 import logging
+import mmap
 import os
 import pickle
 import re
+import zlib
 
 from ..constants import (
     BASH_STYLES,
@@ -44,6 +46,117 @@ _LOG = logging.getLogger("{}.argument".format(LOGGING_NAMESPACE))
 
 ArgumentValue = namedtuple("ArgumentValue", ["initial", "processed"])
 
+# The first byte of our serialized (and base64 decoded) arguments identifies the format.
+# Legacy serializations are plain protocol 0 pickles, which never start with one of these.
+SERIALIZATION_PICKLE = "\x01"  # pickle using the highest protocol
+SERIALIZATION_PICKLE_ZLIB = "\x02"  # zlib compressed pickle using the highest protocol
+SERIALIZATION_FORMATS = (SERIALIZATION_PICKLE, SERIALIZATION_PICKLE_ZLIB)
+
+# first line of our indexed arguments cache files, which lets us differ them from legacy json caches
+ARGUMENTS_CACHE_HEADER = "JOBTRONAUT ARGUMENTS CACHE 2\n"
+# each index entry holds the padded key followed by the offset and length of the record as hex
+_INDEX_ENTRY_FORMAT = "{key:<{key_width}}{offset:016x}{length:016x}"
+_INDEX_NUMBER_WIDTH = 16
+
+
+def write_arguments_cache(arguments_cache, f):
+    """ writes serialized arguments as indexed cache file
+
+    The file starts with our header line followed by a line holding the number
+    of records and the width of the keys. Afterwards the index follows as fixed
+    width entries sorted by key, so a reader can look up a key via bisection
+    without parsing the whole index. All records follow right after the index.
+
+    Args:
+        arguments_cache (dict): serialized arguments by key
+        f (file): file object to write to
+    """
+    keys = sorted(arguments_cache.iterkeys())
+    key_width = max([len(key) for key in keys] or [1])
+
+    f.write(ARGUMENTS_CACHE_HEADER)
+    f.write("{0} {1}\n".format(len(keys), key_width))
+
+    offset = 0
+    for key in keys:
+        length = len(arguments_cache[key])
+        f.write(_INDEX_ENTRY_FORMAT.format(key=key, key_width=key_width, offset=offset, length=length))
+        offset += length
+
+    for key in keys:
+        f.write(arguments_cache[key])
+
+
+def read_arguments_cache(filepath, key):
+    """ reads the serialized arguments of a key from a cache file
+
+    The file gets memory mapped, so we only read the pages of the index we
+    need to find the key and the record itself. Legacy json cache files
+    are supported as well.
+
+    Args:
+        filepath (str): path to the cache file
+        key (str): key of the serialized arguments
+
+    Returns:
+        str: serialized arguments
+    """
+    records = read_arguments_cache_records(filepath, [key])
+    if key not in records:
+        raise KeyError(key)
+    return records[key]
+
+
+def read_arguments_cache_records(filepath, keys):
+    """ reads the serialized arguments of several keys from a cache file at once
+
+    Args:
+        filepath (str): path to the cache file
+        keys (list): keys of the serialized arguments
+
+    Returns:
+        dict: serialized arguments by key, keys that don't exist are left out
+    """
+    records = {}
+    with open(filepath, "rb") as f:
+        if f.readline() != ARGUMENTS_CACHE_HEADER:
+            f.seek(0)
+            legacy_cache = json.load(f)
+            return dict([(key, legacy_cache[key]) for key in keys if key in legacy_cache])
+
+        counts = f.readline()
+        count, key_width = [int(_) for _ in counts.split()]
+
+        index_start = len(ARGUMENTS_CACHE_HEADER) + len(counts)
+        entry_width = key_width + 2 * _INDEX_NUMBER_WIDTH
+        data_start = index_start + count * entry_width
+
+        cache = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            for key in keys:
+                if len(key) > key_width:
+                    continue
+                padded_key = key.ljust(key_width)
+                low, high = 0, count
+                while low < high:
+                    middle = (low + high) // 2
+                    position = index_start + middle * entry_width
+                    current = cache[position:position + key_width]
+                    if current < padded_key:
+                        low = middle + 1
+                    elif current > padded_key:
+                        high = middle
+                    else:
+                        numbers = cache[position + key_width:position + entry_width]
+                        offset = int(numbers[:_INDEX_NUMBER_WIDTH], 16)
+                        length = int(numbers[_INDEX_NUMBER_WIDTH:], 16)
+                        records[key] = cache[data_start + offset:data_start + offset + length]
+                        break
+        finally:
+            cache.close()
+
+    return records
+
 
 class Arguments(dict):
     """ class to store job/task arguments
@@ -69,7 +182,7 @@ class Arguments(dict):
             # if this was passes as the serialized string directly or if this
             # could be a potential file where we dumped the serialized data
             if self._pointing_to_cache_file(arguments):
-                _LOG.debug("Deserialize Arguments from file '{}'".format(arguments.split(":")[0]))
+                _LOG.debug("Deserialize Arguments from file '%s'", arguments.split(":")[0])
                 _arguments = self._deserialize_from_file(arguments)
             else:
                 _arguments = self._deserialize(arguments)
@@ -108,7 +221,7 @@ class Arguments(dict):
         """
         initialize = True
         if hasattr(self, name):
-            _LOG.debug("Attribute '{0}' existing with value '{1}'".format(name, self[name]))
+            _LOG.debug("Attribute '%s' existing with value '%s'", name, self[name])
             initialize = False
 
         if hasattr(value, "initial") and hasattr(value, "processed"):
@@ -119,9 +232,9 @@ class Arguments(dict):
             self.__setitem__(name, ArgumentValue(value, value))
 
         if initialize:
-            _LOG.debug("Attribute '{0}' initialized with value '{1}'".format(name, self[name]))
+            _LOG.debug("Attribute '%s' initialized with value '%s'", name, self[name])
         else:
-            _LOG.debug("Attribute '{0}' set to value '{1}'".format(name, self[name]))
+            _LOG.debug("Attribute '%s' set to value '%s'", name, self[name])
 
     def set(self, name, value, initialize=False):
         """ sets an argument value
@@ -152,6 +265,23 @@ class Arguments(dict):
 
         self.set(name, value, initialize=True)
 
+    def copy(self):
+        """ get a copy that shares all ArgumentValues with this instance
+
+        ArgumentValues are immutable, so instead of copying the whole structure
+        we only copy the mapping. As soon as an argument gets changed via `set()`
+        the copy will hold a new ArgumentValue while the original stays untouched.
+        Be aware that the values within the ArgumentValues are shared as well, so
+        they must not be altered in place.
+
+        Returns:
+            Arguments: copy of the arguments
+        """
+        arguments = self.__class__.__new__(self.__class__)
+        dict.update(arguments, self)
+        arguments.__dict__.update(self.__dict__)
+        return arguments
+
     def remove(self, name):
         """ removes an argument
 
@@ -169,14 +299,27 @@ class Arguments(dict):
         except KeyError:
             _LOG.error("Not able to remove argument {}".format(name), exc_info=True)
 
-    def serialized(self):
+    def serialized(self, compress=True):
         """ get arguments as encoded string
 
-        Returns: base64 encoded string, pickeled object
+        The serialized data is prefixed with a header byte that identifies the format.
+
+        Args:
+            compress (bool): if True the data gets compressed whenever this saves space
+
+        Returns: base64 encoded string, versioned pickeled object
 
         """
-        serialized = base64.b64encode(pickle.dumps(self))
-        return serialized
+        data = pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+        header = SERIALIZATION_PICKLE
+
+        if compress:
+            compressed = zlib.compress(data)
+            if len(compressed) < len(data):
+                data = compressed
+                header = SERIALIZATION_PICKLE_ZLIB
+
+        return base64.b64encode(header + data)
 
     def pickle_arguments(self, filepath):
         """ stores pickled arguments within file
@@ -197,13 +340,23 @@ class Arguments(dict):
     def _deserialize(serialized_arguments):
         """ decode and load the serialized arguments
 
+        We support all of our versioned formats as well as the legacy
+        serialization that is a plain protocol 0 pickle.
+
         Args:
             serialized_arguments (str): encoded string arguments
 
         Returns: arguments as dictionary
 
         """
-        return pickle.loads(base64.b64decode(serialized_arguments))
+        data = base64.b64decode(serialized_arguments)
+        header, payload = data[:1], data[1:]
+
+        if header == SERIALIZATION_PICKLE_ZLIB:
+            return pickle.loads(zlib.decompress(payload))
+        elif header == SERIALIZATION_PICKLE:
+            return pickle.loads(payload)
+        return pickle.loads(data)
 
     def _deserialize_from_file(self, string_value):
         """ decode our serialized object from file
@@ -220,9 +373,7 @@ class Arguments(dict):
         assert os.path.isfile(filepath), "File '{}' doesn't exist".format(filepath)
 
         try:
-            with open(filepath, "r") as f:
-                arguments_dump = json.load(f)
-                return self._deserialize(arguments_dump[key])
+            return self._deserialize(read_arguments_cache(filepath, key))
         except (OSError, TypeError, KeyError):
             _LOG.error("Unable to deserialize data from '%s'", filepath)
             raise
@@ -28,18 +28,23 @@ The Job class extends the base tractor.author.Job class and acts as
 the starting point for generating a job with a task hierarchy.
 """
 
+import bisect
 import getpass
-import json
+import gzip
+import itertools
 import logging
 import os
+import re
 import sys
 import tempfile
 import uuid
 import inspect
 
+from collections import defaultdict
 from datetime import date
 
 from tractor.api import author
+from tractor.api.author.base import ModuleEngineClient
 
 from ..constants import (
     ARGUMENTS_STORAGE_PATH,
@@ -50,12 +55,49 @@ from ..constants import (
     TRACTOR_ENGINE
 )
 
+from .argument import write_arguments_cache
 from .plugins import Plugins
-from ..query.command import get_local_state
+from ..query.command import (
+    get_local_state,
+    LOCAL_STATE_ENV
+)
 
 
 _LOG = logging.getLogger("{}.author.job".format(LOGGING_NAMESPACE))
 
+# title of the tasks we use to locate the subtasks within a rendered TCL script
+_TCL_PLACEHOLDER = "__jobtronaut_tcl_placeholder_{}__"
+
+
+class TaskIds(object):
+    """ generates task ids that are unique within a job
+
+    Instances only have to refer to tasks of the same job, so there is no need to ask the OS
+    for a random uuid per task. Instead we count up and only use a random prefix per job,
+    which keeps ids unique when jobs get combined or expanded into a running job. Given a fixed
+    prefix the ids of repeated builds of the same job are identical.
+    """
+
+    def __init__(self, prefix=None):
+        """
+
+        Args:
+            prefix (str, optional): prefix of all ids, a random one will be used if not given
+        """
+        self.prefix = uuid.uuid4().hex if prefix is None else prefix
+        self._counter = itertools.count()
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        """ get the next id
+
+        Returns:
+            str: task id
+        """
+        return "{0}-{1}".format(self.prefix, next(self._counter))
+
 
 # DEPRECATION: obsolete with Python 3.2, because os.makedirs offers the exist_ok keyword argument
 def make_dirs(path, mode=0777):
@@ -85,18 +127,25 @@ class Job(author.Job):
 
     title = "untitled"
 
+    # indexes we maintain while flattening the hierarchy, see `modify_tasks_by_index` and `modify_cmds_by_index`
+    INDEXES = ("class", "title", "service", "tag")
+    _INDEXED_ATTRIBUTES = ("title", "service", "tags")
+
     MEMBERS = author.Job.MEMBERS + [
         "arguments",
         "arguments_cache",
         "arguments_file",
         "job_attributes",
+        "processing_cache",
         "requires_arguments_cache",
         "task",
+        "task_ids",
         "_flat_hierarchy",
         "local"
     ]
 
-    def __init__(self, task, arguments={}, append_instances=True, compact_hierarchy=True, local=None, **kwargs):
+    def __init__(self, task, arguments={}, append_instances=True, compact_hierarchy=True, local=None,
+                 task_id_prefix=None, **kwargs):
         """
 
         Args:
@@ -114,6 +163,8 @@ class Job(author.Job):
             but as regular Command instances that will only run on the spoolhost; if None
             the job initialization handles the command type inheritance automatically when
             running as active command
+            task_id_prefix (str, optional): prefix of the ids of our tasks. By default each job uses a random
+            prefix. A fixed prefix results in identical ids when building the same job again.
             **kwargs ():
         """
         super(Job, self).__init__()
@@ -141,8 +192,11 @@ class Job(author.Job):
         # unfortunately attributes is reserved so we have to name it differently
         self.job_attributes = kwargs.get("job_attributes", {})
         self.arguments_cache = {}
-        self.arguments_file = os.path.join(ARGUMENTS_STORAGE_PATH, "{}.json".format(uuid.uuid4()))
+        # processed arguments of identical processor pipelines our tasks can reuse
+        self.processing_cache = {}
+        self.arguments_file = os.path.join(ARGUMENTS_STORAGE_PATH, "{}.cache".format(uuid.uuid4()))
         self.requires_arguments_cache = False
+        self.task_ids = TaskIds(task_id_prefix)
         self._prepare_attributes(self.job_attributes)
 
         if isinstance(task, str):
@@ -171,7 +225,7 @@ class Job(author.Job):
         return cached result
 
         Returns:
-            dict: "tasks": [], "cmds": []
+            dict: "tasks": [], "cmds": [], "index": {"tasks": {}, "cmds": {}, "positions": {}, "titles": []}
 
         """
         if not self._flat_hierarchy:
@@ -203,7 +257,109 @@ class Job(author.Job):
             job_id=job_id
         )
 
-    def dump_job(self, filepath):
+    def iter_tcl(self, verify=False):
+        """ renders the TCL representation of the job chunk by chunk
+
+        Joining all chunks results in the same script `asTcl()` returns, but
+        we never have to hold the whole script in memory.
+
+        Args:
+            verify (bool): if True we render the job as a whole as well and compare
+            both scripts, so we fall back to the whole script if they differ
+
+        Returns:
+            iterable: yields the TCL script in chunks
+        """
+        if not verify:
+            return self._iter_tcl(self)
+
+        tcl = self.asTcl()
+        if "".join(self._iter_tcl(self)) != tcl:
+            _LOG.warning("Rendering the job chunk by chunk differs from rendering it as a whole. Use the latter.")
+        return [tcl]
+
+    @classmethod
+    def _iter_tcl(cls, element):
+        """ renders an element and its subtasks one after another
+
+        We let tractor render the element with placeholder subtasks and
+        replace those with the rendered subtasks afterwards. In case the
+        placeholders can't be found in the rendered result, we fall back to
+        rendering the element as a whole.
+
+        This assumes that tractor renders a subtask the same way regardless
+        of its depth, e.g. it neither indents nor escapes it depending on its
+        parents. `iter_tcl(verify=True)` verifies this.
+
+        Args:
+            element: job or task to render
+
+        Returns:
+            generator: yields the TCL script in chunks
+        """
+        subtasks = element.attributeByName.get("subtasks")
+        # instances and tasks without subtasks can be rendered as they are
+        if not subtasks or not subtasks.value:
+            yield element.asTcl()
+            return
+
+        children = subtasks.value
+        placeholders = [author.Task(title=_TCL_PLACEHOLDER.format(idx)) for idx in range(2)]
+        subtasks.value = placeholders
+        try:
+            skeleton = element.asTcl()
+        finally:
+            subtasks.value = children
+
+        first, second = [placeholder.asTcl() for placeholder in placeholders]
+        first_start = skeleton.find(first)
+        second_start = skeleton.find(second, first_start + len(first))
+        if first_start < 0 or second_start < 0:
+            yield element.asTcl()
+            return
+
+        separator = skeleton[first_start + len(first):second_start]
+
+        yield skeleton[:first_start]
+        for idx, child in enumerate(children):
+            if idx:
+                yield separator
+            for chunk in cls._iter_tcl(child):
+                yield chunk
+        yield skeleton[second_start + len(second):]
+
+    @staticmethod
+    def _spool(tcl, block=False, owner=None, spoolfile=None, spoolhost=None, hostname=None, port=None):
+        """ spools an already rendered TCL script
+
+        It takes the same arguments as `spool()` and passes them to the engine
+        client the same way, but doesn't render the job again, so we can reuse
+        the script for archiving it.
+
+        Args:
+            tcl (str): the rendered TCL script of the job
+            block (bool): if True it waits for the engine to parse the job
+            owner (str): owner of the job
+            spoolfile (str): path that will be reported as the job's origin
+            spoolhost (str): host that will be reported as the job's origin
+            hostname (str): hostname of the engine
+            port (int): port of the engine
+
+        Returns:
+            str: the engine's response to the spooled job
+        """
+        return ModuleEngineClient.spool(
+            tcl,
+            skipjobscript=False,
+            block=block,
+            owner=owner,
+            filename=spoolfile,
+            spoolhost=spoolhost,
+            hostname=hostname,
+            port=port
+        )
+
+    def dump_job(self, filepath, compress=None, tcl=None):
         """ stores tractor job TCL represention
 
         The generated TCL script can be used by Tractor's job parser.
@@ -216,15 +372,23 @@ class Job(author.Job):
 
         Args:
             filepath (str): path to the script file
+            compress (bool, optional): if True the script gets gzip compressed.
+            If None it will be compressed when the filepath ends with `.gz`
+            tcl (str, optional): an already rendered TCL script; if not given the
+            script will be rendered and written task by task
 
         Returns:
 
         """
+        if compress is None:
+            compress = filepath.endswith(".gz")
+
         try:
             make_dirs(os.path.dirname(filepath))
-            with open(filepath, "w") as f:
-                f.write(self.asTcl())
-                _LOG.info("Dumping job to file: '{}'".format(filepath))
+            with (gzip.open(filepath, "wb") if compress else open(filepath, "w")) as f:
+                for chunk in ([tcl] if tcl is not None else self.iter_tcl()):
+                    f.write(chunk)
+                _LOG.info("Dumping job to file: '%s'", filepath)
         except (IOError, OSError):
             _LOG.error("Unable to dump job file.", exc_info=True)
             raise
@@ -279,7 +443,11 @@ class Job(author.Job):
             spool_args["hostname"] = _tractor_engine_tokens[0]
             spool_args["port"] = int(_tractor_engine_tokens[1])
 
-        job_id = self.spool(
+        # the engine client expects the whole script, so we render it only once
+        # and reuse it for archiving the job
+        tcl = self.asTcl()
+        job_id = self._spool(
+            tcl,
             owner=getpass.getuser(),
             **spool_args
         )
@@ -288,7 +456,7 @@ class Job(author.Job):
             if JOB_STORAGE_PATH_TEMPLATE:
                 # lets store our job as file for later reusage
                 alf_file = self._resolve_job_file(job_id)
-                self.dump_job(alf_file)
+                self.dump_job(alf_file, tcl=tcl)
             else:
                 _LOG.warning(
                     "Option `dump_job` was set to True, but no `JOB_STORAGE_PATH_TEMPLATE` was configured. " +
@@ -307,10 +475,13 @@ class Job(author.Job):
         Returns:
              str: formatted envkey for tractor
         """
-        return "setenv " + " ".join(["{0}={1}".format(key, value) for key, value in ENVIRONMENT_RESOLVER().items()])
+        # a local state passed to us only applies to the command that passed it
+        return "setenv " + " ".join(
+            ["{0}={1}".format(key, value) for key, value in ENVIRONMENT_RESOLVER().items() if key != LOCAL_STATE_ENV]
+        )
 
     def dump_arguments_cache(self, filepath, force=False):
-        """ dumps a json that includes all serialized arguments
+        """ dumps an indexed cache file that includes all serialized arguments
 
         Args:
             filepath (str): path to the arguments we will store as file
@@ -323,38 +494,256 @@ class Job(author.Job):
             try:
                 make_dirs(ARGUMENTS_STORAGE_PATH)
                 with open(filepath, "w") as f:
-                    json.dump(self.arguments_cache, f)
-                    _LOG.info("Dumping arguments cache to file: '{}'".format(filepath))
+                    write_arguments_cache(self.arguments_cache, f)
+                    _LOG.info("Dumping arguments cache to file: '%s'", filepath)
             except IOError:
                 _LOG.error("Unable to dump serialized object.")
                 raise
 
+    @staticmethod
+    def _walk(task):
+        """ walks the task hierarchy in a depth first manner without recursion
+
+        Args:
+            task: the root level task to start the walk
+
+        Returns:
+            generator: yields the tasks in the same order as they appear in the hierarchy
+
+        """
+        stack = [task]
+        while stack:
+            task = stack.pop()
+            yield task
+            # whenever we hit an instance we get None via task.subtasks
+            if task.subtasks:
+                stack.extend(reversed(task.subtasks))
+
+    def iter_tasks(self):
+        """ lazily iterates over all tasks of the hierarchy
+
+        Returns:
+            generator: yields the tasks depth first
+
+        """
+        return self._walk(self.task)
+
+    def iter_cmds(self):
+        """ lazily iterates over all commands of the hierarchy
+
+        Returns:
+            generator: yields the commands of the tasks depth first
+
+        """
+        for task in self._walk(self.task):
+            for cmd in task.attributeByName.get("cmds", []):
+                yield cmd
+
     def _flatten(self, task):
         """ walks the task and cmd hierarchy in a depth first manner and returns
         a dictionary with both as a flattened lists
 
+        While walking the hierarchy we index tasks and commands by their task plugin name,
+        task title, service and tag. Commands will be indexed with the plugin name and title
+        of the task they belong to.
+
         Args:
             task: the root level task to start the walk
 
         Returns:
-            dict: a dict with "cmds" and "tasks"
+            dict: a dict with "cmds", "tasks" and their "index"
 
         """
-        subtasks = {"tasks": [], "cmds": []}
+        subtasks = {
+            "tasks": [],
+            "cmds": [],
+            "index": {
+                "tasks": defaultdict(list),
+                "cmds": defaultdict(list),
+                "positions": {"tasks": {}, "cmds": {}}
+            }
+        }
+        positions = subtasks["index"]["positions"]
+
+        for subtask in self._walk(task):
+            positions["tasks"][id(subtask)] = len(subtasks["tasks"])
+            subtasks["tasks"].append(subtask)
+            self._add_to_index(subtasks["index"]["tasks"], subtask, subtask)
+            for cmd in subtask.attributeByName.get("cmds", []):
+                positions["cmds"][id(cmd)] = len(subtasks["cmds"])
+                subtasks["cmds"].append(cmd)
+                self._add_to_index(subtasks["index"]["cmds"], cmd, subtask)
+
+        # sorted titles allow us to look up title prefixes via bisection
+        subtasks["index"]["titles"] = sorted(set(_.title for _ in subtasks["tasks"]))
 
-        for cmd in task.attributeByName.get("cmds", []):
-            subtasks["cmds"].append(cmd)
+        return subtasks
 
-        subtasks["tasks"].append(task)
+    @staticmethod
+    def _get_attribute_value(element, attribute):
+        """ get the value of a task or command attribute
 
-        # whenever we hit an instance we get None via task.subtasks
-        if task.subtasks:
-            for subtask in task.subtasks:
-                _temp = self._flatten(subtask)
-                subtasks["tasks"].extend(_temp["tasks"])
-                subtasks["cmds"].extend(_temp["cmds"])
+        Args:
+            element: task or command
+            attribute (str): attribute name
 
-        return subtasks
+        Returns:
+            object: the value or None if the element doesn't provide the attribute
+        """
+        attribute = element.attributeByName.get(attribute)
+        return attribute.value if attribute else None
+
+    @staticmethod
+    def _get_class_name(task):
+        """ get the name of the plugin a task was created from
+
+        Tasks with overrides are instances of a subclass named after the
+        original task plugin, so we strip the suffix to index them by the plugin name.
+
+        Args:
+            task: the task
+
+        Returns:
+            str: the task plugin name
+        """
+        if hasattr(task.__class__, "_has_overrides"):
+            return re.sub(r"Overriden$", "", task.__class__.__name__)
+        return task.__class__.__name__
+
+    @classmethod
+    def _get_index_keys(cls, element, task=None):
+        """ get the keys a task or command will be indexed with
+
+        Args:
+            element: the task or command to index
+            task (optional): the task the element belongs to, if not given we
+            skip the keys derived from the task
+
+        Returns:
+            list: ("class"|"title"|"service"|"tag", key) tuples
+        """
+        keys = []
+        if task is not None:
+            keys.append(("class", cls._get_class_name(task)))
+            keys.append(("title", task.title))
+
+        # services are given as comma separated list
+        service = cls._get_attribute_value(element, "service") or ""
+        keys.extend(("service", key) for key in set(_.strip() for _ in service.split(",") if _.strip()))
+
+        tags = cls._get_attribute_value(element, "tags") or []
+        if isinstance(tags, basestring):
+            tags = tags.split()
+        keys.extend(("tag", key) for key in set(tags))
+
+        return keys
+
+    @classmethod
+    def _add_to_index(cls, index, element, task):
+        """ adds a task or command to the given index
+
+        Args:
+            index (dict): maps ("class"|"title"|"service"|"tag", key) to a list of elements
+            element: the task or command to index
+            task: the task the element belongs to
+
+        """
+        for key in cls._get_index_keys(element, task):
+            index[key].append(element)
+
+    def _get_index_entries(self, element, scope):
+        """ get all index entries that depend on the attributes of an element
+
+        The entries of a task include the title based entries of its commands, as
+        the commands are indexed by the title of the task they belong to.
+
+        Args:
+            element: task or command
+            scope (str): "cmds" or "tasks"
+
+        Returns:
+            dict: maps (scope, index key, element id) to the element
+        """
+        if scope == "cmds":
+            return dict(((scope, key, id(element)), element) for key in self._get_index_keys(element))
+
+        entries = dict((("tasks", key, id(element)), element) for key in self._get_index_keys(element, element))
+        for cmd in element.attributeByName.get("cmds", []):
+            entries[("cmds", ("title", element.title), id(cmd))] = cmd
+        return entries
+
+    def _update_index(self, outdated, current):
+        """ updates the index buckets of modified elements
+
+        We only touch the buckets the modified elements leave or join and keep
+        the buckets in hierarchy order, so the flattened lists stay valid.
+
+        Args:
+            outdated (dict): index entries of the modified elements before the modification
+            current (dict): index entries of the modified elements after the modification
+
+        """
+        index = self.flat_hierarchy["index"]
+
+        removals = defaultdict(set)
+        for scope, key, element_id in set(outdated).difference(current):
+            removals[(scope, key)].add(element_id)
+        additions = defaultdict(list)
+        for entry in set(current).difference(outdated):
+            additions[entry[:2]].append(current[entry])
+
+        for scope, key in set(removals).union(additions):
+            bucket = index[scope].get(key, [])
+            if (scope, key) in removals:
+                bucket = [_ for _ in bucket if id(_) not in removals[(scope, key)]]
+            if (scope, key) in additions:
+                positions = index["positions"][scope]
+                bucket = sorted(bucket + additions[(scope, key)], key=lambda _: positions[id(_)])
+
+            if bucket:
+                index[scope][key] = bucket
+            else:
+                index[scope].pop(key, None)
+
+            # keep our sorted titles in sync with the titles of our tasks
+            if scope == "tasks" and key[0] == "title":
+                position = bisect.bisect_left(index["titles"], key[1])
+                exists = position < len(index["titles"]) and index["titles"][position] == key[1]
+                if bucket and not exists:
+                    index["titles"].insert(position, key[1])
+                elif not bucket and exists:
+                    del index["titles"][position]
+
+    def _lookup(self, index, key, scope):
+        """ looks up tasks or commands using our hierarchy index
+
+        Args:
+            index (str): "class", "title", "service" or "tag"
+            key (str): plugin name, title prefix, service or tag to look up
+            scope (str): "cmds" or "tasks"
+
+        Returns:
+            list: matching tasks or commands in hierarchy order
+        """
+        assert index in self.INDEXES, "Invalid index '{0}'. Choose one of {1}".format(index, self.INDEXES)
+
+        hierarchy_index = self.flat_hierarchy["index"]
+        if index != "title":
+            return list(hierarchy_index[scope].get((index, key), []))
+
+        titles = hierarchy_index["titles"]
+        matches = []
+        for position in xrange(bisect.bisect_left(titles, key), len(titles)):
+            if not titles[position].startswith(key):
+                break
+            matches.append(hierarchy_index[scope].get(("title", titles[position]), []))
+
+        if len(matches) == 1:
+            return list(matches[0])
+
+        # titles are not unique in terms of hierarchy order, so we have to restore it
+        selected = set(id(_) for elements in matches for _ in elements)
+        return [_ for _ in self.flat_hierarchy[scope] if id(_) in selected]
 
     def _compact_hierarchy(self, task=None):
         if not task:
@@ -401,7 +790,7 @@ class Job(author.Job):
             instance = author.Instance(title=dependent_id)
             task.addChild(instance)
 
-    def _modify(self, predicate, attribute, value, scope):
+    def _modify(self, predicate, attribute, value, scope, children=None):
         """ modifies task or command attributes if the predicate returns true
 
         Args:
@@ -409,16 +798,35 @@ class Job(author.Job):
             attribute: the attribute to modify
             value: the new value for the attribute or a callable that returns the new value
             scope: "cmds" or "tasks"
+            children (list, optional): tasks or commands to consider instead of the whole hierarchy
 
         Returns:
 
         """
-        for child in self.flat_hierarchy[scope]:
+        if children is None:
+            # there is no need to flatten the whole hierarchy if nobody asked for it yet
+            if self._flat_hierarchy:
+                children = self._flat_hierarchy[scope]
+            else:
+                children = self.iter_tasks() if scope == "tasks" else self.iter_cmds()
+
+        # we only have to maintain our index if it exists already
+        reindex = attribute in self._INDEXED_ATTRIBUTES and self._flat_hierarchy
+        outdated, current = {}, {}
+
+        for child in children:
             if predicate == True or (predicate(child) if callable(predicate) else False):
+                if reindex:
+                    outdated.update(self._get_index_entries(child, scope))
                 if child.attributeByName.get(attribute):
                     child.attributeByName.get(attribute).value = value(child) if callable(value) else value
                 elif getattr(child, attribute):
                     setattr(child, attribute, value(child) if callable(value) else value)
+                if reindex:
+                    current.update(self._get_index_entries(child, scope))
+
+        if reindex:
+            self._update_index(outdated, current)
 
     def modify_tasks(self, predicate=lambda task: False, attribute="", value=""):
         """ calls modify with a "tasks" scope
@@ -446,9 +854,43 @@ class Job(author.Job):
         """
         self._modify(predicate, attribute, value, "cmds")
 
+    def modify_tasks_by_index(self, index, key, attribute="", value=""):
+        """ modifies the tasks found via the hierarchy index
+
+        Compared to `modify_tasks` this only touches the matching tasks instead of
+        evaluating a predicate for each task of the hierarchy.
+
+        Args:
+            index (str): "class" (task plugin name), "title" (task title prefix), "service" or "tag"
+            key (str): the plugin name, title prefix, service or tag to look up
+            attribute: the attribute to modify
+            value: the new value for the attribute or a callable that returns the new value
+
+        Returns:
+
+        """
+        self._modify(True, attribute, value, "tasks", children=self._lookup(index, key, "tasks"))
+
+    def modify_cmds_by_index(self, index, key, attribute="", value=""):
+        """ modifies the commands found via the hierarchy index
+
+        Commands are indexed by the plugin name and title of the task they belong to
+        as well as by their own service and tags.
+
+        Args:
+            index (str): "class" (task plugin name), "title" (task title prefix), "service" or "tag"
+            key (str): the plugin name, title prefix, service or tag to look up
+            attribute: the attribute to modify
+            value: the new value for the attribute or a callable that returns the new value
+
+        Returns:
+
+        """
+        self._modify(True, attribute, value, "cmds", children=self._lookup(index, key, "cmds"))
+
 
 # @todo: maybe find a good way to abstract this and make it resuable inside the task implementation and elsewhere
-def jobs_to_task(jobs, parent_task=None, wait_for_task=None):
+def jobs_to_task(jobs, parent_task=None, wait_for_task=None, task_ids=None):
     """ converts a job dependency representation to a single task dependency
 
     Recursively adds a Job's main task to a given parent task. This allows you
@@ -473,28 +915,32 @@ def jobs_to_task(jobs, parent_task=None, wait_for_task=None):
         parent_task (:obj: `Task`): the parent task that will change recursively
         root_task (:obj: `Task`): the root task that will represent the
                                   main handle for the created dependency
+        task_ids (:obj: `TaskIds`): generates the ids of the tasks we create
 
     Returns:
         Task: the root path holding the generated dependency
 
     """
+    if task_ids is None:
+        task_ids = TaskIds()
+
     if not parent_task:
-        root_task = author.Task({}, title="root", id=str(uuid.uuid4()))
-        jobs_to_task(jobs, parent_task=root_task)
+        root_task = author.Task({}, title="root", id=next(task_ids))
+        jobs_to_task(jobs, parent_task=root_task, task_ids=task_ids)
         return root_task
 
     if isinstance(jobs, tuple):
-        _serialtask = author.Task({}, serialsubtasks=True, title="serial", id=str(uuid.uuid4()))
+        _serialtask = author.Task({}, serialsubtasks=True, title="serial", id=next(task_ids))
         parent_task.addChild(_serialtask)
         parent_task = _serialtask
     elif isinstance(jobs, list):
-        _paralleltask = author.Task({}, title="parallel", id=str(uuid.uuid4()))
+        _paralleltask = author.Task({}, title="parallel", id=next(task_ids))
         parent_task.addChild(_paralleltask)
         parent_task = _paralleltask
 
     for job_or_jobs in jobs:
         if isinstance(job_or_jobs, (tuple, list)):
-            jobs_to_task(job_or_jobs, parent_task=parent_task)
+            jobs_to_task(job_or_jobs, parent_task=parent_task, task_ids=task_ids)
         else:
             # if we don't dump arguments caches here we will lose the connection
             # when submitting a converted tasks from jobs
@@ -23,24 +23,45 @@
 # ######################################################################################################################
 
 import ast
+import glob
+import hashlib
+import json
 import logging
 import os
-import re
 import sys
 import inspect
 import difflib
 import imp
+import marshal
+import tempfile
+import time
 
 from collections import defaultdict
+from multiprocessing.pool import ThreadPool
 
 from ..constants import (
     LOGGING_NAMESPACE,
     PLUGIN_PATH,
+    PLUGIN_MANIFEST_PATH_TEMPLATE,
+    PLUGIN_BYTECODE_CACHE_DIR_TEMPLATE,
+    PLUGIN_PREFETCH_THREADS,
+    ENABLE_LAZY_PLUGIN_LOADING,
     ENABLE_PLUGIN_CACHE
 )
+from ..utilities import (
+    ensure_private_directory,
+    resolve_path_template
+)
 
 _LOG = logging.getLogger("{}.plugins".format(LOGGING_NAMESPACE))
 
+# bump this whenever the layout of the manifest changes
+_MANIFEST_VERSION = 1
+
+TASK = "Task"
+PROCESSOR = "Processor"
+SITESTATUSFILTER = "SiteStatusFilter"
+
 
 class Singleton(object):
     _instance = None
@@ -62,42 +83,215 @@ class Plugins(Singleton):
             self.__sitestatusfilters = dict()
             self.__not_loaded = dict()
             self.__module_paths_map = defaultdict(list)
-            self.initialize()
+            # all plugins by name and the module paths by plugin class for fast lookups
+            self.__plugins = dict()
+            self.__module_paths = dict()
+            self.__sourced = dict()
+            self.__manifest = dict()
+            self.__duplicates = defaultdict(list)
+            # prefetched module sources that haven't been sourced yet
+            self.__sources = dict()
+            # whether all modules of the searchpaths have been sourced
+            self.__complete = False
+            if ENABLE_LAZY_PLUGIN_LOADING:
+                # plugins will be sourced on demand
+                self._update_manifest()
+            else:
+                self.initialize()
+
+    @staticmethod
+    def _list_modules(searchpath):
+        """ List all module files in searchpath that match names and extensions.
+
+        Args:
+            searchpath (str): PLUGIN_PATH environment search path
+
+        Returns:
+             list: tuples of module name and path
+
+        """
+        return [(os.path.splitext(_f)[0], os.path.join(searchpath, _f))
+                for _f in os.listdir(searchpath)
+                if os.path.splitext(_f)[1] == ".py"
+                and os.path.splitext(_f)[0] != "__init__"]
+
+    @staticmethod
+    def _read_source(path):
+        """ Read the source of a module.
+
+        Args:
+            path (str): path to the module
+
+        Returns:
+             str: source of the module
+
+        """
+        with open(path, "rU") as _file:
+            return _file.read()
+
+    # the cache directories we already checked, so we only check (and warn) once per directory
+    _private_directories = {}
+
+    @classmethod
+    def _is_private_directory(cls, path):
+        """ Check once per process if only the current user can access the given directory.
+
+        Args:
+            path (str): path to the directory
+
+        Returns:
+             bool: True if we can safely use the directory
+
+        """
+        if path not in cls._private_directories:
+            cls._private_directories[path] = ensure_private_directory(path)
+        return cls._private_directories[path]
+
+    @classmethod
+    def _compile(cls, path, source):
+        """ Compile the source of a module using our bytecode cache.
+
+        The cache lives outside of the searchpaths, so we neither leave compiled files next to the
+        sources nor depend on the permissions of the searchpaths. Entries are keyed by the module
+        path and the hash of the source, so changed sources will never use outdated bytecode.
+
+        Args:
+            path (str): path to the module
+            source (str): source of the module
+
+        Returns:
+             code: the compiled module code
+
+        """
+        cache_dir = resolve_path_template(PLUGIN_BYTECODE_CACHE_DIR_TEMPLATE)
+        # loading bytecode somebody else placed in the cache would run their code
+        if not cache_dir or not cls._is_private_directory(cache_dir):
+            return compile(source, path, "exec")
+
+        prefix = hashlib.sha1(path).hexdigest()
+        cache_path = os.path.join(cache_dir, "{0}_{1}.pyc".format(prefix, hashlib.sha1(source).hexdigest()))
+        try:
+            with open(cache_path, "rb") as f:
+                if f.read(len(imp.get_magic())) == imp.get_magic():
+                    return marshal.load(f)
+        except (IOError, EOFError, ValueError, TypeError):
+            pass
+
+        code = compile(source, path, "exec")
+        try:
+            # bytecode of previous versions of the module is of no use anymore
+            for outdated_path in glob.glob(os.path.join(cache_dir, "{}_*.pyc".format(prefix))):
+                os.remove(outdated_path)
+            handle, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            with os.fdopen(handle, "wb") as f:
+                f.write(imp.get_magic())
+                marshal.dump(code, f)
+            os.rename(tmp_path, cache_path)
+        except (IOError, OSError):
+            _LOG.debug("Unable to cache bytecode of %s in '%s'.", path, cache_dir, exc_info=True)
+        return code
+
+    @classmethod
+    def _load_source(cls, modulename, path, source):
+        """ Load a module from its source like `imp.load_source` would do, but using our bytecode cache.
+
+        Args:
+            modulename (str): name of the module
+            path (str): path to the module
+            source (str): source of the module
+
+        Returns:
+             module: the loaded module
+
+        """
+        code = cls._compile(path, source)
+        module = sys.modules.get(modulename)
+        created = module is None
+        if created:
+            module = imp.new_module(modulename)
+            sys.modules[modulename] = module
+        module.__file__ = path
+        try:
+            exec code in module.__dict__
+        except:
+            if created:
+                del sys.modules[modulename]
+            raise
+        return module
+
+    def _source_module(self, name, path, index):
+        """ Source a single module.
 
-    def _source_modules(self, searchpath, index):
+        If the source of the module has been prefetched we will use it instead of reading it again.
+        Compiled modules will be cached outside of the searchpaths.
+
+        Args:
+            name (str): module name
+            path (str): path to the module
+            index (int): index that has to be unique to avoid name clashes
+
+        Returns:
+             module: the sourced module or None if it couldn't be sourced
+
+        """
+        modulename = "jobtronaut_{}_{}".format(name, index)
+        try:
+            source = self.__sources.pop(path, None)
+            if source is None:
+                source = self._read_source(path)
+            module = self._load_source(modulename, path, source)
+            _LOG.debug("Sourced %s as module named %s", path, modulename)
+            return module
+        except ImportError as error:
+            message = "Plugins from {0} could not be sourced.\n" \
+                      "ImportError: {1}\n" \
+                      "The missing module needs to be available in your PYTHONPATH" \
+                      .format(path, error.message)
+            _LOG.warning(message)
+            for cls in self._parse_and_find_classes(path):
+                self.__not_loaded[cls] = (path, message)
+        except:
+            _LOG.warning("Plugins from {} could not be sourced.".format(path), exc_info=True)
+
+    def _source_modules(self, searchpath, index, modules=None):
         """ Source all modules in searchpath that match names and extensions.
 
         Args:
             searchpath (str): PLUGIN_PATH environment search path
             index (int): index that has to be unique to avoid name clashes
+            modules (list, optional): tuples of module name and path if the searchpath has been listed already
 
         Returns:
              list: of sourced modules
 
         """
-        modules = []
-        for name, path in [(os.path.splitext(_f)[0], os.path.join(searchpath, _f))
-                                            for _f in os.listdir(searchpath)
-                                            if os.path.splitext(_f)[1] == ".py"
-                                            and os.path.splitext(_f)[0] != "__init__"]:
-            modulename = "jobtronaut_{}_{}".format(name, index)
-            try:
-                modules.append(imp.load_source(modulename, path))
-                _LOG.debug("Sourced {0} as module named {1}".format(path, modulename))
-            except ImportError as error:
-                message = "Plugins from {0} could not be sourced.\n" \
-                          "ImportError: {1}\n" \
-                          "The missing module needs to be available in your PYTHONPATH" \
-                          .format(path, error.message)
-                _LOG.warning(message)
-                for cls in self._parse_and_find_classes(path):
-                    self.__not_loaded[cls] = (path, message)
-            except:
-                _LOG.warning("Plugins from {} could not be sourced.".format(path), exc_info=True)
-        return modules
+        if modules is None:
+            modules = self._list_modules(searchpath)
+
+        sourced = []
+        for name, path in modules:
+            module = self._source_module(name, path, index)
+            self.__sourced[path] = module
+            if module:
+                sourced.append(module)
+        return sourced
 
     @staticmethod
-    def _parse_and_find_classes(path):
+    def _find_classes(source):
+        """ Parse the syntax of the given source and return the names of
+        all top level classes.
+
+        Args:
+            source (str): source of a python module
+
+        Returns:
+             Class Names (str): top level class names in source
+        """
+        node = ast.parse(source)
+        return [cls.name for cls in node.body if isinstance(cls, ast.ClassDef)]
+
+    @classmethod
+    def _parse_and_find_classes(cls, path):
         """ Parse the syntax of the given file and return the names of
         all top level classes.
 
@@ -107,55 +301,530 @@ class Plugins(Singleton):
         Returns:
              Class Names (str): top level class names in module (path)
         """
-        with open(path) as _file:
-            node = ast.parse(_file.read())
-        classes = [cls.name for cls in node.body if isinstance(cls, ast.ClassDef)]
-        return classes
+        return cls._find_classes(cls._read_source(path))
+
+    @classmethod
+    def _fetch_module(cls, path, entry=None):
+        """ Stat and read a module and parse its top level class names.
+
+        Args:
+            path (str): path to the module
+            entry (dict, optional): persisted manifest entry of the module. If given, the module will
+            only be read and parsed if it has changed, otherwise it will only be read.
+
+        Returns:
+            dict: holding the "mtime", "size", "source" and "classes" of the module as far as we got them
+            and the "duration" in seconds it took us
+
+        """
+        start = time.time()
+        fetched = {}
+        try:
+            fetched["mtime"], fetched["size"] = cls._stat_module(path)
+            if not entry or entry["mtime"] != fetched["mtime"] or entry["size"] != fetched["size"]:
+                fetched["source"] = cls._read_source(path)
+        except (IOError, OSError):
+            pass
+        else:
+            if entry is not None and "source" in fetched:
+                try:
+                    fetched["classes"] = cls._find_classes(fetched["source"])
+                except SyntaxError:
+                    fetched["classes"] = []
+        fetched["duration"] = time.time() - start
+        return fetched
+
+    def _prefetch(self, searchpaths, persisted=None):
+        """ Lists, stats and reads the modules of all searchpaths concurrently.
+
+        On network filesystems most of the time is spent waiting for the filesystem rather
+        than executing python code, so we do that within a thread pool before the serial
+        import phase. The read sources will be used as soon as the modules get sourced.
+
+        Args:
+            searchpaths (list): existing PLUGIN_PATH environment search paths
+            persisted (dict, optional): persisted manifest entries by module path. If given,
+            only modules that have changed will be read and their top level class names parsed.
+
+        Returns:
+            dict: by searchpath a list of tuples holding the module name, path and fetched values
+
+        """
+        def _list(searchpath):
+            start = time.time()
+            try:
+                return self._list_modules(searchpath), time.time() - start
+            except OSError:
+                return [], time.time() - start
+
+        def _fetch(path):
+            return self._fetch_module(path, None if persisted is None else persisted.get(path, {}))
+
+        pool = ThreadPool(PLUGIN_PREFETCH_THREADS) if PLUGIN_PREFETCH_THREADS > 1 else None
+        _map = pool.map if pool else map
+        try:
+            listings = dict(zip(searchpaths, _map(_list, searchpaths)))
+            paths = [path for searchpath in searchpaths for _, path in listings[searchpath][0]]
+            fetched = dict(zip(paths, _map(_fetch, paths)))
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+
+        modules = {}
+        for searchpath in searchpaths:
+            listed, duration = listings[searchpath]
+            modules[searchpath] = [(name, path, fetched[path]) for name, path in listed]
+            durations = [_fetched["duration"] for _, _, _fetched in modules[searchpath]]
+            for _, path, _fetched in modules[searchpath]:
+                if "source" in _fetched:
+                    self.__sources[path] = _fetched["source"]
+            _LOG.debug(
+                "Prefetched %s modules from '%s' (listing %.3fs, read %.3fs total, slowest module %.3fs)",
+                len(durations), searchpath, duration, sum(durations), max(durations or [0])
+            )
+        return modules
 
     def initialize(self, ignore_duplicates=False):
         """ Parse all the searchpaths and store the result.
 
         This will (re-)initialize the Plugins singleton and (re-)load all plugins
-        (tasks, processors) that can be found in the PLUGIN_PATH.
+        (tasks, processors) that can be found in the PLUGIN_PATH. Afterwards the
+        plugins manifest knows exactly which module defines which plugin.
         """
         if self.__tasks or self.__processors or self.__sitestatusfilters:
             self._clear()
+        # sources that have been prefetched before might be outdated already
+        self.__sources = dict()
 
         _PLUGIN_PATH = list(set(PLUGIN_PATH))
         _LOG.info("Current jobtronaut plugins searchpaths: {}".format("\n".join(_PLUGIN_PATH)))
 
+        prefetched = {}
+        if PLUGIN_PREFETCH_THREADS:
+            prefetched = self._prefetch([path for path in _PLUGIN_PATH if os.path.exists(path)])
+
         for index, path in enumerate(_PLUGIN_PATH):
             if not os.path.exists(path):
                 _LOG.warning("Defined jobtronaut plugin searchpath '{}' doesn't exist. Ignore path.".format(path))
             else:
                 sys.path.extend(path)
-                for _module in self._source_modules(path, index):
-                    for name, obj in dict(inspect.getmembers(_module, lambda cls: inspect.isclass(cls))).iteritems():
-                        if self.__tasks.get(name) or self.__processors.get(name) or self.__sitestatusfilters.get(name):
-                            if ignore_duplicates:
-                                _LOG.warning("Plugin \"{0}\" has been found multiple times. Using original definition."
-                                             .format(name))
-                                continue
-                            else:
-                                raise AssertionError(
-                                    "Plugin \"{0}\" has been found multiple times. Please make sure "
-                                    "Task, Processor and SiteStatusFilter names are unique.".format(name)
-                                )
-                        if hasattr(_module, "Task") \
-                                and issubclass(obj, _module.Task) \
-                                and not obj.__name__ == "Task":  # exclude the basetask
-                            self.__tasks[name] = obj
-                            self.__module_paths_map[_module.__file__].append(obj)
-                        elif hasattr(_module, "BaseProcessor") \
-                                and issubclass(obj, _module.BaseProcessor) \
-                                and not obj.__name__ == "BaseProcessor":
-                            self.__processors[name] = obj
-                            self.__module_paths_map[_module.__file__].append(obj)
-                        elif hasattr(_module, "TrStatusFilter") \
-                                and issubclass(obj, _module.TrStatusFilter) \
-                                and not obj.__name__ == "TrStatusFilter":
-                            self.__sitestatusfilters[name] = obj
-                            self.__module_paths_map[_module.__file__].append(obj)
+                modules = [(name, _path) for name, _path, _ in prefetched[path]] if path in prefetched else None
+                for _module in self._source_modules(path, index, modules):
+                    self._register_module(_module, ignore_duplicates)
+
+        self.__complete = True
+        self._update_manifest(prefetched=prefetched or None)
+
+    def _register_module(self, _module, ignore_duplicates=False):
+        """ Registers all plugins of a sourced module.
+
+        Args:
+            _module (module): the sourced module
+            ignore_duplicates (bool): if True already registered plugins will be kept,
+            otherwise duplicates will raise an AssertionError
+
+        Returns:
+            dict: plugin kinds by plugin names of the module
+
+        """
+        registered = {}
+        for name, obj in dict(inspect.getmembers(_module, lambda cls: inspect.isclass(cls))).iteritems():
+            existing = self.__plugins.get(name)
+            if existing:
+                if ignore_duplicates:
+                    if existing is not obj:
+                        if name not in self.__duplicates:
+                            self.__duplicates[name].append(self.__module_paths[existing])
+                        self.__duplicates[name].append(_module.__file__)
+                    _LOG.warning("Plugin \"{0}\" has been found multiple times. Using original definition."
+                                 .format(name))
+                    continue
+                else:
+                    raise AssertionError(
+                        "Plugin \"{0}\" has been found multiple times. Please make sure "
+                        "Task, Processor and SiteStatusFilter names are unique.".format(name)
+                    )
+            if hasattr(_module, "Task") \
+                    and issubclass(obj, _module.Task) \
+                    and not obj.__name__ == "Task":  # exclude the basetask
+                self.__tasks[name] = obj
+                registered[name] = TASK
+            elif hasattr(_module, "BaseProcessor") \
+                    and issubclass(obj, _module.BaseProcessor) \
+                    and not obj.__name__ == "BaseProcessor":
+                self.__processors[name] = obj
+                registered[name] = PROCESSOR
+            elif hasattr(_module, "TrStatusFilter") \
+                    and issubclass(obj, _module.TrStatusFilter) \
+                    and not obj.__name__ == "TrStatusFilter":
+                self.__sitestatusfilters[name] = obj
+                registered[name] = SITESTATUSFILTER
+            else:
+                continue
+            self.__plugins[name] = obj
+            self.__module_paths[obj] = _module.__file__
+            self.__module_paths_map[_module.__file__].append(obj)
+
+        return registered
+
+    @classmethod
+    def _get_manifest_path(cls):
+        """ Resolves the manifest path template.
+
+        Returns:
+            str: path to the manifest file or an empty string if no template was configured
+
+        """
+        return resolve_path_template(PLUGIN_MANIFEST_PATH_TEMPLATE)
+
+    def _read_manifest(self):
+        """ Reads the persisted manifest.
+
+        Returns:
+            dict: manifest entries by module path
+
+        """
+        manifest_path = self._get_manifest_path()
+        # entries somebody else placed in the manifest could make us source the wrong modules
+        if not manifest_path or not self._is_private_directory(os.path.dirname(os.path.abspath(manifest_path))) \
+                or not os.path.isfile(manifest_path):
+            return {}
+
+        try:
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+        except (IOError, OSError, ValueError):
+            _LOG.warning("Unable to read plugins manifest '%s'. Ignore it.", manifest_path, exc_info=True)
+            return {}
+
+        if manifest.get("version") != _MANIFEST_VERSION:
+            return {}
+        return manifest.get("modules", {})
+
+    def _write_manifest(self):
+        """ Persists the manifest atomically, so concurrent readers never see a partial file.
+
+        """
+        manifest_path = self._get_manifest_path()
+        directory = os.path.dirname(os.path.abspath(manifest_path))
+        if not manifest_path or not self._is_private_directory(directory):
+            return
+
+        # we might not be the only ones working on the same manifest so let us keep the entries
+        # of modules that are outside of our searchpaths, as long as they still exist
+        searchpaths = set(os.path.normpath(searchpath) for searchpath in PLUGIN_PATH)
+        modules = dict(
+            (path, entry) for path, entry in self._read_manifest().iteritems()
+            if os.path.dirname(path) not in searchpaths and os.path.isfile(path)
+        )
+        modules.update(self.__manifest)
+
+        try:
+            handle, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(handle, "w") as f:
+                json.dump({"version": _MANIFEST_VERSION, "modules": modules}, f)
+            os.rename(tmp_path, manifest_path)
+        except (IOError, OSError):
+            _LOG.warning("Unable to write plugins manifest '%s'.", manifest_path, exc_info=True)
+
+    @staticmethod
+    def _stat_module(path):
+        """ Get the values that tell us if a module has changed.
+
+        Args:
+            path (str): path to the module
+
+        Returns:
+            tuple: mtime and size of the module
+
+        """
+        stat = os.stat(path)
+        return stat.st_mtime, stat.st_size
+
+    def _update_manifest(self, paths=None, prefetched=None):
+        """ Updates the manifest with the modules of all searchpaths.
+
+        Modules that have been sourced by us will be recorded with their registered plugins.
+        For all other modules we keep the persisted entry as long as mtime and size haven't changed.
+        Otherwise we scan the module for top level class names, but we can only know their
+        kind as soon as the module has been sourced.
+
+        Args:
+            paths (list, optional): only update the entries of these module paths
+            prefetched (dict, optional): modules by searchpath as returned by `_prefetch`
+
+        """
+        persisted = self._read_manifest()
+        if paths is None:
+            manifest = {}
+            searchpaths = [
+                (index, searchpath)
+                for index, searchpath in enumerate(list(set(PLUGIN_PATH))) if os.path.exists(searchpath)
+            ]
+            if prefetched is None and PLUGIN_PREFETCH_THREADS:
+                prefetched = self._prefetch([searchpath for _, searchpath in searchpaths], persisted=persisted)
+
+            modules = []
+            for index, searchpath in searchpaths:
+                if prefetched and searchpath in prefetched:
+                    listed = prefetched[searchpath]
+                else:
+                    listed = [(name, path, {}) for name, path in self._list_modules(searchpath)]
+                modules.extend([(name, path, index, fetched) for name, path, fetched in listed])
+        else:
+            manifest = dict(self.__manifest)
+            modules = [
+                (self.__manifest[path]["name"], path, self.__manifest[path]["index"], {}) for path in paths
+            ]
+
+        changed = False
+        for name, path, index, fetched in modules:
+            if "mtime" in fetched:
+                mtime, size = fetched["mtime"], fetched["size"]
+            else:
+                try:
+                    mtime, size = self._stat_module(path)
+                except OSError:
+                    continue
+
+            # copy the entry, otherwise we couldn't notice changes compared to the persisted one
+            entry = dict(persisted.get(path) or {})
+            if path in self.__sourced:
+                module = self.__sourced[path]
+                kinds = self._get_registered_kinds(module) if module else {}
+                entry = {"mtime": mtime, "size": size, "sourced": bool(module), "plugins": kinds}
+            elif not entry or entry["mtime"] != mtime or entry["size"] != size:
+                try:
+                    classes = fetched["classes"] if "classes" in fetched else self._parse_and_find_classes(path)
+                except (IOError, SyntaxError):
+                    classes = []
+                entry = {"mtime": mtime, "size": size, "sourced": False, "plugins": dict.fromkeys(classes)}
+
+            entry.update({"name": name, "index": index})
+            if persisted.get(path) != entry:
+                changed = True
+            manifest[path] = entry
+
+        # sources of modules that have been sourced otherwise are of no use anymore
+        for path in self.__sourced:
+            self.__sources.pop(path, None)
+
+        self.__manifest = manifest
+        if changed:
+            self._write_manifest()
+
+        # as long as not everything has been sourced, the manifest is the only place to notice duplicates
+        if paths is None and not self.__complete and _LOG.isEnabledFor(logging.DEBUG):
+            self._log_duplicates()
+
+    def _log_duplicates(self):
+        """ Logs plugin names that have been registered from multiple modules of our manifest.
+
+        We only know the kinds of plugins from modules that have been sourced before, other
+        top level classes might be anything, so use `validate` to detect duplicates reliably.
+
+        """
+        module_paths = defaultdict(list)
+        for path, entry in sorted(self.__manifest.iteritems(), key=lambda x: (x[1]["index"], x[0])):
+            for name, kind in entry["plugins"].iteritems():
+                if kind:
+                    module_paths[name].append(path)
+
+        for name, paths in sorted(module_paths.iteritems()):
+            if len(paths) < 2:
+                continue
+            _LOG.debug("Plugin \"%s\" has been registered from multiple modules: %s. Please make sure "
+                       "Task, Processor and SiteStatusFilter names are unique.", name, ", ".join(paths))
+
+    def _get_registered_kinds(self, _module):
+        """ Get the kinds of all plugins we registered from the given module.
+
+        Args:
+            _module (module): sourced module
+
+        Returns:
+            dict: plugin kinds by plugin names
+
+        """
+        kinds = {}
+        for obj in self.__module_paths_map.get(_module.__file__, []):
+            if obj.__name__ in self.__tasks:
+                kinds[obj.__name__] = TASK
+            elif obj.__name__ in self.__processors:
+                kinds[obj.__name__] = PROCESSOR
+            elif obj.__name__ in self.__sitestatusfilters:
+                kinds[obj.__name__] = SITESTATUSFILTER
+        return kinds
+
+    def _load_plugin(self, name, kind=None):
+        """ Sources only the modules that define the given plugin.
+
+        We use the manifest to find the modules that define the plugin. If the plugin is
+        unknown to the manifest we have to source all modules we don't know exactly what
+        they define, because plugins can also be created dynamically.
+
+        Args:
+            name (str): plugin name
+            kind (str, optional): "Task", "Processor" or "SiteStatusFilter"
+
+        Returns:
+            bool: True if any module was sourced
+
+        """
+        if self.__complete:
+            return False
+
+        if not self.__manifest:
+            self._update_manifest()
+
+        candidates = [
+            path for path, entry in sorted(self.__manifest.iteritems(), key=lambda x: x[1]["index"])
+            if path not in self.__sourced and name in entry["plugins"]
+            and (not kind or entry["plugins"][name] in (kind, None))
+        ]
+        if not candidates:
+            candidates = [
+                path for path, entry in sorted(self.__manifest.iteritems(), key=lambda x: x[1]["index"])
+                if path not in self.__sourced and not entry["sourced"]
+            ]
+
+        self._source_and_register(candidates)
+        return bool(candidates)
+
+    def _load_all(self):
+        """ Sources all modules that haven't been sourced yet.
+
+        Compared to `initialize` plugins that are already available will be kept and duplicates
+        will be ignored. Use `validate` to check for duplicates.
+
+        """
+        if self.__complete:
+            return
+
+        if not self.__manifest:
+            self._update_manifest()
+
+        self._source_and_register([
+            path for path, entry in sorted(self.__manifest.iteritems(), key=lambda x: x[1]["index"])
+            if path not in self.__sourced
+        ])
+        self.__complete = True
+
+    def _source_and_register(self, paths):
+        """ Sources the given modules of our manifest and registers their plugins.
+
+        Args:
+            paths (list): module paths
+
+        """
+        for path in paths:
+            entry = self.__manifest[path]
+            module = self._source_module(entry["name"], path, entry["index"])
+            self.__sourced[path] = module
+            if module:
+                self._register_module(module, ignore_duplicates=True)
+
+        if paths:
+            self._update_manifest(paths=paths)
+
+    def _unregister_module(self, path):
+        """ Drops all plugins that have been registered from the given module.
+
+        Args:
+            path (str): path to the module
+
+        """
+        module = self.__sourced.pop(path, None)
+        if module:
+            sys.modules.pop(module.__name__, None)
+
+        for obj in self.__module_paths_map.pop(path, []):
+            name = obj.__name__
+            for plugins in (self.__tasks, self.__processors, self.__sitestatusfilters, self.__plugins):
+                if plugins.get(name) is obj:
+                    del plugins[name]
+            self.__module_paths.pop(obj, None)
+
+        for name, (_path, _) in self.__not_loaded.items():
+            if _path == path:
+                del self.__not_loaded[name]
+
+    def refresh(self):
+        """ Reloads only the modules that have changed or have been removed since we know them.
+
+        Compared to `initialize` we only stat the modules of the searchpaths. Sourced modules
+        whose mtime or size changed will be sourced again and the plugins of removed modules will
+        be dropped. All other modules will be sourced on demand as usual, unless everything
+        has been sourced before.
+
+        Returns:
+            list: paths of the modules that have changed or have been removed
+
+        """
+        searchpaths = [
+            (index, searchpath)
+            for index, searchpath in enumerate(list(set(PLUGIN_PATH))) if os.path.exists(searchpath)
+        ]
+        if PLUGIN_PREFETCH_THREADS:
+            prefetched = self._prefetch([searchpath for _, searchpath in searchpaths], persisted=self.__manifest)
+        else:
+            prefetched = {}
+            for _, searchpath in searchpaths:
+                prefetched[searchpath] = []
+                for name, path in self._list_modules(searchpath):
+                    try:
+                        mtime, size = self._stat_module(path)
+                    except OSError:
+                        continue
+                    prefetched[searchpath].append((name, path, {"mtime": mtime, "size": size}))
+
+        current = {
+            path: fetched
+            for _, searchpath in searchpaths for _, path, fetched in prefetched[searchpath] if "mtime" in fetched
+        }
+        outdated = sorted(
+            path for path, entry in self.__manifest.iteritems()
+            if path not in current
+            or (current[path]["mtime"], current[path]["size"]) != (entry["mtime"], entry["size"])
+        )
+
+        reload_paths = []
+        for path in outdated:
+            if path in self.__sourced:
+                if path in current:
+                    reload_paths.append(path)
+                self._unregister_module(path)
+            else:
+                # a module that has never been sourced shouldn't keep outdated sources
+                self.__sources.pop(path, None)
+
+        self._update_manifest(prefetched=prefetched)
+
+        if self.__complete:
+            # new modules have to be sourced as well, so we stay complete
+            reload_paths.extend([
+                path for path, entry in sorted(self.__manifest.iteritems(), key=lambda x: x[1]["index"])
+                if path not in self.__sourced and path not in reload_paths
+            ])
+        self._source_and_register(reload_paths)
+
+        if outdated:
+            _LOG.info("Refreshed plugins of changed or removed modules: %s", ", ".join(outdated))
+        return outdated
+
+    def validate(self):
+        """ Sources all plugins and checks if their names are unique.
+
+        As plugins will be sourced on demand, it's not guaranteed that duplicates will be
+        detected otherwise.
+
+        Returns:
+            dict: module paths by plugin name for all plugins that have been found multiple times
+
+        """
+        self.initialize(ignore_duplicates=True)
+        return dict(self.__duplicates)
 
     def _clear(self):
         """ Initializes the tasks and processors to an empty dict.
@@ -165,6 +834,12 @@ class Plugins(Singleton):
         self.__processors = dict()
         self.__sitestatusfilters = dict()
         self.__module_paths_map = defaultdict(list)
+        self.__plugins = dict()
+        self.__module_paths = dict()
+        self.__sourced = dict()
+        self.__duplicates = defaultdict(list)
+        self.__sources = dict()
+        self.__complete = False
 
     # this is just a static helper we make use of in plugin.info(short=False)
     @staticmethod
@@ -184,6 +859,7 @@ class Plugins(Singleton):
              dict: all available task classes
 
         """
+        self._load_all()
         return self.__tasks
 
     @property
@@ -194,6 +870,7 @@ class Plugins(Singleton):
              dict: all available processor classes
 
         """
+        self._load_all()
         return self.__processors
 
     @property
@@ -204,6 +881,7 @@ class Plugins(Singleton):
              dict: all available sitestatusfilter classes
 
         """
+        self._load_all()
         return self.__sitestatusfilters
 
     @property
@@ -213,10 +891,8 @@ class Plugins(Singleton):
         Returns:
              Plugins (dict): all available plugins
         """
-        all_plugins = self.__tasks.copy()
-        all_plugins.update(self.__processors)
-        all_plugins.update(self.__sitestatusfilters)
-        return all_plugins
+        self._load_all()
+        return self.__plugins
 
     def task(self, name):
         """ Get task class by given name.
@@ -228,6 +904,9 @@ class Plugins(Singleton):
              Task (class): task class
 
         """
+        if name not in self.__tasks:
+            self._load_plugin(name, TASK)
+
         try:
             return self.__tasks[name]
         except KeyError:
@@ -250,6 +929,9 @@ class Plugins(Singleton):
         Returns:
              Processor (class): processor class
         """
+        if name not in self.__processors:
+            self._load_plugin(name, PROCESSOR)
+
         try:
             return self.__processors[name]
         except KeyError:
@@ -265,6 +947,9 @@ class Plugins(Singleton):
         Returns:
              SiteStatusFilter (class): sitestusfilter class
         """
+        if name not in self.__sitestatusfilters:
+            self._load_plugin(name, SITESTATUSFILTER)
+
         try:
             return self.__sitestatusfilters[name]
         except KeyError:
@@ -280,8 +965,11 @@ class Plugins(Singleton):
         Returns:
              Plugin (class): plugin class
         """
+        if name not in self.__plugins:
+            self._load_plugin(name)
+
         try:
-            return self.plugins[name]
+            return self.__plugins[name]
         except KeyError:
             closest = difflib.get_close_matches(name, self.plugins.keys())
             raise KeyError("No plugin found for {0}, closest matches are {1}".format(name, closest))
@@ -295,14 +983,16 @@ class Plugins(Singleton):
         Returns:
             str: The plugin's type as a string
         """
-        assert name in self.plugins, "Plugin {0} could not be found.".format(name)
+        if name not in self.__plugins:
+            self._load_plugin(name)
+        assert name in self.__plugins, "Plugin {0} could not be found.".format(name)
 
         if name in self.__tasks:
-            return "Task"
+            return TASK
         if name in self.__processors:
-            return "Processor"
+            return PROCESSOR
         if name in self.__sitestatusfilters:
-            return "SiteStatusFilter"
+            return SITESTATUSFILTER
 
     def plugin_description(self, name):
         """ Get information for a plugin and return a nicely formatted description
@@ -353,10 +1043,7 @@ class Plugins(Singleton):
             str: path to the compiled module
 
         """
-        plugin = self.plugin(plugin_name)
-        for path, plugins in self.__module_paths_map.items():
-            if plugin in plugins:
-                return re.sub("\.py$", ".py", path)
+        return self.__module_paths.get(self.plugin(plugin_name))
 
     @staticmethod
     def _flatten_nested_iterable(iterable, flat=None):
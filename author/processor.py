@@ -25,15 +25,17 @@
 """BaseProcessors and Processor Schemas to implement custom processors """
 
 from collections import (
+    defaultdict,
     Iterable,
-    namedtuple
+    namedtuple,
+    OrderedDict
 )
 import hashlib
+import itertools
 import logging
 import re
 import os
 from schema import Schema, SchemaError, And, Or, Use
-import uuid
 
 from .argument import (
     Arguments,
@@ -54,7 +56,22 @@ def ProcessorDefinition(name, scope=[], parameters={}):
     return _ProcessorDefinition(name, scope, parameters)
 
 
-MethodStore = namedtuple("MethodStore", ["method", "schema"])
+# marks that no value could be found
+_NO_MATCH = object()
+
+MethodStore = namedtuple("MethodStore", ["method", "schema", "index", "specificity", "types_only"])
+
+# matches the argument names referenced via `<arg: name.state>` within processor parameters
+_ARGUMENT_REFERENCE_RE = re.compile(r"\<\s*arg:\s*(?P<name>[a-zA-Z0-9_\-]*)\.")
+_EXPRESSION_RE = re.compile(r"\<\s*expr:")
+
+# the maximum amount of value shapes we remember the matching overloads for per processor
+_MAX_CACHED_SHAPES = 1024
+
+_CONTAINER_TYPES = (list, tuple, set, frozenset, dict)
+
+# keeps the definition order of the overloads
+_overload_counter = itertools.count()
 
 
 class ProcessorSchemas(object):
@@ -76,7 +93,214 @@ class Overload(type):
         for methodname, method in Overload.methods.iteritems():
             attrs[methodname] = method
         cls.methods = dict()
-        return super(Overload, cls).__new__(cls, name, bases, attrs)
+        processor_cls = super(Overload, cls).__new__(cls, name, bases, attrs)
+
+        # resolve the overloads only once per class instead of on every call
+        processor_cls._overloads = _resolve_overloads(processor_cls)
+        processor_cls._overloads_by_shape = OrderedDict()
+
+        return processor_cls
+
+
+def _resolve_overloads(cls):
+    """ collect all overloads of a class including the inherited ones
+
+    Args:
+        cls (class): processor class
+
+    Returns:
+        dict: method name and a tuple of its MethodStores ordered from specific to broad schemas
+    """
+    stores = {}
+    for _cls in reversed(cls.__mro__):
+        for attrname, value in vars(_cls).iteritems():
+            if isinstance(value, MethodStore):
+                stores[attrname] = value
+
+    overloads = defaultdict(list)
+    for attrname, store in stores.iteritems():
+        overloads[attrname.rsplit("_", 1)[0]].append(store)
+
+    return {
+        methodname: tuple(sorted(_stores, key=lambda store: (-store.specificity, store.index)))
+        for methodname, _stores in overloads.iteritems()
+    }
+
+
+def _get_specificity(schema):
+    """ rates how specific a schema is
+
+    Constraints make a schema more specific whereas alternatives are only
+    as specific as the broadest alternative.
+
+    Args:
+        schema (object): schema or any nested part of it
+
+    Returns:
+        int: specificity where a higher number means more specific
+    """
+    if isinstance(schema, Schema):
+        return _get_specificity(schema._schema)
+    elif isinstance(schema, Or):
+        return min([_get_specificity(_) for _ in schema._args] or [0])
+    elif isinstance(schema, And):
+        return sum([_get_specificity(_) for _ in schema._args])
+    elif schema is object:
+        return 0
+    elif isinstance(schema, type):
+        return 1
+    elif isinstance(schema, (list, tuple, set, frozenset)):
+        return 1 + max([_get_specificity(_) for _ in schema] or [0])
+    elif isinstance(schema, dict):
+        return 1 + max([max(_get_specificity(k), _get_specificity(v)) for k, v in schema.iteritems()] or [0])
+    elif isinstance(schema, Use) or callable(schema):
+        return 1
+    # a literal value
+    return 2
+
+
+def _depends_on_types_only(schema):
+    """ check if a validation against the schema only depends on the types of a value
+
+    Args:
+        schema (object): schema or any nested part of it
+
+    Returns:
+        bool: True if values of the same shape will always give the same validation result
+    """
+    if isinstance(schema, Schema):
+        return _depends_on_types_only(schema._schema)
+    elif isinstance(schema, (And, Or)):
+        return all(_depends_on_types_only(_) for _ in schema._args)
+    elif isinstance(schema, type):
+        return True
+    elif isinstance(schema, (list, tuple, set, frozenset)):
+        return all(_depends_on_types_only(_) for _ in schema)
+    elif isinstance(schema, dict):
+        return all(_depends_on_types_only(k) and _depends_on_types_only(v) for k, v in schema.iteritems())
+    return False
+
+
+def _get_shape(value):
+    """ get the type signature of a value
+
+    The signature consists of the type, a length bucket and the set of the
+    shapes of all items. Schemas validate container items independent of their
+    position, so homogeneous containers of any size share a small signature.
+    We only distinguish empty, single item and larger containers, because
+    converting a value depends on whether it is a single item list.
+
+    Args:
+        value (object): any value
+
+    Returns:
+        object: hashable signature of the value and all nested types
+    """
+    if not isinstance(value, _CONTAINER_TYPES):
+        return type(value)
+
+    if isinstance(value, dict):
+        items = frozenset((_get_shape(k), _get_shape(v)) for k, v in value.iteritems())
+    else:
+        types = set(map(type, value))
+        # most values are flat, so we don't have to walk their items one by one
+        if any(issubclass(_, _CONTAINER_TYPES) for _ in types):
+            items = frozenset(_get_shape(_) for _ in value)
+        else:
+            items = frozenset(types)
+    return type(value), min(len(value), 2), items
+
+
+def _cache_overloads(cls, shape, overloads):
+    """ remember the overloads that might match values of the given shape
+
+    The least recently used shape gets dropped once we reach _MAX_CACHED_SHAPES.
+
+    Args:
+        cls (class): processor class
+        shape (object): shape of a value, nothing gets cached for None
+        overloads (list): MethodStores of the remaining overloads
+    """
+    if shape is None:
+        return
+    cls._overloads_by_shape[shape] = tuple(overloads)
+    if len(cls._overloads_by_shape) > _MAX_CACHED_SHAPES:
+        cls._overloads_by_shape.popitem(last=False)
+
+
+def _match_overload(cls, methodname, argument_name, value):
+    """ find the overload that supports the given value
+
+    Overloads that won't match values of the same shape will be skipped
+    for subsequent calls.
+
+    Args:
+        cls (class): processor class
+        methodname (str): name of the overloaded method
+        argument_name (str): name of the argument the value belongs to
+        value (object): value to validate
+
+    Returns:
+        tuple: the matching MethodStore and the validated value
+    """
+    processor_name = cls.__name__
+    overloads = cls._overloads.get(methodname, ())
+
+    # there is nothing to skip if we only have a single overload
+    shape = _get_shape(value) if len(overloads) > 1 else None
+    # the most recently used shapes are kept at the end
+    candidates = cls._overloads_by_shape.pop(shape, overloads) if shape else overloads
+
+    # If direct validation fails we try a conversion for single element lists and simple
+    # types because those are safe to do. int -> [int], [str] -> str ...
+    if isinstance(value, list) and len(value) == 1:
+        converted = value[0]
+    elif not isinstance(value, Iterable) or isinstance(value, str):
+        converted = [value]
+    else:
+        converted = _NO_MATCH
+
+    remaining = []
+    for index, store in enumerate(candidates):
+        _LOG.debug("%s: Validating argument %s against schema %s\nValue: %s",
+                   processor_name, argument_name, store.schema, value)
+        # this has to be wrapped as schema.validate raises an exception if the schema can't be matched
+        try:
+            valid = store.schema.validate(value)
+            _LOG.debug("%s: Found matching processor implementation for argument \"%s\" with value \"%s\"",
+                       processor_name, argument_name, valid)
+        except SchemaError:
+            _LOG.debug("%s: Purposefully ignoring SchemaError.", processor_name)
+            valid = _NO_MATCH
+
+        if valid is _NO_MATCH and converted is not _NO_MATCH:
+            try:
+                valid = store.schema.validate(converted)
+                _LOG.info("%s: Automatically converted argument \"%s\" from \"%s\" to \"%s\"",
+                          processor_name, argument_name, value, valid)
+            except SchemaError:
+                # we ignore the exceptions here but raise them again later
+                _LOG.debug("%s: Purposefully ignoring SchemaError.", processor_name)
+
+        if valid is _NO_MATCH:
+            # whether the converted value matches depends on the shape as well
+            if not store.types_only:
+                remaining.append(store)
+            continue
+
+        # a schema that only depends on types will always match this shape, so
+        # all following overloads are unreachable
+        remaining.append(store)
+        if not store.types_only:
+            remaining.extend(candidates[index + 1:])
+        _cache_overloads(cls, shape, remaining)
+
+        return store, valid
+
+    _cache_overloads(cls, shape, remaining)
+
+    raise SchemaError("No matching processor has been implemented on {0} for the argument value {1}"
+                      .format(processor_name, value))
 
 
 def schema_to_hex(*args):
@@ -95,7 +319,6 @@ def schema_to_hex(*args):
 
 
 def supported_schemas(*argument):  # contains the actual supported schemas
-    # @todo prefer more specialised schemas over broader schemas so FRAMERANGE will be chosen over [int]
     def inner(func):  # func is the overloaded method
         """ Will be run when the processors are initialized.
         """
@@ -105,61 +328,22 @@ def supported_schemas(*argument):  # contains the actual supported schemas
             assert issubclass(args[0].__class__, BaseProcessor) and func.__name__ == "process", \
                    "Decorator is only supposed to work on process method of BaseProcessor subclasses"
 
-            value = args[2]
-            field = None
-
-            # as valid will be our input we are checking against we want to store a unique identifier
-            # if our initial value got overriden
-            # which means that we didn't raise a SchemaError, so our schema is valid
-            _valid = valid = uuid.uuid4()
-            processor_name = args[0].__class__.__name__
-
-            for fieldname in dir(args[0]):
-                field = getattr(args[0], fieldname)
-
-                if fieldname.startswith(func.__name__) and isinstance(field, MethodStore):
-                    _LOG.debug("{0}: Validating argument {1} against schema {2}\nValue: {3}"
-                              .format(processor_name, args[1], field.schema, value))
-                    # We try to validate it directly first. If validation failes an exception is thrown
-                    # this has to be wrapped as schema.validate raises an exception if the schema can't be matched
-                    try:
-                        valid = field.schema.validate(value)
-                        _LOG.debug("{0}: Found matching processor implementation for argument \"{1}\" with value \"{2}\""
-                                  .format(processor_name, args[1], valid))
-                        break
-                    except SchemaError:
-                        # this exception is separate as we always want to try the automatic conversion ESPECIALLY
-                        # if this raises
-                        _LOG.debug("{0}: Purposefully ignoring SchemaError.".format(processor_name))
-
-                    try:
-                        # If direct validation fails we try and to a conversion for single element lists and simple
-                        # types because those are safe to do. int -> [int], [str] -> str ...
-                        if isinstance(value, list) and len(value) == 1:
-                            valid = field.schema.validate(value[0])
-                            _LOG.info("{0}: Automatically converted argument \"{1}\" from \"{2}\" to \"{3}\""
-                                      .format(processor_name, args[1], args[2], valid))
-                        elif not isinstance(value, Iterable) or isinstance(value, str):
-                            valid = field.schema.validate([value])
-                            _LOG.info("{0}: Automatically converted argument \"{1}\" from \"{2}\" to \"{3}\""
-                                      .format(processor_name, args[1], args[2], valid))
-                    except SchemaError:
-                        # we ignore the exceptions here but raise them again later
-                        _LOG.debug("{0}: Purposefully ignoring SchemaError.".format(processor_name))
-
-            if valid != _valid:
-                new_args = list(args)
-                new_args[2] = valid
-
-                return field.method(*new_args, **kwargs)
-
-            else:
-                raise SchemaError("No matching processor has been implemented on {0} for the argument value {1}"
-                                  .format(processor_name, value))
+            store, valid = _match_overload(args[0].__class__, func.__name__, args[1], args[2])
+
+            new_args = list(args)
+            new_args[2] = valid
+
+            return store.method(*new_args, **kwargs)
 
         schemas = Schema(Or(*argument))
         set_methodname = "{0}_{1}".format(func.__name__, schema_to_hex(schemas))
-        Overload.methods[set_methodname] = MethodStore(method=func, schema=schemas)
+        Overload.methods[set_methodname] = MethodStore(
+            method=func,
+            schema=schemas,
+            index=next(_overload_counter),
+            specificity=_get_specificity(schemas),
+            types_only=_depends_on_types_only(schemas)
+        )
 
         return wrapper
     return inner
@@ -167,11 +351,21 @@ def supported_schemas(*argument):  # contains the actual supported schemas
 
 class BaseProcessor(object):
     """ a basic arguments processor that will direct all required arguments towards task arguments
+
+    When called by its task, the process method gets the task's own copy of the argument
+    value in scope, so it may alter it in place. Other arguments of the task are shared
+    with its parent and sibling tasks and must not be altered.
     """
     __metaclass__ = Overload
     description = "No description has been set."
     parameters = {}
 
+    # if True the results of a pipeline including this processor can be reused, which is only allowed
+    # for processors that don't depend on anything else than the arguments in scope and argument_dependencies
+    cacheable = False
+    # names of the arguments the process method reads from the task in addition to the ones in scope
+    argument_dependencies = []
+
     def __init__(self):
         self.task = None
         self._argument_re = re.compile(r"(?P<to_replace>\<\s*arg:\s*(?P<name>[a-zA-Z0-9_\-]*)\.(?P<state>(initial|processed))\s*\>)")
@@ -206,6 +400,41 @@ class BaseProcessor(object):
     def process(self, argument_name, argument_value, parameters):
         return argument_value
 
+    @classmethod
+    def dependencies(cls, scope, parameters):
+        """ get the names of all arguments the processing result depends on
+
+        Args:
+            scope (:obj:`list` of :obj:`str`): arguments in scope, e.g. `["frames.initial"]`
+            parameters (dict): processor parameters
+
+        Returns:
+            set: argument names
+        """
+        names = set(_.split(".")[0] for _ in scope)
+        names.update(cls.argument_dependencies)
+        for value in parameters.itervalues():
+            if isinstance(value, str):
+                names.update(_ARGUMENT_REFERENCE_RE.findall(value))
+        return names
+
+    @classmethod
+    def is_cacheable(cls, parameters):
+        """ check if the processing result can be reused for identical dependencies
+
+        Expressions get evaluated while processing and might depend on anything,
+        so results of parameters holding an expression will never be reused.
+
+        Args:
+            parameters (dict): processor parameters
+
+        Returns:
+            bool: True if the result can be reused
+        """
+        if not cls.cacheable:
+            return False
+        return not any(isinstance(value, str) and _EXPRESSION_RE.search(value) for value in parameters.itervalues())
+
     def _resolve(self, task, value):
         """ resolves argument values and python expressions
 
@@ -307,16 +536,16 @@ class BaseProcessor(object):
         matches = self._argument_re.finditer(value)
 
         for match in matches:
-            _LOG.debug("Resolving {0} state of argument '{1}' on processor '{2}'".format(
+            _LOG.debug(
+                "Resolving %s state of argument '%s' on processor '%s'",
                 match.groupdict()["state"],
                 match.groupdict()["name"],
                 self.__class__.__name__
-                )
             )
             try:
                 argument_value = getattr(task.arguments, match.groupdict()["name"])
                 resolved = getattr(argument_value, match.groupdict()["state"])
-                _LOG.debug("Resolve ArgumentValue '{0}' to {1}".format(match.groupdict()["name"], resolved))
+                _LOG.debug("Resolve ArgumentValue '%s' to %s", match.groupdict()["name"], resolved)
 
                 value = self._post_resolve(match, value, resolved)
 
@@ -340,8 +569,8 @@ class BaseProcessor(object):
         matches = self._expression_re.finditer(value)
 
         for match in matches:
-            _LOG.debug("Evaluating expression '{0}' on processor '{1}'".format(match.groupdict()["expression"],
-                                                                               self.__class__.__name__))
+            _LOG.debug("Evaluating expression '%s' on processor '%s'", match.groupdict()["expression"],
+                       self.__class__.__name__)
             try:
                 # try if we can evaluate directly without getting any errors, otherwise expect we have a statement
                 resolved = eval(match.groupdict()["expression"])
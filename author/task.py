@@ -34,13 +34,17 @@ and cannot be defined without a task.
 import copy
 
 import difflib
+import hashlib
 import inspect
 import logging
 import os
+import pickle
 import re
 import tempfile
+import threading
 import uuid
 import sys
+import weakref
 
 from collections import Iterable
 from contextlib import contextmanager
@@ -56,6 +60,8 @@ from ..constants import (
     ARGUMENTS_SERIALIZED_MAX_LENGTH,
     BASH_STYLES,
     COMMANDFLAGS_ARGUMENT_NAME,
+    ENABLE_HIERARCHY_PLANNER,
+    ENABLE_PROCESSOR_CACHE,
     EXECUTABLE_RESOLVER,
     LOGGING_NAMESPACE
 )
@@ -69,6 +75,49 @@ from .job import (
 
 _LOG = logging.getLogger("{}.author".format(LOGGING_NAMESPACE))
 
+# the optional methods a task class can implement
+_CAPABILITIES_NAMES = ("cmd", "script", "view", "env")
+# the implemented optional methods by class, see `_get_capabilities`
+_CAPABILITIES = weakref.WeakKeyDictionary()
+
+
+def _get_capabilities(obj):
+    """ get the optional methods a task class implements
+
+    Inspecting a class via `dir()` is expensive, so we only do it once per class.
+
+    Args:
+        obj: task class or instance
+
+    Returns:
+        frozenset: names of the implemented methods
+    """
+    cls = obj if isinstance(obj, type) else obj.__class__
+    try:
+        return _CAPABILITIES[cls]
+    except KeyError:
+        attributes = dir(cls)
+        capabilities = frozenset(
+            [name for name in _CAPABILITIES_NAMES if name in attributes and callable(getattr(cls, name))]
+        )
+        _CAPABILITIES[cls] = capabilities
+        return capabilities
+
+
+class _TaskMeta(type(author.Task)):
+    """ invalidates the cached capabilities whenever a task class gets (un)patched """
+
+    def __setattr__(cls, name, value):
+        super(_TaskMeta, cls).__setattr__(name, value)
+        if name in _CAPABILITIES_NAMES:
+            # subclasses inherit the capabilities, so we can't just forget about this class
+            _CAPABILITIES.clear()
+
+    def __delattr__(cls, name):
+        super(_TaskMeta, cls).__delattr__(name)
+        if name in _CAPABILITIES_NAMES:
+            _CAPABILITIES.clear()
+
 
 class Task(author.Task):
     """ extends the tractor Task class
@@ -102,7 +151,15 @@ class Task(author.Task):
             Example:
             flags = Task.flags.SERIAL | Flags.PER_ELEMENTS
 
+    Notes:
+        A task shares its argument values with its parent and sibling tasks. Processors work on
+        copies of the values in their scope, but everything else like `cmd()`, `script()` or
+        `stop_traversal()` must not alter argument values in place. Use `self.arguments.set()`
+        with a new value instead.
+
     """
+    __metaclass__ = _TaskMeta
+
     # additional members we have to add for the tractor assertions
     MEMBERS = author.Task.MEMBERS + [
         "arguments",
@@ -165,7 +222,7 @@ class Task(author.Task):
         self.title = getattr(self.__class__, "title", "") or self.__class__.__name__
 
         # we automatically add
-        self.id = str(uuid.uuid4())
+        self.id = self._new_id()
 
         # access for instance usage
         self.wait_for_task = wait_for_task
@@ -197,8 +254,29 @@ class Task(author.Task):
         if self.stop_traversal():
             return
 
+        planner = _HierarchyPlanner.active()
+        if planner and planner.job is self.job:
+            # the planner will expand us as soon as it's our turn
+            planner.plan(self, args, kwargs)
+        elif ENABLE_HIERARCHY_PLANNER:
+            _HierarchyPlanner(self.job).run(self, args, kwargs)
+        else:
+            self._expand(*args, **kwargs)
+
+    def _expand(self, *args, **kwargs):
+        """ adds all subtasks to our "null" task
+
+        Depending on the task properties we either add command tasks or the required tasks.
+
+        Args:
+            *args ():
+            **kwargs ():
+
+        Returns:
+
+        """
         if self.is_handle_task and self._has_cmd(self.__class__):
-            _LOG.debug("Handletask {}. Adding simple dependency...".format(self))
+            _LOG.debug("Handletask %s. Adding simple dependency...", self)
             self._add_command_tasks(*args, **kwargs)
         elif self.elements_id and self.per_element and self._is_expected_iterable(getattr(self.elements, "processed", None)):
             for element in self.elements.processed:
@@ -254,6 +332,15 @@ class Task(author.Task):
         self.addCommand(command)
         return command
 
+    def _new_id(self):
+        """ get a new id that is unique within our job
+
+        Returns:
+            str: task id
+        """
+        task_ids = getattr(self.job, "task_ids", None)
+        return next(task_ids) if task_ids else str(uuid.uuid4())
+
     def stop_traversal(self):
         """Decide whether we want to add *this* task as well as all child tasks
         to the hierarchy.
@@ -262,19 +349,19 @@ class Task(author.Task):
 
     @staticmethod
     def _has_cmd(cls):
-        return "cmd" in dir(cls) and callable(cls.cmd)
+        return "cmd" in _get_capabilities(cls)
 
     @staticmethod
     def _has_script(cls):
-        return "script" in dir(cls) and callable(cls.script)
+        return "script" in _get_capabilities(cls)
 
     @staticmethod
     def _has_view(cls):
-        return "view" in dir(cls) and callable(cls.view)
+        return "view" in _get_capabilities(cls)
 
     @staticmethod
     def _has_env(cls):
-        return "env" in dir(cls) and callable(cls.env)
+        return "env" in _get_capabilities(cls)
 
     @staticmethod
     def _is_expected_iterable(obj):
@@ -307,7 +394,7 @@ class Task(author.Task):
         if not self.elements_id:
             assert "elements_id" in self.arguments, "elements_id has to be defined by an upstream task."
             self.elements_id = self.arguments.elements_id.initial
-            _LOG.debug("No element mapper found. Inheriting '{0}' on {1}. ".format(self.elements_id, self))
+            _LOG.debug("No element mapper found. Inheriting '%s' on %s. ", self.elements_id, self)
 
         #_required_arguments.add(self.elements_id)
         self.arguments.set("elements_id", ArgumentValue(self.elements_id, self.elements_id), initialize=True)
@@ -319,14 +406,101 @@ class Task(author.Task):
 
         """
         if self.argument_processors:
-            _LOG.debug("Processing arguments for task {} with processors ".format(self.title) +
-                       ", ".join([processor.__class__.__name__ for processor in self.argument_processors]))
+            cache_key = self._get_processing_cache_key()
+            if cache_key and cache_key in self.job.processing_cache:
+                _LOG.debug("Reusing processed arguments for task %s from identical processor pipeline", self.title)
+                for name, value in self.job.processing_cache[cache_key].iteritems():
+                    self.arguments.set(name, value)
+                return
+
+            # dumping the arguments is expensive, so only do it when it gets logged at all
+            debug = _LOG.isEnabledFor(logging.DEBUG)
+            if debug:
+                _LOG.debug("Processing arguments for task %s with processors %s", self.title,
+                           ", ".join([processor.name for processor in self.argument_processors]))
+            # all values we got are shared with our parent and sibling tasks
+            shared = {id(value): value for argument in self.arguments.itervalues() for value in argument}
             for processor_definition in self.argument_processors:
                 processor = Plugins().processor(processor_definition.name)()
-                stats = (processor, "="*120, self.arguments, "="*120)
-                _LOG.debug("Arguments before processor {0}\n{1}\n{2}{3}".format(*stats))
+                self._copy_shared_values(processor_definition.scope, shared)
+                if debug:
+                    _LOG.debug("Arguments before processor %s\n%s\n%s%s", processor, "="*120, self.arguments, "="*120)
                 processor(self, processor_definition.scope, processor_definition.parameters)
-                _LOG.debug("Arguments after processor {0}\n{1}\n{2}{3}".format(*stats))
+                if debug:
+                    _LOG.debug("Arguments after processor %s\n%s\n%s%s", processor, "="*120, self.arguments, "="*120)
+
+            if cache_key:
+                # processors only alter the arguments in their scope
+                self.job.processing_cache[cache_key] = {
+                    name.split(".")[0]: self.arguments[name.split(".")[0]]
+                    for processor_definition in self.argument_processors
+                    for name in processor_definition.scope
+                }
+
+    def _copy_shared_values(self, scope, shared):
+        """ copies the values in scope that we still share with other tasks
+
+        Processors are allowed to alter the values in their scope in place, so
+        they have to work on our own copies. Each value gets copied only once,
+        values that are never in the scope of a processor won't get copied at all.
+
+        Args:
+            scope (:obj:`list` of :obj:`str`): arguments in scope, e.g. `["frames.initial"]`
+            shared (dict): all values we share with other tasks by their id
+        """
+        for name in scope:
+            argument_name, state = name.split(".")
+            argument = self.arguments.get(argument_name)
+            if argument is None or id(getattr(argument, state)) not in shared:
+                continue
+
+            value = copy.deepcopy(getattr(argument, state))
+            if state == "initial":
+                self.arguments.set(argument_name, ArgumentValue(value, argument.processed))
+            else:
+                self.arguments.set(argument_name, ArgumentValue(argument.initial, value))
+
+    def _get_processing_cache_key(self):
+        """ get the key that identifies the result of our processor pipeline
+
+        The key is made of the task class, the processor definitions and all
+        arguments the processors depend on. Whenever another task of the same job
+        has an identical key, we can reuse its processed arguments.
+
+        Returns:
+            tuple: key to the jobs processing cache, None if the result must not be reused
+        """
+        if not ENABLE_PROCESSOR_CACHE or getattr(self.job, "processing_cache", None) is None:
+            return None
+
+        dependencies = set()
+        definitions = []
+        for processor_definition in self.argument_processors:
+            processor = Plugins().processor(processor_definition.name)
+            if not processor.is_cacheable(processor_definition.parameters):
+                return None
+            dependencies.update(processor.dependencies(processor_definition.scope, processor_definition.parameters))
+            definitions.append(
+                (
+                    processor_definition.name,
+                    processor_definition.scope,
+                    sorted(processor_definition.parameters.items())
+                )
+            )
+
+        try:
+            digest = hashlib.sha1(
+                pickle.dumps(
+                    (definitions, [(name, self.arguments.get(name)) for name in sorted(dependencies)]),
+                    pickle.HIGHEST_PROTOCOL
+                )
+            ).hexdigest()
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # parameters or arguments that can't be pickled can't be compared reliably
+            _LOG.debug("Unable to identify processor pipeline of task %s. Skip processing cache.", self.title)
+            return None
+
+        return self.__class__, digest
 
     def _add_command_tasks(self, *args, **kwargs):
         """ adds the child tasks to our "null" task
@@ -401,22 +575,6 @@ class Task(author.Task):
         Returns:
 
         """
-        class Serial(Task):
-            title = "serial"
-            elements_id = self.elements_id
-            flags = Task.Flags.SERIAL
-            job = self.job
-
-        class Parallel(Task):
-            title = "parallel"
-            elements_id = self.elements_id
-            job = self.job
-
-        # todo: for some reason this check does not work
-        # isinstance(self, (Serial, Parallel)):
-        if self.title in ("serial", "parallel"):
-            return
-
         # store the current task to wait for in a variable so we don't override
         # it in self. When overriding it in self, we destroy the information
         # at the current hierarchy level and propagate the task to wait for
@@ -432,14 +590,14 @@ class Task(author.Task):
         # to our dedicated "handle" tasks
         if not self._has_cmd(parent_task):
             if isinstance(required, tuple) or self.serial:
-                _serialtask = Serial({}, wait_for_task=current_wait_for_task)
+                _serialtask = Serial(self._new_id(), wait_for_task=current_wait_for_task)
                 parent_task.addChild(_serialtask)
                 parent_task = _serialtask
             elif isinstance(required, list):
                 # No need to create nested parallel dependencies. They would be
                 # redundant.
                 if parent_task.title != "parallel":
-                    _paralleltask = Parallel({}, wait_for_task=current_wait_for_task)
+                    _paralleltask = Parallel(self._new_id(), wait_for_task=current_wait_for_task)
                     parent_task.addChild(_paralleltask)
                     parent_task = _paralleltask
 
@@ -464,7 +622,6 @@ class Task(author.Task):
                 if parent_task.title == "serial":
                     current_wait_for_task = last_task.parent
             else:
-                # @todo find a cleaner way to pass the arguments, maybe without deepcopy
                 # check the required task if it should be a regular
                 # or a Task with overrides and
                 # map the actual Task object from the plugins Singleton/
@@ -476,7 +633,9 @@ class Task(author.Task):
                     _required = Plugins().task(_required)
                 _required.job = self.job
 
-                _args = copy.deepcopy(self.arguments)
+                # the required task shares all argument values with us until
+                # it sets its own or a processor touches them
+                _args = self.arguments.copy()
                 _args.set(self.elements_id, elements)
 
                 # the task to wait for has to be passed down the hierarchy so
@@ -503,8 +662,6 @@ class Task(author.Task):
         has_script = self._has_script(task.__class__)
         has_env = self._has_env(task.__class__)
 
-        _cmd_str = "Added command '{0}' to task {1}"
-
         # check if either a command or script has been implemented
         # it's not supported to have both, but it's totally fine to have none
         if has_script and not has_cmd:
@@ -533,7 +690,7 @@ class Task(author.Task):
                 local=local,
                 envkey=self._get_serialized_envkey() if has_env else []
             )
-            _LOG.debug(_cmd_str.format(" ".join(cmd), task))
+            _LOG.debug("Added command '%s' to task %s", " ".join(cmd), task)
 
     def _get_commandlist_with_resolved_executable(self, task):
         """ replaces the first item command list with the proper executable
@@ -572,8 +729,8 @@ class Task(author.Task):
         # we have to check the maximum length of our serialized data
         # and dump it to a unique file
         if len(arguments) > ARGUMENTS_SERIALIZED_MAX_LENGTH:
-            # generate a unique key and associate the arguments in the cache with it
-            key = self._generate_argument_key()
+            # identical arguments of different tasks will share the same key and cache entry
+            key = self._generate_argument_key(arguments)
             self.job.arguments_cache[key] = arguments
             # lets modify the string we will pass to our command which our Arguments object
             # can understand to do the reinitialization from file
@@ -603,11 +760,7 @@ class Task(author.Task):
         """ neutralize all commands of the current task
 
         """
-        from jobtronaut.query import (
-            initialize_engine,
-            tractor_query
-        )
-        initialize_engine()
+        from jobtronaut.query.command import neutralize_commands
 
         # if a command runs he normally has access to the `TR_ENV_* vars,
         # so we know where we want to neutralise all commands
@@ -620,11 +773,7 @@ class Task(author.Task):
 
         _LOG.info("Previous commands exited successfully. We are neutralising them!")
 
-        for command in tractor_query.commands("jid='{}' and tid='{}'".format(job_id, task_id)):
-            # we don't want to lose the original command, so let us know what that was
-            # but only echo it instead of letting it execute again
-            new_argv = ["/bin/echo", "Command has been neutralised:", "{}".format(" ".join(command["argv"]))]
-            tractor_query.cattr(command, key="argv", value=new_argv)
+        neutralize_commands(job_id, task_id)
 
     def _get_commandlist_with_additional_command_flags(self, cmdlist):
         """ get a modified cmdlist of a commandtask and inserts additional commandflags
@@ -649,11 +798,10 @@ class Task(author.Task):
                 for pattern, value in flags_value.items():
                     if re.search(pattern, cmdstring):
                         _LOG.debug(
-                            "Given pattern `{}` matches command `{}`. Flags `{}` will be injected.".format(
-                                pattern,
-                                cmdstring,
-                                value
-                            )
+                            "Given pattern `%s` matches command `%s`. Flags `%s` will be injected.",
+                            pattern,
+                            cmdstring,
+                            value
                         )
                         cmdlist[1:1] = value.split(" ")
             else:
@@ -667,13 +815,19 @@ class Task(author.Task):
         return cmdlist
 
     @staticmethod
-    def _generate_argument_key():
-        """ generates a unique identifier
+    def _generate_argument_key(arguments):
+        """ generates an identifier based on the content of the serialized arguments
 
         The purpose for this method is to make it easier to patch within the automated
         testing.
+
+        Args:
+            arguments (str): serialized arguments
+
+        Returns:
+            str: content hash
         """
-        return str(uuid.uuid4())
+        return hashlib.sha1(arguments).hexdigest()
 
     def _add_view(self, task):
         """ sets chaser on a given task
@@ -829,6 +983,111 @@ class Task(author.Task):
         yield _Progress(final)
 
 
+class _Group(author.Task):
+    """ groups subtasks to run serial or parallel
+
+    Compared to our regular tasks a group neither processes arguments nor expands,
+    it only holds the subtasks that get added to it.
+    """
+    MEMBERS = author.Task.MEMBERS + ["wait_for_task"]
+
+    TITLE = ""
+    serial = False
+
+    def __init__(self, id, wait_for_task=None):
+        """
+
+        Args:
+            id (str): task id
+            wait_for_task (:obj: `Task`): the upstream task the subtasks have to wait for
+        """
+        super(_Group, self).__init__()
+        self.title = self.TITLE
+        self.id = id
+        self.wait_for_task = wait_for_task
+        self.serialsubtasks = self.serial
+
+
+class Serial(_Group):
+    """ runs its subtasks one after another """
+    TITLE = "serial"
+    serial = True
+
+
+class Parallel(_Group):
+    """ runs its subtasks in parallel """
+    TITLE = "parallel"
+
+
+class _HierarchyPlanner(object):
+    """ expands task hierarchies iteratively
+
+    Without a planner each task would expand its whole subtree within its constructor,
+    which costs a lot of stack frames and is limited by the recursion limit. While a planner
+    is running, tasks of its job only plan their expansion within their constructor. The
+    planner expands them one after another in the same depth-first order the recursion would
+    do, so the resulting hierarchy is exactly the same. As a consequence a task doesn't hold
+    its subtasks yet when its constructor returns.
+    """
+    _local = threading.local()
+
+    def __init__(self, job):
+        """
+
+        Args:
+            job (:obj: `Job`): the job all planned tasks belong to
+        """
+        self.job = job
+        self._pending = []
+        self._planned = []
+
+    @classmethod
+    def active(cls):
+        """ get the planner that is currently running in this thread
+
+        Returns:
+            _HierarchyPlanner: the running planner or None
+        """
+        return getattr(cls._local, "planner", None)
+
+    def plan(self, task, args, kwargs):
+        """ plans the expansion of a task
+
+        Args:
+            task (:obj: `Task`): task to expand
+            args (tuple): positional arguments the task has been created with
+            kwargs (dict): keyword arguments the task has been created with
+
+        Returns:
+
+        """
+        self._planned.append((task, args, kwargs))
+
+    def run(self, task, args, kwargs):
+        """ expands the given task and all tasks that get planned meanwhile
+
+        Args:
+            task (:obj: `Task`): root task of the hierarchy
+            args (tuple): positional arguments the task has been created with
+            kwargs (dict): keyword arguments the task has been created with
+
+        Returns:
+
+        """
+        previous = self.active()
+        self._local.planner = self
+        try:
+            self._pending.append((task, args, kwargs))
+            while self._pending:
+                _task, _args, _kwargs = self._pending.pop()
+                _task._expand(*_args, **_kwargs)
+                # subtasks have to be expanded before the next sibling of their parent
+                self._pending.extend(reversed(self._planned))
+                self._planned = []
+        finally:
+            self._local.planner = previous
+
+
 class TaskWithOverrides(object):
     """ An extension to existing Tasks
 
@@ -940,7 +1199,7 @@ class TaskWithOverrides(object):
         # TODO: we should prevent overrides for protected and private members
         self._allowed_overrides = task_dict.keys()
 
-        _LOG.debug("Designated Task to override {}".format(task_cls))
+        _LOG.debug("Designated Task to override %s", task_cls)
 
         # lets store the overrides
         overrides = {}
@@ -963,8 +1222,9 @@ class TaskWithOverrides(object):
             # create the subclass based on overrides
             task_with_overrides = type(task_cls.__name__+ "Overriden", (task_cls,), overrides)
             task_with_overrides._has_overrides = True
-            overrides_msg = ["'{0}' : {1}".format(key, value) for key, value in overrides.iteritems()]
-            _LOG.debug("Generated Task with effective overrides: \n" + "=" * 70 + "\n" + "\n".join(overrides_msg))
+            if _LOG.isEnabledFor(logging.DEBUG):
+                overrides_msg = ["'{0}' : {1}".format(key, value) for key, value in overrides.iteritems()]
+                _LOG.debug("Generated Task with effective overrides: \n" + "=" * 70 + "\n" + "\n".join(overrides_msg))
 
             return task_with_overrides
         else:
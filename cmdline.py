@@ -26,7 +26,10 @@
 
 import argparse
 import ast
+import json
 import logging
+import re
+import sys
 
 from .author.plugins import Plugins
 from .author import Job
@@ -129,15 +132,26 @@ def parse_args():
                              help="Specify the plugin name for which you want more information.")
     info_parser.set_defaults(func=info)
 
+    validate_parser = subparsers.add_parser("validate", help="Check if all plugin names are unique.")
+    validate_parser.set_defaults(func=validate)
+
     query_parser = subparsers.add_parser("arguments", help="Handle existing jobtronaut job/task arguments.")
     query_parser.add_argument(
-        "search", type=str, help="A task id to extract the arguments object from."
-
+        "search", type=str,
+        help="A task id (`<jid>:<tid>`), a job id or any Tractor search clause to extract the arguments objects from."
     )
     query_parser.add_argument(
         "--filter", type=str, default=".*",
         help="A regex pattern to filter argument names. Default: '.*'"
     )
+    query_parser.add_argument(
+        "--json", action="store_const", const=True, default=False,
+        help="Stream the arguments of each command as JSON lines."
+    )
+    query_parser.add_argument(
+        "--processes", type=int, default=0,
+        help="Number of processes to decode the arguments. Default: number of cpus"
+    )
     query_parser.set_defaults(func=arguments)
 
     args = parser.parse_args()
@@ -193,12 +207,50 @@ def info(args):
     print(Plugins().plugin(args.plugin).info(short=False))
 
 
-def arguments(args):
+def validate(args):
+    duplicates = Plugins().validate()
+    if not duplicates:
+        print("{FG_GREEN}All plugin names are unique.{END}".format(**BASH_STYLES))
+        return
+
+    for name, paths in sorted(duplicates.items()):
+        print(
+            "{BG_DARKRED}{FG_WHITE}Plugin \"{0}\" has been found multiple times:{END}\n\t{1}".format(
+                name, "\n\t".join(paths), **BASH_STYLES
+            )
+        )
+    sys.exit(1)
+
 
-    from .query.arguments import get_arguments_objects
+def arguments(args):
 
-    _arguments = get_arguments_objects(args.search)
-    if not _arguments:
+    from .query.arguments import iter_arguments
+
+    found = False
+    for command, _arguments, error in iter_arguments(args.search, processes=args.processes or None):
+        found = True
+        if args.json:
+            record = dict(command)
+            if error:
+                record["error"] = error
+            else:
+                record["arguments"] = dict(
+                    [
+                        (key, {"initial": value.initial, "processed": value.processed})
+                        for key, value in _arguments.iteritems() if re.search(args.filter, key)
+                    ]
+                )
+            sys.stdout.write(json.dumps(record, sort_keys=True, default=repr) + "\n")
+            sys.stdout.flush()
+        elif error:
+            print(
+                "{BG_DARKRED}{FG_WHITE}{0[jid]}:{0[tid]} (cid {0[cid]}): {1}{END}".format(command, error, **BASH_STYLES)
+            )
+        else:
+            print("{BOLD}{0[jid]}:{0[tid]} (cid {0[cid]}){END}".format(command, **BASH_STYLES))
+            print(_arguments.info(key_filter=args.filter))
+
+    if not found and not args.json:
         print(
             (
                 "{{BG_DARKRED}}{{FG_WHITE}}No arguments objects found for given tractor search `{}`. "
@@ -208,6 +260,3 @@ def arguments(args):
                 args.search
             ).format(**BASH_STYLES)
         )
-    else:
-        for __arguments in _arguments:
-            print(__arguments.info(key_filter=args.filter))
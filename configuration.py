@@ -25,6 +25,7 @@
 """ The default jobtronaut configuration to show what is configurable """
 
 import os
+import tempfile
 
 from collections import OrderedDict
 
@@ -36,6 +37,16 @@ KATANA_SCRIPT_WRAPPER = os.path.join(os.path.dirname(__file__), "author", "scrip
 NUKE_SCRIPT_WRAPPER = os.path.join(os.path.dirname(__file__), "author", "scripts", "nukescript.py")
 CLARISSE_SCRIPT_WRAPPER = os.path.join(os.path.dirname(__file__), "author", "scripts", "clarissescript.py")
 
+# Whether tasks of the same job should reuse the processed arguments of an identical processor pipeline.
+# Processors have to opt in by setting their `cacheable` attribute to True, parameters holding an `<expr: >` never do.
+ENABLE_PROCESSOR_CACHE = True
+
+# Whether task hierarchies should be expanded iteratively by a planner instead of letting each task expand its
+# subtree recursively within its constructor. The resulting hierarchy is the same, but the planner is not limited
+# by the recursion limit. Note that subtasks won't be available within the constructor of a task anymore, so
+# tasks that access `subtasks` after calling the constructor of their base class have to be adapted first.
+ENABLE_HIERARCHY_PLANNER = False
+
 # the maximum character limit our serialized arguments string can have
 # when hitting the limit we dump the content to a file instead of passing it
 # to the command directly
@@ -55,12 +66,39 @@ TRACTOR_ENGINE = ""
 # to keep the engine user credentials more secret a function callable can be defined
 # that would return the credentials tuple (username, password)
 TRACTOR_ENGINE_CREDENTIALS_RESOLVER = lambda: ("unknown_user", "unknown_password")
+# Where to cache the engine session id per engine and user, so successive processes can reuse a validated session
+# instead of logging in again. The directory must only be accessible by the current user, otherwise the cache won't
+# be used. The placeholders {user}, {host} and {tmpdir} will be resolved. An empty string disables it.
+TRACTOR_ENGINE_SESSION_CACHE_DIR_TEMPLATE = os.path.join(os.path.expanduser("~"), ".cache", "jobtronaut", "sessions")
+# How many seconds a cached engine session will be reused and after which a running process validates its session
+# again. Use 0 to disable caching sessions on disk.
+TRACTOR_ENGINE_SESSION_TTL = 3600
+# How many commands will be neutralized concurrently and how often a failed attempt will be retried.
+# All threads share the engine client of tractor's query api, which isn't documented to be thread safe.
+# So only use more than one thread if you made sure your engine client handles concurrent requests.
+NEUTRALIZE_COMMANDS_THREADS = 1
+NEUTRALIZE_COMMANDS_RETRIES = 3
 
 # The searchpaths for any kind of plugins (tasks/processors)
 PLUGIN_PATH = []
 # Whether the plugin path should only be resolved once and read from a cache for successive accesses.
 # You can use Plugins().initialize() to force a resolve of the plugin paths at any time.
 ENABLE_PLUGIN_CACHE = True
+# Whether plugins should only be sourced when they get requested. This speeds up the startup, but duplicated
+# plugin names will only be noticed for modules that get sourced. Use `jobtronaut validate` to check for duplicates
+# explicitly.
+ENABLE_LAZY_PLUGIN_LOADING = True
+# Where to persist the manifest that maps plugin names to the modules defining them, so we only have to source
+# the modules we need. The directory must only be accessible by the current user, otherwise the manifest won't be
+# used. The placeholders {user}, {host} and {tmpdir} will be resolved. An empty string disables it.
+PLUGIN_MANIFEST_PATH_TEMPLATE = os.path.join(tempfile.gettempdir(), "jobtronaut_{user}", "plugins_manifest.json")
+# Where to cache the compiled plugin modules, keyed by their path and source hash. This avoids compiling them again
+# without writing into the searchpaths. The directory must only be accessible by the current user, otherwise the
+# cache won't be used. The placeholders {user}, {host} and {tmpdir} will be resolved. An empty string disables it.
+PLUGIN_BYTECODE_CACHE_DIR_TEMPLATE = os.path.join(os.path.expanduser("~"), ".cache", "jobtronaut", "bytecode")
+# How many threads to use for listing, reading and parsing plugin modules before they get sourced. Especially on
+# network filesystems this hides most of the latency. Use 0 to disable prefetching.
+PLUGIN_PREFETCH_THREADS = 8
 
 # A resolver for converting a command id like `maya` into an absolute path.
 # A command id is always the first item in the list that gets returned by task.cmd()
@@ -102,6 +102,22 @@ KATANA_SCRIPT_WRAPPER = _get_configuration_value("KATANA_SCRIPT_WRAPPER")
 NUKE_SCRIPT_WRAPPER = _get_configuration_value("NUKE_SCRIPT_WRAPPER")
 CLARISSE_SCRIPT_WRAPPER = _get_configuration_value("CLARISSE_SCRIPT_WRAPPER")
 
+ENABLE_PROCESSOR_CACHE = _get_configuration_value(
+    "ENABLE_PROCESSOR_CACHE",
+    validator=(
+        lambda x: isinstance(x, bool),
+        "ENABLE_PROCESSOR_CACHE value must be of type bool."
+    )
+)
+
+ENABLE_HIERARCHY_PLANNER = _get_configuration_value(
+    "ENABLE_HIERARCHY_PLANNER",
+    validator=(
+        lambda x: isinstance(x, bool),
+        "ENABLE_HIERARCHY_PLANNER value must be of type bool."
+    )
+)
+
 ARGUMENTS_SERIALIZED_MAX_LENGTH = _get_configuration_value("ARGUMENTS_SERIALIZED_MAX_LENGTH")
 ARGUMENTS_STORAGE_PATH = _get_configuration_value("ARGUMENTS_STORAGE_PATH")
 
@@ -134,6 +150,38 @@ TRACTOR_ENGINE_CREDENTIALS_RESOLVER = _get_configuration_value(
     )
 )
 
+TRACTOR_ENGINE_SESSION_CACHE_DIR_TEMPLATE = _get_configuration_value(
+    "TRACTOR_ENGINE_SESSION_CACHE_DIR_TEMPLATE",
+    validator=(
+        lambda x: isinstance(x, basestring),
+        "TRACTOR_ENGINE_SESSION_CACHE_DIR_TEMPLATE value must be of type string."
+    )
+)
+
+TRACTOR_ENGINE_SESSION_TTL = _get_configuration_value(
+    "TRACTOR_ENGINE_SESSION_TTL",
+    validator=(
+        lambda x: isinstance(x, int) and x >= 0,
+        "TRACTOR_ENGINE_SESSION_TTL value must be a positive integer or 0."
+    )
+)
+
+NEUTRALIZE_COMMANDS_THREADS = _get_configuration_value(
+    "NEUTRALIZE_COMMANDS_THREADS",
+    validator=(
+        lambda x: isinstance(x, int) and x > 0,
+        "NEUTRALIZE_COMMANDS_THREADS value must be a positive integer."
+    )
+)
+
+NEUTRALIZE_COMMANDS_RETRIES = _get_configuration_value(
+    "NEUTRALIZE_COMMANDS_RETRIES",
+    validator=(
+        lambda x: isinstance(x, int) and x >= 0,
+        "NEUTRALIZE_COMMANDS_RETRIES value must be a positive integer or 0."
+    )
+)
+
 PLUGIN_PATH = _get_configuration_value(
     "PLUGIN_PATH",
     validator=(
@@ -150,6 +198,38 @@ ENABLE_PLUGIN_CACHE = _get_configuration_value(
     )
 )
 
+ENABLE_LAZY_PLUGIN_LOADING = _get_configuration_value(
+    "ENABLE_LAZY_PLUGIN_LOADING",
+    validator=(
+        lambda x: isinstance(x, bool),
+        "ENABLE_LAZY_PLUGIN_LOADING value must be of type bool."
+    )
+)
+
+PLUGIN_MANIFEST_PATH_TEMPLATE = _get_configuration_value(
+    "PLUGIN_MANIFEST_PATH_TEMPLATE",
+    validator=(
+        lambda x: isinstance(x, basestring),
+        "PLUGIN_MANIFEST_PATH_TEMPLATE value must be of type string."
+    )
+)
+
+PLUGIN_BYTECODE_CACHE_DIR_TEMPLATE = _get_configuration_value(
+    "PLUGIN_BYTECODE_CACHE_DIR_TEMPLATE",
+    validator=(
+        lambda x: isinstance(x, basestring),
+        "PLUGIN_BYTECODE_CACHE_DIR_TEMPLATE value must be of type string."
+    )
+)
+
+PLUGIN_PREFETCH_THREADS = _get_configuration_value(
+    "PLUGIN_PREFETCH_THREADS",
+    validator=(
+        lambda x: isinstance(x, int) and x >= 0,
+        "PLUGIN_PREFETCH_THREADS value must be a positive integer or 0."
+    )
+)
+
 EXECUTABLE_RESOLVER = _get_configuration_value(
     "EXECUTABLE_RESOLVER",
 )
@@ -53,6 +53,9 @@ class FilePatternProcessor(BaseProcessor):
         "recursive": True
     }
 
+    # the result depends on the filesystem state
+    cacheable = False
+
     @staticmethod
     def _find_files(root, pattern=r".*", recursive=True):
         """ help to find files recursively matching a regex pattern
@@ -96,6 +99,9 @@ class ChunkProcessor(BaseProcessor):
         "chunkhandles": [0, 0]
     }
 
+    argument_dependencies = ["chunksize"]
+    cacheable = True
+
     @supported_schemas(ProcessorSchemas.FRAMERANGE)
     def process(self, argument_name, argument_value, parameters):
         chunksize = self.task.arguments.chunksize.processed
@@ -131,6 +137,8 @@ class ExpressionToElementsProcessor(BaseProcessor):
     [1001, 1002, 1005, 1010, ...]
     """
 
+    cacheable = True
+
     @supported_schemas(str)
     def process(self, argument_name, argument_value, parameters):
         import re
@@ -155,6 +163,8 @@ class RangeToExpressionProcessor(BaseProcessor):
     We assume that a range will always be ascending.
     """
 
+    cacheable = True
+
     @supported_schemas(ProcessorSchemas.FRAMERANGE)
     def process(self, argument_name, argument_value, parameters):
         return "{0}-{1}".format(argument_value[0], argument_value[-1])
@@ -172,6 +182,8 @@ class ElementsToRangesProcessor(BaseProcessor):
         "sort": True
     }
 
+    cacheable = True
+
     # @todo implement chunksize into this processor
     @supported_schemas([int])
     def process(self, argument_name, argument_value, parameters):
@@ -200,6 +212,8 @@ class ElementsToEnclosingRangeProcessor(BaseProcessor):
     the lowest number as start and highest number as end of a range.
     """
 
+    cacheable = True
+
     @supported_schemas(Schema([int]))
     def process(self, argument_name, argument_value, parameters):
         argument_value.sort()
@@ -215,6 +229,8 @@ class ValueFromKeyProcessor(BaseProcessor):
         "default": None
     }
 
+    cacheable = True
+
     @supported_schemas(dict)
     def process(self, argument_name, argument_value, parameters):
         default = parameters.get("default", self.parameters["default"])
@@ -229,6 +245,8 @@ class RangesToElementsProcessor(BaseProcessor):
     ranges [start, ..., end]
     """
 
+    cacheable = True
+
     @supported_schemas(ProcessorSchemas.FRAMERANGES)
     def process(self, argument_name, argument_value, parameters):
         frames = []
@@ -245,6 +263,8 @@ class RangeToElementsProcessor(BaseProcessor):
     all elements [start, ..., end]
     """
 
+    cacheable = True
+
     @supported_schemas(ProcessorSchemas.FRAMERANGE)
     def process(self, argument_name, argument_value, parameters):
         return range(argument_value[0], argument_value[1] + 1)
@@ -264,6 +284,9 @@ class InputToOutputProcessor(BaseProcessor):
         "extension":  ""
     }
 
+    argument_dependencies = ["output_directory"]
+    cacheable = True
+
     @supported_schemas(str)
     def process(self, argument_name, argument_value, parameters):
         input_name, input_extension = os.path.splitext(os.path.basename(argument_value))
@@ -295,6 +318,8 @@ class CopyValueProcessor(BaseProcessor):
         "value": ""
     }
 
+    cacheable = True
+
     @supported_schemas(object)
     def process(self, argument_name, argument_value, parameters):
         value = parameters.get("value", self.parameters["value"]) or argument_value
@@ -313,6 +338,8 @@ class SubstitutionProcessor(BaseProcessor):
         "replacement": ""
     }
 
+    cacheable = True
+
     @supported_schemas(str)
     def process(self, argument_name, argument_value, parameters):
         pattern = parameters.get("pattern", self.parameters["pattern"])
@@ -341,6 +368,8 @@ class Base64EncodeProcessor(BaseProcessor):
     Encodes to urlsafe base64 string.
     """
 
+    cacheable = True
+
     @supported_schemas(str)
     def process(self, argument_name, argument_value, parameters):
         return base64.urlsafe_b64encode(argument_value)
@@ -353,6 +382,8 @@ class Base64DecodeProcessor(BaseProcessor):
     Decodes from an urlsafe base64 string.
     """
 
+    cacheable = True
+
     @supported_schemas(str)
     def process(self, argument_name, argument_value, parameters):
         return base64.urlsafe_b64decode(argument_value)
@@ -373,6 +404,8 @@ class ElementsPreviewReorderProcessor(BaseProcessor):
         "discard_rest": False
     }
 
+    cacheable = True
+
     @supported_schemas(Schema(And([int], lambda x: len(x) > 1)))
     def process(self, argument_name, argument_value, parameters):
         stride = parameters.get("stride", self.parameters["stride"]) or len(argument_value)
@@ -411,6 +444,9 @@ class LambdaProcessor(BaseProcessor):
         "predicate": lambda value, modules, arguments: value
     }
 
+    # the predicate has access to all arguments and modules
+    cacheable = False
+
     @supported_schemas(object)
     def process(self, argument_name, argument_value, parameters):
         required_modules = parameters.get("required_modules", self.parameters["required_modules"])
@@ -22,63 +22,224 @@
 #  OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.                                 #
 # ######################################################################################################################
 
+import hashlib
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
 import tractor.api.query as tractor_query
 
 from tractor.api.author.base import ModuleEngineClient
 
+from ..constants import LOGGING_NAMESPACE
+from ..utilities import (
+    ensure_private_directory,
+    resolve_path_template
+)
+
+_LOG = logging.getLogger("{}.query".format(LOGGING_NAMESPACE))
+
+
+class _EngineSession(object):
+    """ Keeps track of the engine client session of this process.
+
+    A session gets validated once per engine and user and again whenever the TTL has elapsed or
+    a query gets rejected, see `run_query`. The session id gets cached on disk, so successive
+    processes can reuse it instead of logging in again.
+
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._validated = None
+        self._validated_at = 0
+        self.round_trips = 0
+
+    @staticmethod
+    def _get_cache_path(engine, user):
+        """ Get the path of the cached session id for the given engine and user.
+
+        Args:
+            engine (str): engine as `<HOSTNAME>:<PORT>` or an empty string for the default engine
+            user (str): engine user
+
+        Returns:
+            str: path or an empty string if the cache is disabled
+
+        """
+        from ..constants import TRACTOR_ENGINE_SESSION_CACHE_DIR_TEMPLATE
+
+        cache_dir = resolve_path_template(TRACTOR_ENGINE_SESSION_CACHE_DIR_TEMPLATE)
+        if not cache_dir:
+            return ""
+        return os.path.join(cache_dir, "{}.tsid".format(hashlib.sha1("{}@{}".format(user, engine)).hexdigest()))
+
+    @classmethod
+    def _read_tsid(cls, engine, user, expired=False):
+        from ..constants import TRACTOR_ENGINE_SESSION_TTL
+
+        path = cls._get_cache_path(engine, user)
+        # a session somebody else placed in the cache would let us work within their session
+        if not path or not TRACTOR_ENGINE_SESSION_TTL or not ensure_private_directory(os.path.dirname(path)):
+            return None
+        try:
+            if not expired and time.time() - os.path.getmtime(path) > TRACTOR_ENGINE_SESSION_TTL:
+                return None
+            with open(path, "r") as f:
+                return f.read().strip() or None
+        except (IOError, OSError):
+            return None
+
+    @classmethod
+    def _write_tsid(cls, engine, user, tsid):
+        from ..constants import TRACTOR_ENGINE_SESSION_TTL
+
+        path = cls._get_cache_path(engine, user)
+        if not path or not TRACTOR_ENGINE_SESSION_TTL or not tsid:
+            return
+        # the session id is as good as the password, so nobody else should be able to read it
+        if not ensure_private_directory(os.path.dirname(path)):
+            return
+        try:
+            handle, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(handle, "w") as f:
+                f.write(tsid)
+            os.rename(tmp_path, path)
+        except (IOError, OSError) as error:
+            _LOG.debug("Unable to cache the engine session in '%s': %s", path, error)
+
+    @classmethod
+    def _remove_tsid(cls, engine, user):
+        path = cls._get_cache_path(engine, user)
+        if path and os.path.exists(path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _probe(self):
+        self.round_trips += 1
+        try:
+            tractor_query.jobs("jid=0")
+            return True
+        except (tractor_query.PasswordRequired, tractor_query.TractorQueryError):
+            return False
+
+    @staticmethod
+    def _set_engine_params(engine, user, password):
+        if engine:
+            hostname, port = engine.split(":")
+            tractor_query.setEngineClientParam(hostname=hostname, port=int(port), user=user, password=password)
+        else:
+            tractor_query.setEngineClientParam(user=user, password=password)
 
-def initialize_engine(invalidate_session=False):
+    def invalidate(self, engine, user):
+        """ Discard the current and the cached session. """
+        with self._lock:
+            ModuleEngineClient.tsid = None
+            self._validated = None
+            self._remove_tsid(engine, user)
+
+    def _is_validated(self, key):
+        from ..constants import TRACTOR_ENGINE_SESSION_TTL
+
+        if self._validated != key or not ModuleEngineClient.tsid:
+            return False
+        # the engine might have expired the session in the meantime
+        return not TRACTOR_ENGINE_SESSION_TTL or time.time() - self._validated_at <= TRACTOR_ENGINE_SESSION_TTL
+
+    def initialize(self, invalidate_session=False, revalidate=False):
+        """ Ensure the engine client uses a valid session.
+
+        Keyword Args:
+            invalidate_session (bool): discard the current and the cached session first
+            revalidate (bool): probe the current session even if it has been validated already
+
+        """
+        from ..constants import (
+            TRACTOR_ENGINE_CREDENTIALS_RESOLVER,
+            TRACTOR_ENGINE
+        )
+
+        user, password = TRACTOR_ENGINE_CREDENTIALS_RESOLVER()
+        key = (TRACTOR_ENGINE, user)
+
+        with self._lock:
+            if invalidate_session:
+                self.invalidate(*key)
+            elif not revalidate and self._is_validated(key):
+                return
+
+            if TRACTOR_ENGINE:
+                self._set_engine_params(TRACTOR_ENGINE, user, password)
+            if not ModuleEngineClient.tsid:
+                ModuleEngineClient.tsid = self._read_tsid(*key)
+
+            # without an engine configured we might get along with the defaults of the engine client,
+            # otherwise the session is unknown or expired and we have to login again
+            if not self._probe():
+                self.invalidate(*key)
+                self._set_engine_params(TRACTOR_ENGINE, user, password)
+                # something else don't work as expected
+                assert self._probe(), "Unsuccessful engine client initialization attempt."
+
+            self._validated = key
+            self._validated_at = time.time()
+            # rewriting an unchanged session would extend its lifetime beyond the TTL
+            if ModuleEngineClient.tsid != self._read_tsid(*key, expired=True):
+                self._write_tsid(TRACTOR_ENGINE, user, ModuleEngineClient.tsid)
+
+
+_SESSION = _EngineSession()
+
+
+def initialize_engine(invalidate_session=False, revalidate=False):
     """ Initialize Tractor Engine Client
 
+    The session gets validated once per process and again when TRACTOR_ENGINE_SESSION_TTL has elapsed.
+    Successive processes will reuse it until it expires. We only login again if the engine rejects it.
+
     Keyword Args:
         invalidate_session: If given and True it will discard the last session.
             This might be required if you jumping between different engines and otherwise
             result in the situation that you are using the query module with an unexpected
             engine.
+        revalidate: If given and True it will probe the session even if it has been validated already
+            and login again if the engine rejects it.
 
     Returns:
 
     """
-    from ..constants import (
-        TRACTOR_ENGINE_CREDENTIALS_RESOLVER,
-        TRACTOR_ENGINE
-    )
+    _SESSION.initialize(invalidate_session=invalidate_session, revalidate=revalidate)
 
-    def _do_test():
-        try:
-            tractor_query.jobs("jid=0")
-            return True
-        except (tractor_query.PasswordRequired, tractor_query.TractorQueryError):
-            return False
-
-    def _set_engine_params():
-        if TRACTOR_ENGINE:
-            hostname, port = TRACTOR_ENGINE.split(":")
 
-            tractor_query.setEngineClientParam(
-                hostname=hostname,
-                port=int(port),
-                user=TRACTOR_ENGINE_CREDENTIALS_RESOLVER()[0],
-                password=TRACTOR_ENGINE_CREDENTIALS_RESOLVER()[1]
-            )
-        else:
-            tractor_query.setEngineClientParam(
-                user=TRACTOR_ENGINE_CREDENTIALS_RESOLVER()[0],
-                password=TRACTOR_ENGINE_CREDENTIALS_RESOLVER()[1]
-            )
+def run_query(function, *args, **kwargs):
+    """ Run a tractor query function with a valid engine session
 
-    if invalidate_session:
-        ModuleEngineClient.tsid = None
+    Sessions might expire while a process is still running, so we validate the session
+    again if the engine rejects a query and retry the query once after logging in again.
+    The engine has to be initialized already, see `initialize_engine`.
 
-    # an initial test is likely to fail because no user/password was set
-    if TRACTOR_ENGINE or not _do_test():
-        # just set the credentials
-        _set_engine_params()
+    Args:
+        function (callable): tractor query function, e.g. `tractor_query.commands`
+        *args: positional arguments of the query function
+        **kwargs: keyword arguments of the query function
 
-        # if this still won't work we have to clear the session entirely
-        if not _do_test():
-            ModuleEngineClient.tsid = None
-            _set_engine_params()
+    Returns:
+        object: the result of the query function
 
-        # something else don't work as expacted
-        assert _do_test(), "Unsuccessful engine client initialization attempt."
\ No newline at end of file
+    """
+    try:
+        return function(*args, **kwargs)
+    except (tractor_query.PasswordRequired, tractor_query.TractorQueryError):
+        exc_info = sys.exc_info()
+        tsid = ModuleEngineClient.tsid
+        initialize_engine(revalidate=True)
+        # the session is still valid, so the query failed for another reason
+        if ModuleEngineClient.tsid == tsid:
+            raise exc_info[0], exc_info[1], exc_info[2]
+        _LOG.debug("Engine rejected the session, retry the query with a new session.")
+        return function(*args, **kwargs)
@@ -22,18 +22,37 @@
 #  OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.                                 #
 # ######################################################################################################################
 
+import itertools
 import logging
+import multiprocessing
 import re
 
+from collections import (
+    deque,
+    OrderedDict
+)
+
 import tractor.api.query as tractor_query
 
 from ..author import Arguments
+from ..author.argument import read_arguments_cache_records
 from ..constants import LOGGING_NAMESPACE
-from ..query import initialize_engine
+from ..query import (
+    initialize_engine,
+    run_query
+)
 
-initialize_engine()
 _LOG = logging.getLogger("{}.query.arguments".format(LOGGING_NAMESPACE))
 
+ARGUMENTS_RE = re.compile(r"\)\(\"(?P<arguments>.*)\"\)(;task)?\.script\(\)")
+# arguments that live in a cache file are referenced via `<path>:<key>`
+CACHE_FILE_RE = re.compile(r"^(?P<path>/.*\.[a-z]*):(?P<key>[a-z0-9\-]*)$")
+TASK_ID_RE = re.compile(r"^(?P<jid>\d+):(?P<tid>\d+)$")
+
+# how many commands we fetch per query and how many inline arguments get decoded per work unit
+_PAGE_SIZE = 1000
+_CHUNK_SIZE = 100
+
 
 def get_arguments_objects(task_id):
     """ Given a Tractor Task ID it will return a list of all used Arguments objects.
@@ -47,13 +66,15 @@ def get_arguments_objects(task_id):
         list: Arguments objects
 
     """
-    ARGUMENTS_RE = re.compile(r"\)\(\"(?P<arguments>.*)\"\)(;task)?\.script\(\)")
     task_id = task_id.replace(" ", "")  # when copy pasting the task id from tractor it includes spaces
     argument_objects = []
 
     assert task_id.count(":") == 1, "Task ID is invalid."
 
-    commands = tractor_query.commands("jid='{0}' and tid='{1}'".format(*task_id.split(":")), archive=True)
+    initialize_engine()
+    commands = run_query(
+        tractor_query.commands, "jid='{0}' and tid='{1}'".format(*task_id.split(":")), archive=True
+    )
 
     if not commands:
         _LOG.warning("No matching commands for Task ID '%s' found", task_id)
@@ -65,3 +86,162 @@ def get_arguments_objects(task_id):
                 argument_objects.append(Arguments(str(match.groupdict()["arguments"])))
 
     return argument_objects
+
+
+def _resolve_search(search):
+    """ converts a job id or a task id (`<jid>:<tid>`) into a search clause
+
+    Args:
+        search (str): job id, task id or any Tractor search clause
+
+    Returns:
+        str: search clause
+    """
+    compact = search.replace(" ", "")  # when copy pasting the task id from tractor it includes spaces
+    if compact.isdigit():
+        return "jid={}".format(compact)
+    match = TASK_ID_RE.match(compact)
+    if match:
+        return "jid={jid} and tid={tid}".format(**match.groupdict())
+    return search
+
+
+def _iter_pages(search, page_size):
+    """ yields all commands matching the search clause, page by page
+
+    We page by the last seen job and command id, so each query stays cheap no matter how deep we are.
+
+    """
+    clause = search
+    while True:
+        commands = run_query(
+            tractor_query.commands,
+            clause,
+            columns=["jid", "tid", "cid", "argv"],
+            sortby=["jid", "cid"],
+            limit=page_size,
+            archive=True
+        )
+        if commands:
+            yield commands
+        if len(commands) < page_size:
+            return
+        clause = "({0}) and (jid > {1} or (jid = {1} and cid > {2}))".format(
+            search, commands[-1]["jid"], commands[-1]["cid"]
+        )
+
+
+def _iter_units(search, page_size):
+    """ yields the units of work for all commands matching the search clause
+
+    Each page gets split into units as soon as it arrives, so its arguments can get
+    decoded while we query the next one. A cache file gets opened once per page.
+
+    Yields:
+        tuple: path of the cache file (None for inline arguments) and a list of
+            (command, key or serialized arguments) tuples
+    """
+    for commands in _iter_pages(search, page_size):
+        inline = []
+        cache_files = OrderedDict()
+        for command in commands:
+            ids = dict([(key, command[key]) for key in ("jid", "tid", "cid")])
+            for arg in command["argv"]:
+                match = ARGUMENTS_RE.search(arg)
+                if not match:
+                    continue
+                value = str(match.group("arguments"))
+                cache_file_match = CACHE_FILE_RE.match(value)
+                if cache_file_match:
+                    cache_files.setdefault(cache_file_match.group("path"), []).append(
+                        (ids, cache_file_match.group("key"))
+                    )
+                else:
+                    inline.append((ids, value))
+
+        for unit in cache_files.iteritems():
+            yield unit
+        for i in range(0, len(inline), _CHUNK_SIZE):
+            yield None, inline[i:i + _CHUNK_SIZE]
+
+
+def _decode(unit):
+    """ decodes a unit of work, this runs within a worker process
+
+    Args:
+        unit (tuple): path of the cache file (None for inline arguments) and a list of
+            (command, key or serialized arguments) tuples
+
+    Returns:
+        list: (command, Arguments or None, error message or None) tuples
+    """
+    path, records = unit
+    if path:
+        # each cache file gets only opened once for all of its keys
+        try:
+            serialized = read_arguments_cache_records(path, [key for _, key in records])
+        except (IOError, OSError, ValueError) as error:
+            return [(command, None, "Unable to read '{}': {}".format(path, error)) for command, _ in records]
+        records = [(command, serialized.get(key)) for command, key in records]
+
+    decoded = []
+    for command, value in records:
+        if value is None:
+            decoded.append((command, None, "Arguments not found in '{}'".format(path)))
+            continue
+        try:
+            decoded.append((command, Arguments(str(value)), None))
+        except Exception as error:
+            decoded.append((command, None, "Unable to decode arguments: {}".format(error)))
+    return decoded
+
+
+def iter_arguments(search, processes=None, page_size=_PAGE_SIZE):
+    """ yields the Arguments objects of all commands matching the given search
+
+    All commands get fetched in paged queries and the arguments of each page get decoded
+    by a process pool, while we query the next page.
+
+    Args:
+        search (str): job id, task id (`<jid>:<tid>`) or any Tractor search clause
+
+    Keyword Args:
+        processes (int): number of worker processes, defaults to the number of cpus
+        page_size (int): number of commands per query
+
+    Yields:
+        tuple: command as dict with its jid, tid and cid, the Arguments object or None
+            and an error message or None
+    """
+    initialize_engine()
+
+    units = _iter_units(_resolve_search(search), page_size)
+    first_units = list(itertools.islice(units, 2))
+    if not first_units:
+        _LOG.warning("No matching commands for search '%s' found", search)
+        return
+
+    units = itertools.chain(first_units, units)
+    processes = processes or multiprocessing.cpu_count()
+    if processes == 1 or len(first_units) == 1:
+        for decoded in itertools.imap(_decode, units):
+            for record in decoded:
+                yield record
+        return
+
+    # we query in this process and keep a few units per worker pending,
+    # so the workers don't idle while we yield the oldest result
+    pool = multiprocessing.Pool(processes)
+    pending = deque()
+    try:
+        for unit in units:
+            pending.append(pool.apply_async(_decode, (unit,)))
+            while pending and (pending[0].ready() or len(pending) > processes * 2):
+                for record in pending.popleft().get():
+                    yield record
+        while pending:
+            for record in pending.popleft().get():
+                yield record
+    finally:
+        pool.terminate()
+        pool.join()
@@ -23,15 +23,50 @@
 # ######################################################################################################################
 
 import logging
+import os
+import time
 
-from ..constants import LOGGING_NAMESPACE
+from multiprocessing.pool import ThreadPool
+
+from ..constants import (
+    LOGGING_NAMESPACE,
+    NEUTRALIZE_COMMANDS_RETRIES,
+    NEUTRALIZE_COMMANDS_THREADS
+)
 
 _LOG = logging.getLogger("{}.query.arguments".format(LOGGING_NAMESPACE))
 
+# the local state of a running command can be passed to its child processes via this environment variable
+# as `<jid>:<cid>:<0|1>`, see `get_local_state_env()`
+LOCAL_STATE_ENV = "JOBTRONAUT_LOCAL_STATE"
+
+# local states by job and command id, they won't change for the life of a command
+_LOCAL_STATES = {}
+
+
+def _get_local_state_from_env(job_id, command_id):
+    """ get the local state a parent process has passed via the environment
+
+    Args:
+        job_id (str): job id
+        command_id (str): id of the command that belongs to the given job id
+
+    Returns:
+        bool: the local state or None if nothing (or a state of another command) has been passed
+
+    """
+    tokens = os.getenv(LOCAL_STATE_ENV, "").strip().split(":")
+    if len(tokens) != 3 or tokens[:2] != [job_id, command_id]:
+        return None
+    return {"1": True, "0": False}.get(tokens[2])
+
 
 def get_local_state(job_id, command_id):
     """ identify if a command is of type local
 
+    The state gets only queried once per command and will be cached for the life of the process.
+    A state a parent process has passed via `get_local_state_env()` will be used without a query.
+
     Args:
         job_id (str): job id
         command_id (str): id of the command that belongs to the given job id
@@ -45,17 +80,113 @@ def get_local_state(job_id, command_id):
 
     # don't do anything which should always be the case if the job doesn't gets created as part of an expansion
     if job_id and command_id:
-        # perform a query and identify if the command we are running is a local command
-        from ..query import (
-            initialize_engine,
-            tractor_query
-        )
+        key = (str(job_id), str(command_id))
+        if key in _LOCAL_STATES:
+            return _LOCAL_STATES[key]
+
+        state = _get_local_state_from_env(*key)
+        if state is None:
+            # perform a query and identify if the command we are running is a local command
+            from ..query import (
+                initialize_engine,
+                run_query,
+                tractor_query
+            )
 
-        initialize_engine()
+            initialize_engine()
 
-        matches = tractor_query.commands(search="jid={} and cid={}".format(job_id, command_id), columns=["local"])
-        if matches and matches[0]["local"]:
+            matches = run_query(
+                tractor_query.commands,
+                search="jid={} and cid={}".format(job_id, command_id), columns=["local"]
+            )
+            state = bool(matches and matches[0]["local"])
+
+        if state:
             _LOG.debug("Command {}:{} is running locally.".format(job_id, command_id))
-            state = True
+
+        _LOCAL_STATES[key] = state
 
     return state
+
+
+def get_local_state_env(job_id, command_id):
+    """ get the environment entry that passes the local state of a command to a child process
+
+    We never export it to our own environment, otherwise it could end up in the environment of
+    submitted jobs. Pass it explicitly when spawning a process that runs for the same command, e.g.
+    `subprocess.Popen(cmd, env=dict(os.environ, **get_local_state_env(job_id, command_id)))`.
+
+    Args:
+        job_id (str): job id
+        command_id (str): id of the command that belongs to the given job id
+
+    Returns:
+        dict: the LOCAL_STATE_ENV entry
+
+    """
+    return {LOCAL_STATE_ENV: "{}:{}:{:d}".format(job_id, command_id, get_local_state(job_id, command_id))}
+
+
+def neutralize_commands(job_id, task_id, threads=None, retries=None, backoff=0.5):
+    """ replace the argv of all commands of a task, so they only echo what they did before
+
+    Each command needs its own attribute change and failed changes get retried with an
+    exponential backoff. The changes only get sent concurrently if more than one thread has
+    been configured, as all threads share the engine client of tractor's query api.
+
+    Args:
+        job_id (str): job id
+        task_id (str): id of the task that belongs to the given job id
+
+    Keyword Args:
+        threads (int): maximum number of concurrent requests, defaults to NEUTRALIZE_COMMANDS_THREADS
+        retries (int): how often to retry a failed request, defaults to NEUTRALIZE_COMMANDS_RETRIES
+        backoff (float): seconds to wait before the first retry, doubles with each retry
+
+    Returns:
+        int: number of neutralized commands
+
+    """
+    from ..query import (
+        initialize_engine,
+        run_query,
+        tractor_query
+    )
+
+    threads = NEUTRALIZE_COMMANDS_THREADS if threads is None else threads
+    retries = NEUTRALIZE_COMMANDS_RETRIES if retries is None else retries
+
+    initialize_engine()
+
+    # we don't want to lose the original command, so let us know what that was
+    # but only echo it instead of letting it execute again
+    rewrites = [
+        (command, ["/bin/echo", "Command has been neutralised:", "{}".format(" ".join(command["argv"]))])
+        for command in run_query(tractor_query.commands, "jid='{}' and tid='{}'".format(job_id, task_id))
+    ]
+
+    def _neutralize(rewrite):
+        command, argv = rewrite
+        for attempt in range(retries + 1):
+            try:
+                return run_query(tractor_query.cattr, command, key="argv", value=argv)
+            except tractor_query.TractorQueryError as error:
+                if attempt == retries:
+                    raise
+                delay = backoff * 2 ** attempt
+                _LOG.warning(
+                    "Unable to neutralize command %s:%s, retry in %.1fs: %s", job_id, command.get("cid"), delay, error
+                )
+                time.sleep(delay)
+
+    if threads > 1 and len(rewrites) > 1:
+        pool = ThreadPool(min(threads, len(rewrites)))
+        try:
+            pool.map(_neutralize, rewrites)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        map(_neutralize, rewrites)
+
+    return len(rewrites)
@@ -42,6 +42,52 @@ class CmdTaskFixture(Task):
     pass
 
 
+class HierarchyCommandFixture(Task):
+    flags = Task.Flags.PER_ELEMENT
+
+    def cmd(self):
+        return ["/bin/echo", str(self.elements.processed)]
+
+
+class HierarchyScriptFixture(Task):
+
+    def cmd(self):
+        return ["/bin/echo"]
+
+    def script(self):
+        pass
+
+
+class HierarchyFixture(Task):
+    elements_id = "test_argument"
+    flags = Task.Flags.PER_ELEMENT
+    required_tasks = [
+        ("HierarchyCommandFixture", ["HierarchyScriptFixture", ("HierarchyCommandFixture", "HierarchyScriptFixture")]),
+        "HierarchyCommandFixture"
+    ]
+
+
+class SerialHierarchyFixture(Task):
+    elements_id = "test_argument"
+    flags = Task.Flags.SERIAL
+    required_tasks = ["HierarchyFixture", "HierarchyCommandFixture", ("HierarchyFixture", "HierarchyScriptFixture")]
+
+
+class TaskFixtureWithScopedArgumentProcessors(Task):
+    MEMBERS = Task.MEMBERS + ["job"]
+    elements_id = "test_argument"
+
+    argument_processors = [
+        ProcessorDefinition(
+            "ProcessorFixture",
+            scope=["tres.initial"],
+            parameters={
+                "factor": 2
+            }
+        )
+    ]
+
+
 class TaskFixtureWithArgumentProcessors(Task):
     elements_id = "test_argument"
 
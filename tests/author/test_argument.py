@@ -23,6 +23,7 @@
 # ######################################################################################################################
 
 
+import base64
 import os
 import pickle
 import tempfile
@@ -34,6 +35,13 @@ from jobtronaut.author import (
     ArgumentValue,
     Arguments
 )
+from jobtronaut.author.argument import (
+    SERIALIZATION_PICKLE,
+    SERIALIZATION_PICKLE_ZLIB,
+    read_arguments_cache,
+    read_arguments_cache_records,
+    write_arguments_cache
+)
 
 from . import arguments_fixtures
 
@@ -124,6 +132,23 @@ class TestArguments(TestCase):
 
         do_arguments_basic_assertions(self, arguments)
 
+        # check our indexed cache files
+        cache_file = os.path.join(tempfile.mkdtemp(), "arguments.cache")
+        serialized = self._prefilled_arguments.serialized()
+        with open(cache_file, "w") as f:
+            write_arguments_cache({"0": self._serialized, "1": serialized}, f)
+
+        do_arguments_basic_assertions(self, Arguments("{}:0".format(cache_file)))
+        do_arguments_basic_assertions(self, Arguments("{}:1".format(cache_file)))
+        self.assertEqual(serialized, read_arguments_cache(cache_file, "1"))
+        self.assertEqual({"1": serialized}, read_arguments_cache_records(cache_file, ["1", "2", "00"]))
+
+        for key in ("2", "00", ""):
+            with self.assertRaises(KeyError):
+                Arguments("{0}:{1}".format(cache_file, key))
+
+        os.remove(cache_file)
+
     def test_init_with_arguments_instance(self):
         """ check if initialization of Arguments works when providing Arguments instance"""
 
@@ -176,6 +201,20 @@ class TestArguments(TestCase):
         self.assertIn(self._test_arg_name, arguments_two)
         self.assertEqual(arguments_two.get(self._test_arg_name).initial, self._test_arg_value)
 
+    def test_copy(self):
+        """ check if a copy shares all values until an argument gets set """
+        arguments = Arguments({self._test_arg_name: [1, 2, 3]})
+        copied = arguments.copy()
+
+        self.assertIsInstance(copied, Arguments)
+        self.assertIs(arguments[self._test_arg_name], copied[self._test_arg_name])
+        self.assertIs(getattr(arguments, self._test_arg_name), getattr(copied, self._test_arg_name))
+
+        copied.set(self._test_arg_name, self._test_arg_value)
+        self.assertEqual([1, 2, 3], arguments[self._test_arg_name].initial)
+        self.assertEqual([1, 2, 3], getattr(arguments, self._test_arg_name).initial)
+        do_arguments_basic_assertions(self, copied)
+
     def test_remove(self):
         """ check if removing arguments works as expected """
 
@@ -190,7 +229,17 @@ class TestArguments(TestCase):
 
     def test_serialized(self):
         """ check if serialized works as expected """
-        self.assertEqual(self._serialized, self._prefilled_arguments.serialized())
+        serialized = self._prefilled_arguments.serialized(compress=False)
+        self.assertEqual(SERIALIZATION_PICKLE, base64.b64decode(serialized)[0])
+        self.assertLess(len(serialized), len(self._serialized))
+        do_arguments_basic_assertions(self, Arguments(serialized))
+
+        arguments = Arguments({self._test_arg_name: self._test_arg_value, "frames": range(1000)})
+        serialized = arguments.serialized()
+        self.assertEqual(SERIALIZATION_PICKLE_ZLIB, base64.b64decode(serialized)[0])
+        self.assertLess(len(serialized), len(arguments.serialized(compress=False)))
+        self.assertDictEqual(arguments, Arguments(serialized))
+        do_arguments_basic_assertions(self, Arguments(serialized))
 
     def test_pickle_arguments(self):
         """ check if pickling the Arguments works as expected """
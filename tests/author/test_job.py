@@ -23,19 +23,27 @@
 # ######################################################################################################################
 
 
-import json
+import gzip
 import os
+import shutil
+import sys
 import tempfile
 
 from collections import OrderedDict
 
 from mock import patch
 
+from tractor.api import author
+from tractor.api.author.base import ModuleEngineClient
+
 from .. import TestCase
 
 from jobtronaut.author import Job
+from jobtronaut.author import TaskWithOverrides
+from jobtronaut.author.argument import read_arguments_cache
 from jobtronaut.author.job import _dump_arguments_cache
 from jobtronaut.author.plugins import Plugins
+from jobtronaut.query.command import LOCAL_STATE_ENV
 
 
 from .plugins_fixtures import some_tasks as tasks
@@ -49,6 +57,12 @@ class TestJob(TestCase):
         cls._job = Job(tasks.TASKS_DICT.keys()[0], {"uno": 1, "dos": 2, "tres": 3})
         cls._arguments_cache_file_template = os.path.join(tempfile.gettempdir(), "{placeholder}.json")
 
+    def _mkdtemp(self):
+        """ creates a temporary directory that will be removed after the test """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        return directory
+
     def test_init(self):
         """ check if the initialized Job fulfills the expected requirements """
 
@@ -61,7 +75,7 @@ class TestJob(TestCase):
     @patch.dict("os.environ", {"A": "1", "B": "2", "PATH": "/var/tmp:/tmp/user"}, clear=True)
     @patch("jobtronaut.author.job.INHERIT_ENVIRONMENT", new=True)
     @patch("jobtronaut.author.job.ENVIRONMENT_RESOLVER", new=lambda: OrderedDict(sorted(os.environ.items())))
-    @patch("jobtronaut.author.job.Job.spool", new=lambda x, owner: "")
+    @patch("jobtronaut.author.job.Job._spool", new=lambda x, tcl, owner: "")
     @patch("jobtronaut.author.job.Job.dump_job", new=lambda x, y: "")
     def test_inherit_environment_resolve(self):
         """ check if our method for retrieving the environment for tractor works correctly """
@@ -72,10 +86,87 @@ class TestJob(TestCase):
         job.submit()
         self.assertEqual(expected, job.envkey)
 
+    def test_iter_tcl(self):
+        """ check if rendering the job chunk by chunk results in the same script """
+        self.assertEqual(self._job.asTcl(), "".join(self._job.iter_tcl()))
+
+    def test_iter_tcl_verified(self):
+        """ check if we fall back to rendering the job as a whole if rendering it chunk by chunk differs """
+        with patch("jobtronaut.author.job._LOG.warning") as warning:
+            self.assertEqual([self._job.asTcl()], self._job.iter_tcl(verify=True))
+            self.assertEqual(0, warning.call_count)
+
+            with patch.object(Job, "_iter_tcl", new=classmethod(lambda cls, element: iter(["differs"]))):
+                self.assertEqual(["differs"], list(self._job.iter_tcl()))
+                self.assertEqual([self._job.asTcl()], self._job.iter_tcl(verify=True))
+            self.assertEqual(1, warning.call_count)
+
+    def test_spool(self):
+        """ check if spooling a rendered script calls the engine client like tractor's spool does """
+        spool_args = {
+            "block": True,
+            "owner": "owner",
+            "spoolfile": "/tmp/job.alf",
+            "spoolhost": "spoolhost",
+            "hostname": "engine",
+            "port": 5600
+        }
+        with patch.object(ModuleEngineClient, "spool", return_value="1") as spool:
+            author.Job.spool(self._job, **spool_args)
+            self.assertEqual("1", Job._spool(self._job.asTcl(), **spool_args))
+
+        self.assertEqual(2, spool.call_count)
+        self.assertEqual(spool.call_args_list[0], spool.call_args_list[1])
+        spool.assert_called_with(
+            self._job.asTcl(),
+            skipjobscript=False,
+            block=True,
+            owner="owner",
+            filename="/tmp/job.alf",
+            spoolhost="spoolhost",
+            hostname="engine",
+            port=5600
+        )
+
+    def test_env_as_tractor_envkey(self):
+        """ check if a local state passed to us won't be inherited by the submitted job """
+        environ = {"SOME_VARIABLE": "1", LOCAL_STATE_ENV: "1:2:1"}
+        with patch("jobtronaut.author.job.ENVIRONMENT_RESOLVER", new=lambda: environ):
+            self.assertEqual("setenv SOME_VARIABLE=1", Job._get_env_as_tractor_envkey())
+
+    def test_dump_job(self):
+        """ check if dumping the job writes the TCL script optionally compressed """
+        directory = self._mkdtemp()
+        for filename, _open in (("job.alf", open), ("job.alf.gz", gzip.open)):
+            filepath = os.path.join(directory, filename)
+            self._job.dump_job(filepath)
+            with _open(filepath, "rb") as f:
+                self.assertEqual(self._job.asTcl(), f.read())
+
+    def test_submit_renders_once(self):
+        """ check if the spooled script will be reused when archiving the job """
+        expected = self._job.asTcl()
+        spooled = []
+
+        def _spool(job, tcl, owner):
+            spooled.append(tcl)
+            return "1"
+
+        job_storage_path_template = os.path.join(self._mkdtemp(), "{job_id}.alf")
+        with patch("jobtronaut.author.job.JOB_STORAGE_PATH_TEMPLATE", new=job_storage_path_template), \
+                patch.object(Job, "_spool", new=_spool), \
+                patch.object(Job, "asTcl", autospec=True, side_effect=author.Job.asTcl) as as_tcl:
+            self.assertEqual("1", self._job.submit())
+            self.assertEqual(1, as_tcl.call_count)
+
+        self.assertEqual([expected], spooled)
+        with open(job_storage_path_template.format(job_id="1"), "r") as f:
+            self.assertEqual(expected, f.read())
+
     @patch("jobtronaut.author.plugins.PLUGIN_PATH", new=[os.path.dirname(tasks.__file__)])
     def test_dump_arguments_cache(self):
 
-        self._job.arguments_cache = {"hello": "world"}
+        self._job.arguments_cache = {"hello": "world", "foo": "bar"}
 
         with patch.object(self._job, "arguments_file", self._arguments_cache_file_template.format(placeholder="1")):
             # we shouldn't dump a cache when we didn't set this explicitly to required
@@ -93,8 +184,8 @@ class TestJob(TestCase):
                 self._job.dump_arguments_cache(self._job.arguments_file)
                 self.assertPathExists(self._job.arguments_file)
 
-                with open(self._job.arguments_file) as f:
-                    self.assertEqual(self._job.arguments_cache, json.load(f))
+                for key, value in self._job.arguments_cache.iteritems():
+                    self.assertEqual(value, read_arguments_cache(self._job.arguments_file, key))
 
                 # cleanup mess
                 os.remove(self._job.arguments_file)
@@ -177,6 +268,36 @@ class TestJob(TestCase):
         self.assertEqual(len(job.flat_hierarchy["tasks"]), 1)
         self.assertTrue("Elements" not in " ".join([_.title for _ in job.flat_hierarchy["tasks"]]))
 
+    def test_iter_hierarchy(self):
+        """ check if iterating the hierarchy matches the flattened one and copes with deep hierarchies """
+        self.assertListEqual(self._job.flat_hierarchy["tasks"], list(self._job.iter_tasks()))
+        self.assertListEqual(self._job.flat_hierarchy["cmds"], list(self._job.iter_cmds()))
+
+        depth = sys.getrecursionlimit() * 2
+        root_task = task = author.Task(title="0")
+        for idx in range(1, depth):
+            subtask = author.Task(title=str(idx))
+            task.addChild(subtask)
+            task = subtask
+
+        job = Job(root_task, compact_hierarchy=False, append_instances=False)
+        self.assertListEqual([str(idx) for idx in range(depth)], [_.title for _ in job.iter_tasks()])
+        self.assertEqual(depth, len(job.flat_hierarchy["tasks"]))
+
+    def test_task_ids(self):
+        """ check if task ids are unique within the job and stable when using a fixed prefix """
+        ids = [task.id for task in self._job.iter_tasks() if isinstance(task, author.Task)]
+        self.assertEqual(len(ids), len(set(ids)))
+        for task_id in ids:
+            self.assertTrue(task_id.startswith(self._job.task_ids.prefix))
+
+        root_task, arguments = tasks.TASKS_DICT.keys()[0], {"uno": 1, "dos": 2, "tres": 3}
+        self.assertNotEqual(self._job.task_ids.prefix, Job(root_task, arguments).task_ids.prefix)
+        self.assertEqual(
+            Job(root_task, arguments, task_id_prefix="job").asTcl(),
+            Job(root_task, arguments, task_id_prefix="job").asTcl()
+        )
+
     def test_modify(self):
 
         root_task, arguments = tasks.TASKS_DICT.keys()[0], {"uno": [1, 2, 3], "dos": 2, "tres": 3}
@@ -227,3 +348,59 @@ class TestJob(TestCase):
             _get_attribute_listed(job, "cmds", "tags")
         )
 
+    def test_modify_by_index(self):
+
+        root_task, arguments = tasks.TASKS_DICT.keys()[0], {"uno": [1, 2, 3], "dos": 2, "tres": 3}
+
+        for task in Plugins().tasks.values():
+            task.flags = task.Flags.PER_ELEMENT
+            task.cmd = lambda x: ["/bin/echo", "Hello World"]
+            task.tags = ["foo", "bar"]
+
+        job = Job(root_task, arguments)
+        flat_hierarchy = job.flat_hierarchy
+
+        def _get_attribute_listed(job, type, attribute):
+            return [_.attributeByName.get(attribute).value for _ in job.flat_hierarchy[type]]
+
+        with self.assertRaises(AssertionError):
+            job.modify_cmds_by_index("unknown", "foo", attribute="tags", value=["foobar"])
+
+        job.modify_cmds_by_index("tag", "unknown", attribute="tags", value=["foobar"])
+        self.assertListEqual(
+            [["foo", "bar"], ["foo", "bar"], ["foo", "bar"]],
+            _get_attribute_listed(job, "cmds", "tags")
+        )
+
+        job.modify_cmds_by_index("tag", "foo", attribute="tags", value=["foobar"])
+        self.assertListEqual(
+            [["foobar"], ["foobar"], ["foobar"]],
+            _get_attribute_listed(job, "cmds", "tags")
+        )
+
+        # the index has to reflect our modification
+        self.assertListEqual([], job._lookup("tag", "foo", "cmds"))
+        self.assertListEqual(job.flat_hierarchy["cmds"], job._lookup("tag", "foobar", "cmds"))
+
+        job.modify_cmds_by_index("service", "linux64", attribute="service", value="linux64,foo")
+        self.assertListEqual(job.flat_hierarchy["cmds"], job._lookup("service", "foo", "cmds"))
+
+        job.modify_tasks_by_index("class", job.task.__class__.__name__, attribute="title", value="Root")
+        self.assertEqual("Root", job.task.title)
+        self.assertListEqual([job.task], job._lookup("title", "Roo", "tasks"))
+        self.assertListEqual(list(job.task.attributeByName.get("cmds", [])), job._lookup("title", "Root", "cmds"))
+
+        # we updated the index in place instead of flattening the hierarchy again
+        self.assertIs(flat_hierarchy, job.flat_hierarchy)
+        self.assertEqual(job._flatten(job.task)["index"], job.flat_hierarchy["index"])
+
+    @patch("jobtronaut.author.plugins.PLUGIN_PATH", new=[os.path.dirname(tasks.__file__)])
+    def test_modify_by_index_with_overrides(self):
+        """ check if tasks with overrides are indexed by the name of the task they override """
+        root_task, arguments = tasks.TASKS_DICT.keys()[0], {"uno": 1, "dos": 2, "tres": 3}
+
+        job = Job(TaskWithOverrides(root_task, title="Overriden").get()(arguments))
+        self.assertListEqual([job.task], job._lookup("class", root_task, "tasks"))
+
+        job.modify_tasks_by_index("class", root_task, attribute="title", value="Root")
+        self.assertEqual("Root", job.task.title)
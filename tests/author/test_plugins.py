@@ -23,9 +23,15 @@
 # ######################################################################################################################
 
 from mock import patch
+import json
 import os
+import shutil
+import tempfile
 
-from jobtronaut.author.plugins import Plugins
+from jobtronaut.author.plugins import (
+    Plugins,
+    Singleton
+)
 
 from .. import TestCase
 from .plugins_fixtures import some_processors as processors
@@ -42,6 +48,12 @@ class TestPlugins(TestCase):
         Plugins().initialize()
         # in case all unittests are failing the initialize will not work, so check test_initialize
 
+    def _mkdtemp(self):
+        """ creates a temporary directory that will be removed after the test """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        return directory
+
     def test_processors(self):
         """ check if available processors match the ones we provide """
         self.assertListEqual(
@@ -69,6 +81,8 @@ class TestPlugins(TestCase):
             sorted(tasks.TASKS_DICT.keys() + processors.PROCESSORS_DICT.keys() + sitestatusfilters.FILTERS_DICT.keys()),
             sorted(Plugins().plugins)
         )
+        # we don't want to assemble the plugins on every access
+        self.assertIs(Plugins().plugins, Plugins().plugins)
 
     def test_task(self):
         """ check if we get the task class we would expect """
@@ -170,6 +184,84 @@ class TestPlugins(TestCase):
 
             Plugins().initialize(ignore_duplicates=True)
 
+    def test_validate(self):
+        """ check if the validation reports all duplicates """
+        fixtures_dir = os.path.dirname(processors.__file__)
+        self.assertDictEqual({}, Plugins().validate())
+
+        with patch("jobtronaut.author.plugins.PLUGIN_PATH", new=[fixtures_dir, os.path.join(fixtures_dir, "duplicates")]):
+            duplicates = Plugins().validate()
+
+        self.assertNotEqual({}, duplicates)
+        for name, paths in duplicates.iteritems():
+            self.assertEqual(2, len(paths))
+            self.assertIn(os.path.join(fixtures_dir, "duplicates", "other_processors.py"), paths)
+
+    @patch("jobtronaut.author.plugins.PLUGIN_PATH", new=[os.path.dirname(processors.__file__)])
+    @patch("jobtronaut.author.plugins.ENABLE_LAZY_PLUGIN_LOADING", new=True)
+    def test_lazy_loading(self):
+        """ check if plugins will only be sourced when they get requested """
+        manifest_path = os.path.join(self._mkdtemp(), "manifest.json")
+        with patch("jobtronaut.author.plugins.PLUGIN_MANIFEST_PATH_TEMPLATE", new=manifest_path):
+            Plugins().initialize()
+
+            with patch.object(Singleton, "_initialized", False), \
+                    patch("jobtronaut.author.plugins.Plugins._load_source", wraps=Plugins._load_source) as load_source:
+                Plugins()
+                self.assertEqual(0, load_source.call_count)
+
+                for processor_name in processors.PROCESSORS_DICT:
+                    self.assertEqual(processor_name, Plugins().processor(processor_name).__name__)
+                self.assertEqual(1, load_source.call_count)
+
+                # accessing all plugins of a kind requires to source everything
+                self.assertListEqual(sorted(tasks.TASKS_DICT.keys()), sorted(Plugins().tasks))
+                self.assertEqual(3, load_source.call_count)
+
+    @patch("jobtronaut.author.plugins.ENABLE_LAZY_PLUGIN_LOADING", new=True)
+    def test_lazy_loading_with_duplicates(self):
+        """ check if we only log plugin names that have been registered from multiple modules before """
+        searchpaths = [self._mkdtemp() for _ in range(2)]
+        for index, searchpath in enumerate(searchpaths):
+            with open(os.path.join(searchpath, "processors_{}.py".format(index)), "w") as f:
+                f.write("from jobtronaut.author import BaseProcessor\n\n\nclass Helper(object):\n    pass\n\n\n"
+                        "class DuplicatedProcessor(BaseProcessor):\n    pass\n")
+
+        manifest_path = os.path.join(self._mkdtemp(), "manifest.json")
+
+        def _get_messages(debug):
+            with patch.object(Singleton, "_initialized", False), \
+                    patch("jobtronaut.author.plugins.Plugins._load_source", wraps=Plugins._load_source) as load_source, \
+                    patch("jobtronaut.author.plugins._LOG.isEnabledFor", new=lambda level: debug), \
+                    patch("jobtronaut.author.plugins._LOG.debug") as debug_mock, \
+                    patch("jobtronaut.author.plugins._LOG.warning") as warning_mock:
+                Plugins()
+                self.assertEqual(0, load_source.call_count)
+
+            self.assertEqual(0, warning_mock.call_count)
+            return [args for args, _ in debug_mock.call_args_list if "DuplicatedProcessor" in args or "Helper" in args]
+
+        with patch("jobtronaut.author.plugins.PLUGIN_PATH", new=searchpaths), \
+                patch("jobtronaut.author.plugins.PLUGIN_MANIFEST_PATH_TEMPLATE", new=manifest_path):
+            # the kinds of top level classes are unknown until their modules have been sourced
+            self.assertEqual([], _get_messages(debug=True))
+
+            # pretend both modules have been sourced by a previous run
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+            for entry in manifest["modules"].itervalues():
+                entry["plugins"]["DuplicatedProcessor"] = "Processor"
+            with open(manifest_path, "w") as f:
+                json.dump(manifest, f)
+
+            self.assertEqual([], _get_messages(debug=False))
+            messages = _get_messages(debug=True)
+
+        self.assertEqual(1, len(messages))
+        self.assertEqual("DuplicatedProcessor", messages[0][1])
+        for index, searchpath in enumerate(searchpaths):
+            self.assertIn(os.path.join(searchpath, "processors_{}.py".format(index)), messages[0][2])
+
     def test_get_all_arguments(self):
         """ check if we will get all arguments a task will consume correctly """
 
@@ -194,4 +286,208 @@ class TestPlugins(TestCase):
             self.assertEqual(processors.__file__, Plugins().get_module_path(processor_name))
 
         for filter_name in sitestatusfilters.FILTERS_DICT.keys():
-            self.assertEqual(sitestatusfilters.__file__, Plugins().get_module_path(filter_name))
\ No newline at end of file
+            self.assertEqual(sitestatusfilters.__file__, Plugins().get_module_path(filter_name))
+
+    @patch("jobtronaut.author.plugins.PLUGIN_PATH", new=[os.path.dirname(processors.__file__)])
+    def test_load_plugin(self):
+        """ check if we only source the module that defines a requested plugin """
+        manifest_path = os.path.join(self._mkdtemp(), "manifest.json")
+        with patch("jobtronaut.author.plugins.PLUGIN_MANIFEST_PATH_TEMPLATE", new=manifest_path):
+            Plugins().initialize()
+            self.assertPathExists(manifest_path)
+
+            # start from scratch like a new process would do
+            Plugins()._clear()
+            Plugins()._Plugins__manifest = {}
+
+            with patch("jobtronaut.author.plugins.Plugins._load_source", wraps=Plugins._load_source) as load_source:
+                for task_name in tasks.TASKS_DICT:
+                    self.assertEqual(task_name, Plugins().task(task_name).__name__)
+
+                self.assertListEqual(
+                    [os.path.join(os.path.dirname(tasks.__file__), "some_tasks.py")],
+                    [call[0][1] for call in load_source.call_args_list]
+                )
+
+    def test_manifest_invalidation(self):
+        """ check if the manifest detects changed modules """
+        plugin_dir = self._mkdtemp()
+        plugin_path = os.path.join(plugin_dir, "lazy_tasks.py")
+        manifest_path = os.path.join(plugin_dir, "manifest.json")
+
+        def _write_plugin(name):
+            with open(plugin_path, "w") as f:
+                f.write("from jobtronaut.author import Task\n\n\nclass {}(Task):\n    pass\n".format(name))
+
+        def _get_entry():
+            with open(manifest_path) as f:
+                return json.load(f)["modules"][plugin_path]
+
+        _write_plugin("LazyTask")
+        with patch("jobtronaut.author.plugins.PLUGIN_PATH", new=[plugin_dir]), \
+                patch("jobtronaut.author.plugins.PLUGIN_MANIFEST_PATH_TEMPLATE", new=manifest_path):
+            Plugins()._clear()
+            Plugins()._update_manifest()
+            # we don't know the kind until the module has been sourced
+            self.assertDictEqual({"LazyTask": None}, _get_entry()["plugins"])
+
+            self.assertEqual("LazyTask", Plugins().task("LazyTask").__name__)
+            self.assertDictEqual({"LazyTask": "Task"}, _get_entry()["plugins"])
+
+            _write_plugin("ChangedLazyTask")
+            Plugins()._clear()
+            Plugins()._update_manifest()
+            self.assertDictEqual({"ChangedLazyTask": None}, _get_entry()["plugins"])
+
+    def test_manifest_cleanup(self):
+        """ check if stale entries get rewritten and entries of removed modules get dropped """
+        plugin_dir = self._mkdtemp()
+        manifest_path = os.path.join(plugin_dir, "manifest.json")
+        removed_path = os.path.join(plugin_dir, "removed_tasks.py")
+        for name in ("KeptTask", "RemovedTask"):
+            with open(os.path.join(plugin_dir, name.lower().replace("task", "_tasks.py")), "w") as f:
+                f.write("from jobtronaut.author import Task\n\n\nclass {}(Task):\n    pass\n".format(name))
+
+        def _read_modules():
+            with open(manifest_path) as f:
+                return json.load(f)["modules"]
+
+        with patch("jobtronaut.author.plugins.PLUGIN_PATH", new=[plugin_dir]), \
+                patch("jobtronaut.author.plugins.PLUGIN_MANIFEST_PATH_TEMPLATE", new=manifest_path):
+            Plugins()._clear()
+            Plugins()._update_manifest()
+
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            manifest["modules"][removed_path]["name"] = "stale_name"
+            with open(manifest_path, "w") as f:
+                json.dump(manifest, f)
+
+            Plugins()._clear()
+            Plugins()._update_manifest()
+            self.assertEqual("removed_tasks", _read_modules()[removed_path]["name"])
+
+            os.remove(removed_path)
+            Plugins()._clear()
+            Plugins()._update_manifest()
+            self.assertListEqual([os.path.join(plugin_dir, "kept_tasks.py")], _read_modules().keys())
+
+    def test_manifest_permissions(self):
+        """ check if a manifest within a directory others can write to will neither be read nor written """
+        searchpath = os.path.dirname(processors.__file__)
+
+        for mode, uid in ((0770, os.getuid()), (0700, os.getuid() + 1)):
+            manifest_dir = self._mkdtemp()
+            manifest_path = os.path.join(manifest_dir, "manifest.json")
+            os.chmod(manifest_dir, mode)
+            with open(manifest_path, "w") as f:
+                json.dump({"modules": {}}, f)
+
+            with patch("jobtronaut.author.plugins.PLUGIN_PATH", new=[searchpath]), \
+                    patch("jobtronaut.author.plugins.PLUGIN_MANIFEST_PATH_TEMPLATE", new=manifest_path), \
+                    patch("os.getuid", return_value=uid), \
+                    patch("jobtronaut.author.plugins.json.load", side_effect=AssertionError):
+                Plugins()._clear()
+                Plugins()._update_manifest()
+            with open(manifest_path) as f:
+                self.assertDictEqual({"modules": {}}, json.load(f))
+
+    @patch("jobtronaut.author.plugins.PLUGIN_PATH", new=[os.path.dirname(processors.__file__)])
+    @patch("jobtronaut.author.plugins.PLUGIN_PREFETCH_THREADS", new=4)
+    def test_prefetch(self):
+        """ check if prefetched sources will be sourced and the timings get reported per searchpath """
+        searchpath = os.path.dirname(processors.__file__)
+        manifest_path = os.path.join(self._mkdtemp(), "manifest.json")
+        with patch("jobtronaut.author.plugins.PLUGIN_MANIFEST_PATH_TEMPLATE", new=manifest_path), \
+                patch("jobtronaut.author.plugins.Plugins._read_source", wraps=Plugins._read_source) as read_source, \
+                patch("jobtronaut.author.plugins._LOG") as log:
+            Plugins().initialize()
+
+        # every module has been read only once
+        read_paths = [call[0][0] for call in read_source.call_args_list]
+        self.assertListEqual(sorted(set(read_paths)), sorted(read_paths))
+        self.assertIn(tasks.__file__, read_paths)
+        self.assertIn(
+            searchpath,
+            [call[0][2] for call in log.debug.call_args_list if call[0][0].startswith("Prefetched")]
+        )
+        self.assertListEqual(sorted(tasks.TASKS_DICT.keys()), sorted(Plugins().tasks))
+        for task_name in tasks.TASKS_DICT:
+            self.assertEqual(tasks.__file__, Plugins().get_module_path(task_name))
+
+    def test_refresh(self):
+        """ check if a refresh only reloads changed modules and drops the plugins of removed ones """
+        plugin_dir = self._mkdtemp()
+        manifest_path = os.path.join(plugin_dir, "manifest.json")
+
+        def _write_plugin(filename, *names):
+            with open(os.path.join(plugin_dir, filename), "w") as f:
+                f.write("from jobtronaut.author import Task\n")
+                for name in names:
+                    f.write("\n\nclass {}(Task):\n    pass\n".format(name))
+
+        _write_plugin("kept_tasks.py", "KeptTask")
+        _write_plugin("changed_tasks.py", "ChangedTask")
+        _write_plugin("removed_tasks.py", "RemovedTask")
+
+        with patch("jobtronaut.author.plugins.PLUGIN_PATH", new=[plugin_dir]), \
+                patch("jobtronaut.author.plugins.PLUGIN_MANIFEST_PATH_TEMPLATE", new=manifest_path):
+            Plugins().initialize()
+            kept_task = Plugins().task("KeptTask")
+            self.assertListEqual([], Plugins().refresh())
+
+            _write_plugin("changed_tasks.py", "ChangedTask", "AddedTask")
+            os.remove(os.path.join(plugin_dir, "removed_tasks.py"))
+            _write_plugin("new_tasks.py", "NewTask")
+
+            self.assertListEqual(
+                [os.path.join(plugin_dir, "changed_tasks.py"), os.path.join(plugin_dir, "removed_tasks.py")],
+                Plugins().refresh()
+            )
+            self.assertListEqual(
+                ["AddedTask", "ChangedTask", "KeptTask", "NewTask"],
+                sorted(Plugins().tasks)
+            )
+            self.assertIs(kept_task, Plugins().task("KeptTask"))
+            self.assertEqual(os.path.join(plugin_dir, "changed_tasks.py"), Plugins().get_module_path("AddedTask"))
+
+    def test_bytecode_cache(self):
+        """ check if compiled modules will be cached outside of the searchpaths """
+        plugin_dir = self._mkdtemp()
+        cache_dir = os.path.join(self._mkdtemp(), "bytecode")
+        plugin_path = os.path.join(plugin_dir, "cached_tasks.py")
+        source = "from jobtronaut.author import Task\n\n\nclass CachedTask(Task):\n    pass\n"
+        with open(plugin_path, "w") as f:
+            f.write(source)
+
+        with patch("jobtronaut.author.plugins.PLUGIN_PATH", new=[plugin_dir]), \
+                patch("jobtronaut.author.plugins.PLUGIN_BYTECODE_CACHE_DIR_TEMPLATE", new=cache_dir), \
+                patch("jobtronaut.author.plugins.PLUGIN_MANIFEST_PATH_TEMPLATE", new=""):
+            Plugins().initialize()
+            self.assertEqual("CachedTask", Plugins().task("CachedTask").__name__)
+            self.assertListEqual(["cached_tasks.py"], os.listdir(plugin_dir))
+            self.assertEqual(1, len(os.listdir(cache_dir)))
+
+            # the cached bytecode will be used as long as the source doesn't change
+            with patch("jobtronaut.author.plugins.compile", create=True, side_effect=AssertionError):
+                code = Plugins._compile(plugin_path, source)
+            self.assertEqual(plugin_path, code.co_filename)
+
+            Plugins._compile(plugin_path, source.replace("CachedTask", "ChangedCachedTask"))
+            self.assertEqual(1, len(os.listdir(cache_dir)))
+        self.assertEqual(0700, os.stat(cache_dir).st_mode & 0777)
+
+    def test_bytecode_cache_permissions(self):
+        """ check if bytecode within a directory others can write to will never be loaded """
+        plugin_path = os.path.join(self._mkdtemp(), "cached_tasks.py")
+        source = "from jobtronaut.author import Task\n\n\nclass CachedTask(Task):\n    pass\n"
+
+        for mode, uid in ((0770, os.getuid()), (0700, os.getuid() + 1)):
+            cache_dir = self._mkdtemp()
+            os.chmod(cache_dir, mode)
+            with patch("jobtronaut.author.plugins.PLUGIN_BYTECODE_CACHE_DIR_TEMPLATE", new=cache_dir), \
+                    patch("os.getuid", return_value=uid), \
+                    patch("jobtronaut.author.plugins.marshal.load", side_effect=AssertionError):
+                Plugins._compile(plugin_path, source)
+                Plugins._compile(plugin_path, source)
+            self.assertListEqual([], os.listdir(cache_dir))
@@ -24,6 +24,7 @@
 
 import copy
 
+from mock import patch
 from schema import Schema
 
 from .. import TestCase
@@ -32,10 +33,30 @@ from jobtronaut.author.task import Task
 from jobtronaut.author.processor import (
     BaseProcessor,
     ProcessorDefinition,
-    ProcessorSchemas
+    ProcessorSchemas,
+    supported_schemas
 )
 
 
+class OverlappingSchemasFixture(BaseProcessor):
+
+    @supported_schemas(object)
+    def process(self, *args):
+        return "object"
+
+    @supported_schemas([int])
+    def process(self, *args):
+        return "list_w_ints"
+
+    @supported_schemas(ProcessorSchemas.FRAMERANGE)
+    def process(self, *args):
+        return "FRAMERANGE"
+
+    @supported_schemas(int)
+    def process(self, *args):
+        return "int"
+
+
 class TestBaseProcessor(TestCase):
 
     @classmethod
@@ -181,6 +202,70 @@ class TestBaseProcessor(TestCase):
         self.assertEqual(processed, args[1])
 
 
+class TestSupportedSchemas(TestCase):
+
+    @classmethod
+    def setUp(cls):
+        cls._processor = OverlappingSchemasFixture()
+        OverlappingSchemasFixture._overloads_by_shape.clear()
+
+    def test_precedence(self):
+        """ check if more specific schemas will be preferred over broader ones """
+        self.assertEqual(
+            ["FRAMERANGE", "list_w_ints", "int", "object"],
+            [store.method(self._processor) for store in OverlappingSchemasFixture._overloads["process"]]
+        )
+        self.assertEqual("FRAMERANGE", self._processor.process("", [1, 2], {}))
+        self.assertEqual("list_w_ints", self._processor.process("", [2, 1], {}))
+        self.assertEqual("list_w_ints", self._processor.process("", [1, 2, 3], {}))
+        self.assertEqual("object", self._processor.process("", "a", {}))
+
+    def test_conversion_precedence(self):
+        """ check if a conversion matching an overload is preferred over a direct match of a broader one """
+        self.assertEqual("list_w_ints", self._processor.process("", 1, {}))
+        self.assertEqual("list_w_ints", self._processor.process("", [1], {}))
+        self.assertEqual("object", self._processor.process("", ["a"], {}))
+
+    def test_cached_overloads(self):
+        """ check if overloads that can't match a value shape will be skipped on subsequent calls """
+        self.assertEqual("list_w_ints", self._processor.process("", [1, 2, 3], {}))
+        # FRAMERANGE depends on the actual values, whereas the broader ones are never reachable anymore
+        self.assertEqual(
+            ["FRAMERANGE", "list_w_ints"],
+            [store.method(self._processor) for store in OverlappingSchemasFixture._overloads_by_shape.values()[0]]
+        )
+        self.assertEqual("FRAMERANGE", self._processor.process("", [1, 2], {}))
+        self.assertEqual("list_w_ints", self._processor.process("", [2, 1], {}))
+        self.assertEqual(1, len(OverlappingSchemasFixture._overloads_by_shape))
+
+        self.assertEqual("object", self._processor.process("", "a", {}))
+        self.assertEqual(2, len(OverlappingSchemasFixture._overloads_by_shape))
+
+    @patch("jobtronaut.author.processor._MAX_CACHED_SHAPES", 2)
+    def test_cached_overloads_eviction(self):
+        """ check if the least recently used shape gets dropped once the cache is full """
+        self.assertEqual("list_w_ints", self._processor.process("", 1, {}))
+        self.assertEqual("object", self._processor.process("", "a", {}))
+        self.assertEqual("list_w_ints", self._processor.process("", 2, {}))
+        self.assertEqual("object", self._processor.process("", 1.0, {}))
+        self.assertEqual([int, float], list(OverlappingSchemasFixture._overloads_by_shape))
+
+    def test_cached_overloads_large_value(self):
+        """ check if large homogeneous values share a shape regardless of their length """
+        self.assertEqual("list_w_ints", self._processor.process("", range(1000, 0, -1), {}))
+        self.assertEqual("list_w_ints", self._processor.process("", range(5000), {}))
+        self.assertEqual(1, len(OverlappingSchemasFixture._overloads_by_shape))
+        self.assertEqual(
+            ["FRAMERANGE", "list_w_ints"],
+            [store.method(self._processor) for store in OverlappingSchemasFixture._overloads_by_shape.values()[0]]
+        )
+
+        self.assertEqual("object", self._processor.process("", range(1000) + ["a"], {}))
+        self.assertEqual(2, len(OverlappingSchemasFixture._overloads_by_shape))
+        self.assertEqual("object", self._processor.process("", [[1, 2]] * 1000, {}))
+        self.assertEqual(3, len(OverlappingSchemasFixture._overloads_by_shape))
+
+
 class TestProcessorDefinition(TestCase):
 
     @classmethod
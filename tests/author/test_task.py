@@ -23,6 +23,7 @@
 # ######################################################################################################################
 
 import os
+import re
 from collections import namedtuple
 
 from mock import (
@@ -31,16 +32,27 @@ from mock import (
 )
 
 from jobtronaut.author import (
+    Arguments,
     ArgumentValue,
+    BaseProcessor,
+    Job,
+    ProcessorDefinition,
     Task,
     TaskWithOverrides
 )
+from jobtronaut.author.plugins import Plugins
+from jobtronaut.author.task import (
+    _CAPABILITIES,
+    Parallel,
+    Serial
+)
 from jobtronaut.constants import (
     COMMANDFLAGS_ARGUMENT_NAME
 )
 from .task_fixtures import tasks
 from .task_fixtures.tasks import (
     TaskFixture,
+    TaskFixtureWithScopedArgumentProcessors,
     SERIALIZED_ARGUMENTS_EXEEDED_LIMIT,
     TASK_FIXTURE_ARGUMENTS,
 )
@@ -205,7 +217,7 @@ class TestTask(TestCase):
     @patch.object(TaskFixture, "script", create=True, new=lambda x: "print 'test'")
     @patch.object(TaskFixture, "cmd", create=True, new=lambda x: ["/some/executable", "test"])
     @patch("jobtronaut.author.task.EXECUTABLE_RESOLVER", new=lambda x: "/bin/echo")
-    @patch.object(TaskFixture, "_generate_argument_key", new=lambda x: "12")
+    @patch.object(TaskFixture, "_generate_argument_key", new=lambda x, y: "12")
     @patch.object(TaskFixture, "job", create=True, new=JOB_PATCH)
     @patch("jobtronaut.author.task.ARGUMENTS_SERIALIZED_MAX_LENGTH", new=len(SERIALIZED_ARGUMENTS_EXEEDED_LIMIT) - 1)
     def test_get_commandlist_with_script_call(self):
@@ -324,6 +336,151 @@ class TestTask(TestCase):
             for cmd in _task.attributeByName["cmds"]:
                 self.assertEqual([], cmd.envkey)
 
+    def test_process_arguments_with_cache(self):
+        """ check if identical processor pipelines only get processed once per job """
+        processed = []
+
+        class ProcessorFixture(BaseProcessor):
+            cacheable = True
+
+            def process(self, argument_name, argument_value, parameters):
+                processed.append(argument_value)
+                return argument_value * parameters["factor"]
+
+        job = namedtuple("job", ["processing_cache", "local"])({}, False)
+
+        with patch.object(Plugins, "processor", return_value=ProcessorFixture), \
+                patch.object(TaskFixtureWithScopedArgumentProcessors, "job", new=job):
+            # only the elements differ, which are not in the scope of our processor
+            for elements in ([1], [2], [3]):
+                _task = TaskFixtureWithScopedArgumentProcessors(dict(TASK_FIXTURE_ARGUMENTS, test_argument=elements))
+                self.assertEqual(TASK_FIXTURE_ARGUMENTS["tres"] * 2, _task.arguments.tres.processed)
+                self.assertEqual(elements, _task.arguments.test_argument.processed)
+            self.assertEqual(1, len(processed))
+
+            # changing an argument in scope requires processing again
+            _task = TaskFixtureWithScopedArgumentProcessors(dict(TASK_FIXTURE_ARGUMENTS, tres=4))
+            self.assertEqual(8, _task.arguments.tres.processed)
+            self.assertEqual(2, len(processed))
+
+            # impure processors will always process
+            with patch.object(ProcessorFixture, "cacheable", new=False):
+                TaskFixtureWithScopedArgumentProcessors(TASK_FIXTURE_ARGUMENTS)
+            self.assertEqual(3, len(processed))
+
+            with patch("jobtronaut.author.task.ENABLE_PROCESSOR_CACHE", new=False):
+                TaskFixtureWithScopedArgumentProcessors(TASK_FIXTURE_ARGUMENTS)
+            self.assertEqual(4, len(processed))
+
+            # expressions get evaluated while processing, so they might result in anything
+            definitions = [
+                ProcessorDefinition("ProcessorFixture", scope=["tres.initial"], parameters={"factor": "<expr: 2>"})
+            ]
+            with patch.object(TaskFixtureWithScopedArgumentProcessors, "argument_processors", new=definitions):
+                for _ in range(2):
+                    _task = TaskFixtureWithScopedArgumentProcessors(TASK_FIXTURE_ARGUMENTS)
+                    self.assertEqual(TASK_FIXTURE_ARGUMENTS["tres"] * 2, _task.arguments.tres.processed)
+            self.assertEqual(6, len(processed))
+
+        # processors have to opt in to reuse their results
+        self.assertFalse(BaseProcessor.is_cacheable({}))
+        self.assertFalse(ProcessorFixture.is_cacheable({"factor": "<arg: tres.initial>_<expr: 2>"}))
+        self.assertTrue(ProcessorFixture.is_cacheable({"factor": "<arg: tres.initial>"}))
+
+    def test_process_arguments_with_shared_values(self):
+        """ check if processors altering values in place won't affect the parent or sibling tasks """
+        class ProcessorFixture(BaseProcessor):
+            def process(self, argument_name, argument_value, parameters):
+                argument_value.append(4)
+                return argument_value
+
+        definitions = [
+            ProcessorDefinition("ProcessorFixture", scope=["test_argument.initial"]),
+            ProcessorDefinition("ProcessorFixture", scope=["test_argument.processed"])
+        ]
+        arguments = Arguments(TASK_FIXTURE_ARGUMENTS)
+        shared_value = arguments.test_argument.initial
+
+        with patch.object(Plugins, "processor", return_value=ProcessorFixture), \
+                patch.object(TaskFixtureWithScopedArgumentProcessors, "argument_processors", new=definitions):
+            siblings = [TaskFixtureWithScopedArgumentProcessors(arguments.copy()) for _ in range(2)]
+
+        self.assertEqual([1, 2, 3], shared_value)
+        self.assertIs(shared_value, arguments.test_argument.processed)
+        for sibling in siblings:
+            # the first processor works on a copy of the initial value and the
+            # second one on the processed value the first one returned
+            self.assertEqual([1, 2, 3, 4, 4], sibling.arguments.test_argument.processed)
+            self.assertIsNot(shared_value, sibling.arguments.test_argument.initial)
+        self.assertIsNot(siblings[0].arguments.test_argument.processed, siblings[1].arguments.test_argument.processed)
+
+    @patch("jobtronaut.author.plugins.PLUGIN_PATH", new=[os.path.dirname(tasks.__file__)])
+    def test_hierarchy_planner(self):
+        """ check if the planned hierarchy is identical to the recursively expanded one """
+        Plugins().initialize()
+
+        def _get_tcl(enable_planner, build):
+            with patch("jobtronaut.author.task.ENABLE_HIERARCHY_PLANNER", new=enable_planner):
+                tcl = build()
+            # ids depend on the order of creation, so we number them by their first occurrence
+            ids = {}
+            return re.sub(
+                r"[0-9a-f]{32}-[0-9]+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}",
+                lambda match: str(ids.setdefault(match.group(0), len(ids))),
+                tcl
+            )
+
+        def _expand():
+            dumped = []
+            mapping = dict.fromkeys(
+                ["HierarchyFixture", "HierarchyCommandFixture", "HierarchyScriptFixture"], TASK_FIXTURE_ARGUMENTS
+            )
+            with patch.object(Job, "dump_job", new=lambda job, filepath: dumped.append(job.asTcl())):
+                Task.__EXPAND__("SerialHierarchyFixture", mapping)
+            return dumped[0]
+
+        builds = [
+            lambda name=name: Job(name, TASK_FIXTURE_ARGUMENTS).asTcl()
+            for name in ("SerialHierarchyFixture", "HierarchyFixture", "HierarchyCommandFixture", "TaskFixture")
+        ]
+        builds.append(
+            lambda: Job("HierarchyFixture", TASK_FIXTURE_ARGUMENTS, compact_hierarchy=False, append_instances=False)
+            .asTcl()
+        )
+        builds.append(_expand)
+
+        for build in builds:
+            self.assertEqual(_get_tcl(False, build), _get_tcl(True, build))
+        self.assertIn("HierarchyScriptFixture", _get_tcl(False, builds[0]))
+
+    @patch("jobtronaut.author.plugins.PLUGIN_PATH", new=[os.path.dirname(tasks.__file__)])
+    def test_groups(self):
+        """ check if serial and parallel dependencies are grouped by our shared structural tasks """
+        Plugins().initialize()
+        job = Job("SerialHierarchyFixture", TASK_FIXTURE_ARGUMENTS, compact_hierarchy=False)
+
+        groups = [task for task in job.iter_tasks() if isinstance(task, (Serial, Parallel))]
+        self.assertSetEqual(set([Serial, Parallel]), set([group.__class__ for group in groups]))
+        for group in groups:
+            self.assertEqual(group.TITLE, group.title)
+            self.assertEqual(group.serial, bool(group.serialsubtasks))
+            self.assertNotIsInstance(group, Task)
+
+    @patch("jobtronaut.author.plugins.PLUGIN_PATH", new=[os.path.dirname(tasks.__file__)])
+    def test_capabilities_cache(self):
+        """ check if each class gets only inspected once when building a large job """
+        Plugins().initialize()
+        _CAPABILITIES.clear()
+        arguments = dict(TASK_FIXTURE_ARGUMENTS, test_argument=range(200))
+
+        with patch("jobtronaut.author.task.dir", create=True, wraps=dir) as dir_mock:
+            job = Job("SerialHierarchyFixture", arguments)
+
+        self.assertGreater(len(list(job.iter_cmds())), 200)
+        inspected = [call[0][0] for call in dir_mock.call_args_list]
+        self.assertTrue(inspected)
+        self.assertEqual(len(set(inspected)), len(inspected))
+
 
 class TestTaskOverrides(TestCase):
 
@@ -0,0 +1,98 @@
+# ######################################################################################################################
+#  Copyright 2020 TRIXTER GmbH                                                                                         #
+#                                                                                                                      #
+#  Redistribution and use in source and binary forms, with or without modification, are permitted provided             #
+#  that the following conditions are met:                                                                              #
+#                                                                                                                      #
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following #
+#  disclaimer.                                                                                                         #
+#                                                                                                                      #
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the        #
+#  following disclaimer in the documentation and/or other materials provided with the distribution.                    #
+#                                                                                                                      #
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote     #
+#  products derived from this software without specific prior written permission.                                      #
+#                                                                                                                      #
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,  #
+#  INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE   #
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,  #
+#  SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS        #
+#  OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF           #
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY    #
+#  OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.                                 #
+# ######################################################################################################################
+
+""" Benchmarks
+
+The benchmarks are quite expensive, so they will only run if the
+`JOBTRONAUT_RUN_BENCHMARKS` env var is set. Timings depend on the
+machine and its load, so they are only reported and never asserted.
+"""
+
+import os
+import sys
+import time
+import traceback
+import unittest
+
+from .. import TestCase
+
+
+RUN_BENCHMARKS = bool(os.getenv("JOBTRONAUT_RUN_BENCHMARKS"))
+
+
+def measure(func, *args, **kwargs):
+    """ runs the given callable within a forked process and measures it
+
+    Running it in a separate process ensures that the peak memory usage
+    of one measurement doesn't hide the peak of another one.
+
+    Args:
+        func (callable): the function to measure
+        *args: arguments that will be passed to the function
+        **kwargs: keyword arguments that will be passed to the function
+
+    Returns:
+        tuple: the wall time in seconds and the peak RSS in kilobytes
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+
+    if pid == 0:
+        os.close(read_fd)
+        exitcode = 0
+        start = time.time()
+        try:
+            func(*args, **kwargs)
+        except:
+            traceback.print_exc()
+            exitcode = 1
+        os.write(write_fd, repr(time.time() - start))
+        os.close(write_fd)
+        os._exit(exitcode)
+
+    os.close(write_fd)
+    elapsed = os.read(read_fd, 64)
+    os.close(read_fd)
+    _, status, rusage = os.wait4(pid, 0)
+    assert status == 0, "Measured function failed."
+
+    return float(elapsed), rusage.ru_maxrss
+
+
+def report(title, results):
+    """ prints the given measurements as a simple table
+
+    Args:
+        title (str): title of the benchmark
+        results (:obj:`list` of :obj:`tuple`): label, seconds and peak RSS in kilobytes
+    """
+    sys.stdout.write("\n{}\n{}\n".format(title, "=" * len(title)))
+    for label, seconds, peak_rss in results:
+        sys.stdout.write("{0:<40}{1:>10.3f} s{2:>12} KB\n".format(label, seconds, peak_rss))
+    sys.stdout.flush()
+
+
+@unittest.skipUnless(RUN_BENCHMARKS, "Set JOBTRONAUT_RUN_BENCHMARKS to run the benchmarks.")
+class BenchmarkCase(TestCase):
+    """ base class for all benchmarks """
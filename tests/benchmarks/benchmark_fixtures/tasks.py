@@ -0,0 +1,81 @@
+# ######################################################################################################################
+#  Copyright 2020 TRIXTER GmbH                                                                                         #
+#                                                                                                                      #
+#  Redistribution and use in source and binary forms, with or without modification, are permitted provided             #
+#  that the following conditions are met:                                                                              #
+#                                                                                                                      #
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following #
+#  disclaimer.                                                                                                         #
+#                                                                                                                      #
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the        #
+#  following disclaimer in the documentation and/or other materials provided with the distribution.                    #
+#                                                                                                                      #
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote     #
+#  products derived from this software without specific prior written permission.                                      #
+#                                                                                                                      #
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,  #
+#  INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE   #
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,  #
+#  SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS        #
+#  OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF           #
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY    #
+#  OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.                                 #
+# ######################################################################################################################
+
+from jobtronaut.author import Task
+
+
+class BenchmarkCommandTask(Task):
+    """ a simple command task that will be created per element """
+
+    def cmd(self):
+        return ["/bin/echo", str(self.elements.processed)]
+
+
+class BenchmarkRootTask(Task):
+    """ the root task that fans out its elements to the command tasks """
+    elements_id = "frames"
+    flags = Task.Flags.PER_ELEMENT
+    required_tasks = ["BenchmarkCommandTask"]
+
+
+def get_job_arguments(elements_count):
+    """ get arguments that look like the arguments of a production job
+
+    Args:
+        elements_count (int): number of elements the root task will fan out
+
+    Returns:
+        dict: job arguments
+    """
+    return {
+        "frames": range(1001, 1001 + elements_count),
+        "shots": {
+            "sh{:04d}".format(i): {
+                "frames": range(1001, 1101),
+                "path": "/some/project/shots/sh{:04d}/render".format(i)
+            }
+            for i in range(100)
+        }
+    }
+
+
+class BenchmarkScriptTask(Task):
+    """ a script task that will be created per element """
+
+    def cmd(self):
+        return ["/usr/bin/python", "-c"]
+
+    def script(self):
+        pass
+
+
+class BenchmarkOtherScriptTask(BenchmarkScriptTask):
+    """ another script task that will be created per element using the same arguments """
+
+
+class BenchmarkScriptRootTask(Task):
+    """ the root task that fans out its elements to the script tasks """
+    elements_id = "frames"
+    flags = Task.Flags.PER_ELEMENT
+    required_tasks = ["BenchmarkScriptTask", "BenchmarkOtherScriptTask"]
@@ -0,0 +1,141 @@
+# ######################################################################################################################
+#  Copyright 2020 TRIXTER GmbH                                                                                         #
+#                                                                                                                      #
+#  Redistribution and use in source and binary forms, with or without modification, are permitted provided             #
+#  that the following conditions are met:                                                                              #
+#                                                                                                                      #
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following #
+#  disclaimer.                                                                                                         #
+#                                                                                                                      #
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the        #
+#  following disclaimer in the documentation and/or other materials provided with the distribution.                    #
+#                                                                                                                      #
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote     #
+#  products derived from this software without specific prior written permission.                                      #
+#                                                                                                                      #
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,  #
+#  INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE   #
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,  #
+#  SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS        #
+#  OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF           #
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY    #
+#  OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.                                 #
+# ######################################################################################################################
+
+import json
+import os
+import shutil
+import tempfile
+import uuid
+
+from mock import patch
+
+from jobtronaut.author import (
+    Arguments,
+    Job,
+    Task
+)
+from jobtronaut.author.argument import (
+    read_arguments_cache,
+    write_arguments_cache
+)
+from jobtronaut.author.plugins import Plugins
+
+from . import (
+    BenchmarkCase,
+    measure,
+    report
+)
+from .benchmark_fixtures import tasks
+
+
+# each element results in two script tasks using identical arguments
+ELEMENTS_COUNT = 2500
+# number of commands that read their arguments from the cache
+READS_COUNT = 1000
+
+
+def _dump_legacy(job, filepath):
+    with open(filepath, "w") as f:
+        json.dump(job.arguments_cache, f)
+
+
+def _dump(job, filepath):
+    job.dump_arguments_cache(filepath, force=True)
+
+
+def _read_legacy(filepath, keys):
+    for key in keys:
+        with open(filepath, "r") as f:
+            json.load(f)[key]
+
+
+def _read(filepath, keys):
+    for key in keys:
+        read_arguments_cache(filepath, key)
+
+
+class TestArgumentsCacheBenchmark(BenchmarkCase):
+
+    @classmethod
+    @patch("jobtronaut.author.plugins.PLUGIN_PATH", new=[os.path.dirname(tasks.__file__)])
+    def setUpClass(cls):
+        Plugins().initialize()
+
+    @patch("jobtronaut.author.task.EXECUTABLE_RESOLVER", new=lambda x: x)
+    @patch("jobtronaut.author.task.ARGUMENTS_SERIALIZED_MAX_LENGTH", new=0)
+    def test_dump_arguments_cache(self):
+        """ compare the arguments cache of a job using random keys with the content addressed one """
+        arguments = tasks.get_job_arguments(ELEMENTS_COUNT)
+        with patch.object(Task, "_generate_argument_key", new=staticmethod(lambda x: str(uuid.uuid4()))):
+            legacy_job = Job("BenchmarkScriptRootTask", arguments)
+        job = Job("BenchmarkScriptRootTask", arguments)
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        legacy_file = os.path.join(directory, "legacy.json")
+        cache_file = os.path.join(directory, "arguments.cache")
+
+        results = []
+        for label, dump, _job, filepath in (
+                ("json with random keys", _dump_legacy, legacy_job, legacy_file),
+                ("indexed with content hash keys", _dump, job, cache_file)
+        ):
+            measured = measure(dump, _job, filepath)
+            results.append(
+                ("{0} ({1} bytes)".format(label, os.path.getsize(filepath)), ) + measured
+            )
+
+        report("Dump arguments cache of {} tasks".format(ELEMENTS_COUNT * 2), results)
+
+        self.assertEqual(ELEMENTS_COUNT * 2, len(legacy_job.arguments_cache))
+        self.assertEqual(ELEMENTS_COUNT, len(job.arguments_cache))
+        self.assertLess(os.path.getsize(cache_file) * 1.9, os.path.getsize(legacy_file))
+
+    def test_read_arguments_cache(self):
+        """ compare reading single records from a json arguments cache with the indexed one """
+        arguments_cache = {
+            str(uuid.uuid4()).replace("-", ""): Arguments({"frames": [i], "shots": range(1000)}).serialized()
+            for i in xrange(ELEMENTS_COUNT * 2)
+        }
+        keys = arguments_cache.keys()[:READS_COUNT]
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        legacy_file = os.path.join(directory, "legacy.json")
+        cache_file = os.path.join(directory, "arguments.cache")
+        with open(legacy_file, "w") as f:
+            json.dump(arguments_cache, f)
+        with open(cache_file, "w") as f:
+            write_arguments_cache(arguments_cache, f)
+
+        legacy = measure(_read_legacy, legacy_file, keys)
+        indexed = measure(_read, cache_file, keys)
+
+        report(
+            "Read {0} records from a cache of {1} records".format(READS_COUNT, len(arguments_cache)),
+            [
+                ("json.load per record", ) + legacy,
+                ("indexed lookup per record", ) + indexed
+            ]
+        )
@@ -0,0 +1,63 @@
+# ######################################################################################################################
+#  Copyright 2020 TRIXTER GmbH                                                                                         #
+#                                                                                                                      #
+#  Redistribution and use in source and binary forms, with or without modification, are permitted provided             #
+#  that the following conditions are met:                                                                              #
+#                                                                                                                      #
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following #
+#  disclaimer.                                                                                                         #
+#                                                                                                                      #
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the        #
+#  following disclaimer in the documentation and/or other materials provided with the distribution.                    #
+#                                                                                                                      #
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote     #
+#  products derived from this software without specific prior written permission.                                      #
+#                                                                                                                      #
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,  #
+#  INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE   #
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,  #
+#  SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS        #
+#  OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF           #
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY    #
+#  OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.                                 #
+# ######################################################################################################################
+
+import importlib
+import sys
+
+from mock import patch
+
+from . import (
+    BenchmarkCase,
+    measure,
+    report
+)
+
+
+def _import(*names):
+    """ imports the given modules like a fresh process would do, but fails on any engine traffic """
+    for name in list(sys.modules):
+        if name.split(".")[0] == "jobtronaut" and name not in ("jobtronaut", "jobtronaut.constants"):
+            del sys.modules[name]
+
+    with patch("socket.create_connection", side_effect=AssertionError("Unexpected connection during import.")):
+        for name in names:
+            importlib.import_module(name)
+
+    assert sys.modules["jobtronaut.query"]._SESSION.round_trips == 0, "Engine got queried during import."
+
+
+class TestImportTimeBenchmark(BenchmarkCase):
+
+    def test_cmdline_import(self):
+        """ check how long it takes to import the command line modules without talking to the engine """
+        cmdline = measure(_import, "jobtronaut.cmdline", "jobtronaut.query")
+        query = measure(_import, "jobtronaut.cmdline", "jobtronaut.query.arguments", "jobtronaut.query.command")
+
+        report(
+            "Import the command line modules",
+            [
+                ("jobtronaut.cmdline", ) + cmdline,
+                ("jobtronaut.cmdline and query modules", ) + query
+            ]
+        )
@@ -0,0 +1,76 @@
+# ######################################################################################################################
+#  Copyright 2020 TRIXTER GmbH                                                                                         #
+#                                                                                                                      #
+#  Redistribution and use in source and binary forms, with or without modification, are permitted provided             #
+#  that the following conditions are met:                                                                              #
+#                                                                                                                      #
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following #
+#  disclaimer.                                                                                                         #
+#                                                                                                                      #
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the        #
+#  following disclaimer in the documentation and/or other materials provided with the distribution.                    #
+#                                                                                                                      #
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote     #
+#  products derived from this software without specific prior written permission.                                      #
+#                                                                                                                      #
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,  #
+#  INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE   #
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,  #
+#  SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS        #
+#  OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF           #
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY    #
+#  OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.                                 #
+# ######################################################################################################################
+
+import logging
+import os
+
+from mock import patch
+
+from jobtronaut.author import Job
+from jobtronaut.author.plugins import Plugins
+from jobtronaut.constants import LOGGING_NAMESPACE
+
+from . import (
+    BenchmarkCase,
+    measure,
+    report
+)
+from .benchmark_fixtures import tasks
+
+
+ELEMENTS_COUNT = 2000
+
+
+def _build_job(level):
+    logger = logging.getLogger(LOGGING_NAMESPACE)
+    handler = logging.StreamHandler(open(os.devnull, "w"))
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    try:
+        Job("BenchmarkRootTask", tasks.get_job_arguments(ELEMENTS_COUNT))
+    finally:
+        logger.removeHandler(handler)
+        handler.stream.close()
+
+
+class TestLoggingBenchmark(BenchmarkCase):
+
+    @classmethod
+    @patch("jobtronaut.author.plugins.PLUGIN_PATH", new=[os.path.dirname(tasks.__file__)])
+    def setUpClass(cls):
+        Plugins().initialize()
+
+    @patch("jobtronaut.author.task.EXECUTABLE_RESOLVER", new=lambda x: x)
+    def test_build_job(self):
+        """ compare building a job with enabled and disabled debug logging """
+        debug = measure(_build_job, logging.DEBUG)
+        info = measure(_build_job, logging.INFO)
+
+        report(
+            "Build {} tasks".format(ELEMENTS_COUNT * 2),
+            [
+                ("log level DEBUG", ) + debug,
+                ("log level INFO", ) + info
+            ]
+        )
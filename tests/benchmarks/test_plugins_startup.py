@@ -0,0 +1,138 @@
+# ######################################################################################################################
+#  Copyright 2020 TRIXTER GmbH                                                                                         #
+#                                                                                                                      #
+#  Redistribution and use in source and binary forms, with or without modification, are permitted provided             #
+#  that the following conditions are met:                                                                              #
+#                                                                                                                      #
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following #
+#  disclaimer.                                                                                                         #
+#                                                                                                                      #
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the        #
+#  following disclaimer in the documentation and/or other materials provided with the distribution.                    #
+#                                                                                                                      #
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote     #
+#  products derived from this software without specific prior written permission.                                      #
+#                                                                                                                      #
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,  #
+#  INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE   #
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,  #
+#  SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS        #
+#  OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF           #
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY    #
+#  OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.                                 #
+# ######################################################################################################################
+
+import os
+import shutil
+import tempfile
+
+from mock import patch
+
+from jobtronaut.author import Arguments
+from jobtronaut.author.plugins import (
+    Plugins,
+    Singleton
+)
+
+from . import (
+    BenchmarkCase,
+    measure,
+    report
+)
+from .benchmark_fixtures import tasks
+
+
+# number of additional plugin modules within our searchpath
+MODULES_COUNT = 300
+
+PLUGIN_TEMPLATE = """
+from jobtronaut.author import Task
+
+
+class GeneratedTask{0}(Task):
+
+    def cmd(self):
+        return ["/bin/echo", "{0}"]
+"""
+
+# additional methods per generated module, so compiling them becomes noticeable
+METHODS_COUNT = 50
+
+METHOD_TEMPLATE = """
+    def method_{0}(self, value):
+        if value > {0}:
+            return [_ * {0} for _ in range(value) if _ % 2]
+        return dict(value=value, index={0})
+"""
+
+
+def _run_script(lazy, plugin_path, manifest_path, serialized):
+    """ does what a farm command does when calling the script method of a task """
+    with patch("jobtronaut.author.plugins.PLUGIN_PATH", new=plugin_path), \
+            patch("jobtronaut.author.plugins.PLUGIN_MANIFEST_PATH_TEMPLATE", new=manifest_path), \
+            patch("jobtronaut.author.plugins.ENABLE_LAZY_PLUGIN_LOADING", new=lazy), \
+            patch.object(Singleton, "_initialized", False):
+        Plugins().task("BenchmarkScriptTask")(serialized).script()
+
+
+def _initialize(plugin_path, manifest_path, cache_dir):
+    """ sources all plugins like a fresh process would do """
+    with patch("jobtronaut.author.plugins.PLUGIN_PATH", new=plugin_path), \
+            patch("jobtronaut.author.plugins.PLUGIN_MANIFEST_PATH_TEMPLATE", new=manifest_path), \
+            patch("jobtronaut.author.plugins.PLUGIN_BYTECODE_CACHE_DIR_TEMPLATE", new=cache_dir), \
+            patch("jobtronaut.author.plugins.ENABLE_LAZY_PLUGIN_LOADING", new=False), \
+            patch.object(Singleton, "_initialized", False):
+        Plugins()
+
+
+class TestPluginsStartupBenchmark(BenchmarkCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls._plugin_dir = tempfile.mkdtemp()
+        cls._manifest_path = os.path.join(cls._plugin_dir, "manifest.json")
+        for index in range(MODULES_COUNT):
+            with open(os.path.join(cls._plugin_dir, "generated_tasks_{}.py".format(index)), "w") as f:
+                f.write(PLUGIN_TEMPLATE.format(index))
+                f.write("".join([METHOD_TEMPLATE.format(_) for _ in range(METHODS_COUNT)]))
+        cls._plugin_path = [os.path.dirname(tasks.__file__), cls._plugin_dir]
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls._plugin_dir)
+
+    def test_script_startup(self):
+        """ compare the cold start of a script command with eager and lazy plugin loading """
+        serialized = Arguments(tasks.get_job_arguments(1)).serialized()
+        args = (self._plugin_path, self._manifest_path, serialized)
+
+        eager = measure(_run_script, False, *args)
+        # the first run has to write the manifest
+        measure(_run_script, True, *args)
+        lazy = measure(_run_script, True, *args)
+
+        report(
+            "Start a script command with {} plugin modules".format(MODULES_COUNT + 1),
+            [
+                ("source all plugins", ) + eager,
+                ("source requested plugins only", ) + lazy
+            ]
+        )
+
+    def test_bytecode_cache(self):
+        """ compare sourcing all plugins with and without cached bytecode """
+        cache_dir = os.path.join(self._plugin_dir, "bytecode")
+        args = (self._plugin_path, self._manifest_path)
+
+        uncached = measure(_initialize, *(args + ("", )))
+        # the first run has to compile and cache all modules
+        measure(_initialize, *(args + (cache_dir, )))
+        cached = measure(_initialize, *(args + (cache_dir, )))
+
+        report(
+            "Source {} plugin modules".format(MODULES_COUNT + 1),
+            [
+                ("compile all modules", ) + uncached,
+                ("load cached bytecode", ) + cached
+            ]
+        )
@@ -0,0 +1,86 @@
+# ######################################################################################################################
+#  Copyright 2020 TRIXTER GmbH                                                                                         #
+#                                                                                                                      #
+#  Redistribution and use in source and binary forms, with or without modification, are permitted provided             #
+#  that the following conditions are met:                                                                              #
+#                                                                                                                      #
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following #
+#  disclaimer.                                                                                                         #
+#                                                                                                                      #
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the        #
+#  following disclaimer in the documentation and/or other materials provided with the distribution.                    #
+#                                                                                                                      #
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote     #
+#  products derived from this software without specific prior written permission.                                      #
+#                                                                                                                      #
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,  #
+#  INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE   #
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,  #
+#  SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS        #
+#  OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF           #
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY    #
+#  OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.                                 #
+# ######################################################################################################################
+
+import base64
+import pickle
+
+from jobtronaut.author import Arguments
+
+from . import (
+    BenchmarkCase,
+    measure,
+    report
+)
+from .benchmark_fixtures import tasks
+
+
+ELEMENTS_COUNT = 5000
+REPETITIONS = 50
+
+
+def _serialize_legacy(arguments):
+    return base64.b64encode(pickle.dumps(arguments))
+
+
+def _serialize_uncompressed(arguments):
+    return arguments.serialized(compress=False)
+
+
+def _serialize_compressed(arguments):
+    return arguments.serialized()
+
+
+def _encode(serialize, arguments):
+    for _ in xrange(REPETITIONS):
+        serialize(arguments)
+
+
+def _decode(serialized):
+    for _ in xrange(REPETITIONS):
+        Arguments(serialized)
+
+
+class TestSerializationBenchmark(BenchmarkCase):
+
+    def test_serialize(self):
+        """ compare size, encoding and decoding time of the legacy and the versioned serialization """
+        arguments = Arguments(tasks.get_job_arguments(ELEMENTS_COUNT))
+
+        encoding, decoding, sizes = [], [], []
+        for label, serialize in (
+                ("legacy protocol 0", _serialize_legacy),
+                ("highest protocol", _serialize_uncompressed),
+                ("highest protocol + zlib", _serialize_compressed)
+        ):
+            serialized = serialize(arguments)
+            sizes.append(len(serialized))
+            label = "{0} ({1} bytes)".format(label, len(serialized))
+            encoding.append((label, ) + measure(_encode, serialize, arguments))
+            decoding.append((label, ) + measure(_decode, serialized))
+
+        report("Serialize arguments of {} frames {} times".format(ELEMENTS_COUNT, REPETITIONS), encoding)
+        report("Deserialize arguments of {} frames {} times".format(ELEMENTS_COUNT, REPETITIONS), decoding)
+
+        self.assertLess(sizes[1], sizes[0])
+        self.assertLess(sizes[2], sizes[1])
@@ -0,0 +1,154 @@
+# ######################################################################################################################
+#  Copyright 2020 TRIXTER GmbH                                                                                         #
+#                                                                                                                      #
+#  Redistribution and use in source and binary forms, with or without modification, are permitted provided             #
+#  that the following conditions are met:                                                                              #
+#                                                                                                                      #
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following #
+#  disclaimer.                                                                                                         #
+#                                                                                                                      #
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the        #
+#  following disclaimer in the documentation and/or other materials provided with the distribution.                    #
+#                                                                                                                      #
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote     #
+#  products derived from this software without specific prior written permission.                                      #
+#                                                                                                                      #
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,  #
+#  INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE   #
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,  #
+#  SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS        #
+#  OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF           #
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY    #
+#  OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.                                 #
+# ######################################################################################################################
+
+import os
+import re
+import shutil
+import tempfile
+
+from mock import patch
+
+from .. import TestCase
+
+from jobtronaut.author import Arguments
+from jobtronaut.author.argument import (
+    read_arguments_cache_records,
+    write_arguments_cache
+)
+from jobtronaut.query.arguments import iter_arguments
+
+SCRIPT_TEMPLATE = "from jobtronaut.author.plugins import Plugins;Plugins().task(\"TaskFixture\")(\"{}\").script()"
+
+
+class _FakeQuery(object):
+    """ mimics the commands query including the paging by job and command id """
+
+    def __init__(self, commands):
+        self._commands = sorted(commands, key=lambda command: (command["jid"], command["cid"]))
+        self.searches = []
+
+    def commands(self, search, columns=(), sortby=(), limit=0, archive=False):
+        self.searches.append(search)
+        commands = self._commands
+        match = re.search(r"jid > (\d+) or \(jid = \d+ and cid > (\d+)\)", search)
+        if match:
+            last = (int(match.group(1)), int(match.group(2)))
+            commands = [command for command in commands if (command["jid"], command["cid"]) > last]
+        return commands[:limit] if limit else commands
+
+
+class TestIterArguments(TestCase):
+
+    def setUp(self):
+        self._cache_dir = tempfile.mkdtemp()
+        self._commands = []
+        self._expected = {}
+
+        for jid in (1, 2):
+            cache_file = os.path.join(self._cache_dir, "{}.cache".format(jid))
+            serialized = {}
+            for cid in range(5):
+                arguments = Arguments({"jid": jid, "cid": cid})
+                if cid % 2:
+                    serialized[str(cid)] = arguments.serialized()
+                    value = "{}:{}".format(cache_file, cid)
+                else:
+                    value = arguments.serialized()
+                self._commands.append(
+                    {"jid": jid, "tid": cid + 1, "cid": cid, "argv": ["python", "-c", SCRIPT_TEMPLATE.format(value)]}
+                )
+                self._expected[(jid, cid)] = arguments
+            with open(cache_file, "w") as f:
+                write_arguments_cache(serialized, f)
+
+        # a command that isn't a script of a task
+        self._commands.append({"jid": 2, "tid": 10, "cid": 10, "argv": ["/bin/echo", "test"]})
+
+    def tearDown(self):
+        shutil.rmtree(self._cache_dir)
+
+    def _iter_arguments(self, search, **kwargs):
+        query = _FakeQuery(self._commands)
+        with patch("jobtronaut.query.arguments.tractor_query", new=query), \
+                patch("jobtronaut.query.arguments.initialize_engine"):
+            return list(iter_arguments(search, **kwargs)), query.searches
+
+    def test_iter_arguments(self):
+        """ check if the arguments of all matching commands get fetched in pages and decoded """
+        with patch(
+            "jobtronaut.query.arguments.read_arguments_cache_records", wraps=read_arguments_cache_records
+        ) as read_mock:
+            records, searches = self._iter_arguments("jid in [1, 2]", processes=1, page_size=3)
+
+        self.assertEqual(4, len(searches))
+        self.assertEqual("jid in [1, 2]", searches[0])
+        self.assertEqual(len(self._expected), len(records))
+        for command, arguments, error in records:
+            self.assertIsNone(error)
+            self.assertDictEqual(self._expected[(command["jid"], command["cid"])], arguments)
+
+        # each cache file gets only read once per page
+        self.assertEqual(
+            [
+                (os.path.join(self._cache_dir, "1.cache"), ["1"]),
+                (os.path.join(self._cache_dir, "1.cache"), ["3"]),
+                (os.path.join(self._cache_dir, "2.cache"), ["1", "3"])
+            ],
+            sorted(call[0] for call in read_mock.call_args_list)
+        )
+
+        pooled_records, _ = self._iter_arguments("jid in [1, 2]", processes=2)
+        self.assertItemsEqual(
+            [(command["jid"], command["cid"]) for command, _, _ in records],
+            [(command["jid"], command["cid"]) for command, _, _ in pooled_records]
+        )
+
+    def test_streaming(self):
+        """ check if the arguments get yielded before all pages have been queried """
+        query = _FakeQuery(self._commands)
+        with patch("jobtronaut.query.arguments.tractor_query", new=query), \
+                patch("jobtronaut.query.arguments.initialize_engine"):
+            records = iter_arguments("jid in [1, 2]", processes=1, page_size=3)
+            next(records)
+            self.assertEqual(1, len(query.searches))
+            records.close()
+
+            del query.searches[:]
+            records = iter_arguments("jid in [1, 2]", processes=2, page_size=3)
+            next(records)
+            self.assertLess(len(query.searches), 4)
+            records.close()
+
+    def test_search(self):
+        """ check if job and task ids get converted into search clauses """
+        self.assertEqual(["jid=1"], self._iter_arguments("1", processes=1)[1])
+        self.assertEqual(["jid=1 and tid=2"], self._iter_arguments("1: 2", processes=1)[1])
+
+    def test_errors(self):
+        """ check if broken arguments get reported per command """
+        os.remove(os.path.join(self._cache_dir, "1.cache"))
+        records, _ = self._iter_arguments("jid=1", processes=1)
+
+        errors = dict([((command["jid"], command["cid"]), error) for command, _, error in records if error])
+        self.assertEqual([(1, 1), (1, 3)], sorted(errors))
@@ -0,0 +1,194 @@
+# ######################################################################################################################
+#  Copyright 2020 TRIXTER GmbH                                                                                         #
+#                                                                                                                      #
+#  Redistribution and use in source and binary forms, with or without modification, are permitted provided             #
+#  that the following conditions are met:                                                                              #
+#                                                                                                                      #
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following #
+#  disclaimer.                                                                                                         #
+#                                                                                                                      #
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the        #
+#  following disclaimer in the documentation and/or other materials provided with the distribution.                    #
+#                                                                                                                      #
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote     #
+#  products derived from this software without specific prior written permission.                                      #
+#                                                                                                                      #
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,  #
+#  INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE   #
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,  #
+#  SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS        #
+#  OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF           #
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY    #
+#  OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.                                 #
+# ######################################################################################################################
+
+import os
+import time
+
+from mock import patch
+
+from .. import TestCase
+
+from jobtronaut.query.command import (
+    LOCAL_STATE_ENV,
+    _LOCAL_STATES,
+    get_local_state,
+    get_local_state_env,
+    neutralize_commands
+)
+
+
+class _FakeQuery(object):
+    """ mimics the query api, the first attempts to change an attribute fail for the flaky commands """
+
+    class PasswordRequired(Exception):
+        pass
+
+    class TractorQueryError(Exception):
+        pass
+
+    def __init__(self, count, flaky=(), failures=1):
+        self._commands = [{"jid": 1, "tid": 2, "cid": cid, "argv": ["/bin/echo", str(cid)]} for cid in range(count)]
+        self._failures = dict((cid, failures) for cid in flaky)
+        self._active = []
+        self.searches = []
+        self.changes = {}
+        self.concurrent_requests = 0
+
+    def commands(self, search):
+        self.searches.append(search)
+        return self._commands
+
+    def cattr(self, command, key, value):
+        # remember how many requests have been sent at the same time
+        self._active.append(command["cid"])
+        self.concurrent_requests = max(self.concurrent_requests, len(self._active))
+        time.sleep(0.001)
+        self._active.remove(command["cid"])
+
+        if self._failures.get(command["cid"]):
+            self._failures[command["cid"]] -= 1
+            raise self.TractorQueryError("engine is busy")
+        self.changes[command["cid"]] = (key, value)
+
+
+class TestNeutralizeCommands(TestCase):
+
+    def _neutralize(self, query, **kwargs):
+        with patch("jobtronaut.query.tractor_query", new=query), \
+                patch("jobtronaut.query.initialize_engine") as initialize_mock, \
+                patch("jobtronaut.query.command.time") as time_mock:
+            count = neutralize_commands("1", "2", **kwargs)
+        initialize_mock.assert_any_call()
+        return count, time_mock.sleep
+
+    def test_neutralize_commands(self):
+        """ check if all commands of a task get neutralized with a single query """
+        query = _FakeQuery(20)
+        count, sleep_mock = self._neutralize(query, threads=4)
+
+        self.assertEqual(20, count)
+        self.assertEqual(["jid='1' and tid='2'"], query.searches)
+        self.assertEqual(range(20), sorted(query.changes))
+        self.assertEqual(
+            ("argv", ["/bin/echo", "Command has been neutralised:", "/bin/echo 3"]),
+            query.changes[3]
+        )
+        self.assertFalse(sleep_mock.called)
+
+        query = _FakeQuery(5)
+        self.assertEqual(5, self._neutralize(query, threads=1)[0])
+        self.assertEqual(range(5), sorted(query.changes))
+        self.assertEqual(1, query.concurrent_requests)
+
+    def test_default_threads(self):
+        """ check if the shared engine client only gets used by a single thread by default """
+        query = _FakeQuery(20)
+        with patch("jobtronaut.query.command.ThreadPool") as pool_mock:
+            self.assertEqual(20, self._neutralize(query)[0])
+
+        self.assertFalse(pool_mock.called)
+        self.assertEqual(range(20), sorted(query.changes))
+        self.assertEqual(1, query.concurrent_requests)
+
+    def test_retries(self):
+        """ check if failed changes get retried with an exponential backoff """
+        query = _FakeQuery(10, flaky=[2, 7], failures=2)
+        count, sleep_mock = self._neutralize(query, retries=2, backoff=1.0)
+
+        self.assertEqual(range(10), sorted(query.changes))
+        self.assertEqual([1.0, 1.0, 2.0, 2.0], sorted(call[0][0] for call in sleep_mock.call_args_list))
+
+        query = _FakeQuery(10, flaky=[2], failures=3)
+        with self.assertRaises(_FakeQuery.TractorQueryError):
+            self._neutralize(query, retries=2)
+        self.assertNotIn(2, query.changes)
+
+
+class _FakeLocalStateQuery(object):
+
+    def __init__(self, local):
+        self._local = local
+        self.searches = []
+
+    def commands(self, search, columns=()):
+        self.searches.append(search)
+        return [{"local": self._local}]
+
+
+class TestGetLocalState(TestCase):
+
+    def _get_local_states(self, query, job_id="1", command_ids=("2", ), environ=None):
+        with patch("jobtronaut.query.tractor_query", new=query), \
+                patch("jobtronaut.query.initialize_engine"), \
+                patch.dict("jobtronaut.query.command._LOCAL_STATES", clear=True), \
+                patch.dict(os.environ, environ or {}, clear=True):
+            states = [get_local_state(job_id, command_id) for command_id in command_ids]
+            return states, os.environ.get(LOCAL_STATE_ENV)
+
+    def test_cached_state(self):
+        """ check if the local state gets only queried once per command """
+        query = _FakeLocalStateQuery(local=True)
+        states, passed_state = self._get_local_states(query, command_ids=["2"] * 100 + ["3"])
+
+        self.assertEqual([True] * 101, states)
+        self.assertEqual(["jid=1 and cid=2", "jid=1 and cid=3"], query.searches)
+        # the state must never end up in our own environment
+        self.assertIsNone(passed_state)
+
+        states, _ = self._get_local_states(query, job_id="", command_ids=[""])
+        self.assertEqual([False], states)
+        self.assertEqual(2, len(query.searches))
+
+    def test_passed_state(self):
+        """ check if the local state passed by a parent process will be used """
+        query = _FakeLocalStateQuery(local=True)
+
+        for environ, expected in (({LOCAL_STATE_ENV: "1:2:0"}, False), ({LOCAL_STATE_ENV: "1:2:1"}, True)):
+            states, _ = self._get_local_states(query, command_ids=["2"] * 10, environ=environ)
+            self.assertEqual([expected] * 10, states)
+        self.assertEqual([], query.searches)
+
+        # states of other commands or without a command mustn't be used
+        for passed_state in ("1:3:0", "0", "true", "1:2:true"):
+            del query.searches[:]
+            states, _ = self._get_local_states(query, environ={LOCAL_STATE_ENV: passed_state})
+            self.assertEqual([True], states)
+            self.assertEqual(["jid=1 and cid=2"], query.searches)
+
+    def test_local_state_env(self):
+        """ check if the local state can be passed to a child process explicitly """
+        query = _FakeLocalStateQuery(local=True)
+        with patch("jobtronaut.query.tractor_query", new=query), \
+                patch("jobtronaut.query.initialize_engine"), \
+                patch.dict("jobtronaut.query.command._LOCAL_STATES", clear=True), \
+                patch.dict(os.environ, {}, clear=True):
+            environ = get_local_state_env("1", "2")
+            self.assertEqual({LOCAL_STATE_ENV: "1:2:1"}, environ)
+            self.assertNotIn(LOCAL_STATE_ENV, os.environ)
+
+            # a child process gets the state without querying it again
+            os.environ.update(environ)
+            _LOCAL_STATES.clear()
+            self.assertTrue(get_local_state("1", "2"))
+        self.assertEqual(["jid=1 and cid=2"], query.searches)
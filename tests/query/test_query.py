@@ -0,0 +1,203 @@
+# ######################################################################################################################
+#  Copyright 2020 TRIXTER GmbH                                                                                         #
+#                                                                                                                      #
+#  Redistribution and use in source and binary forms, with or without modification, are permitted provided             #
+#  that the following conditions are met:                                                                              #
+#                                                                                                                      #
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following #
+#  disclaimer.                                                                                                         #
+#                                                                                                                      #
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the        #
+#  following disclaimer in the documentation and/or other materials provided with the distribution.                    #
+#                                                                                                                      #
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote     #
+#  products derived from this software without specific prior written permission.                                      #
+#                                                                                                                      #
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,  #
+#  INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE   #
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,  #
+#  SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS        #
+#  OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF           #
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY    #
+#  OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.                                 #
+# ######################################################################################################################
+
+import os
+import shutil
+import tempfile
+import time
+
+from mock import patch
+
+from .. import TestCase
+
+from jobtronaut.query import (
+    _EngineSession,
+    initialize_engine,
+    run_query
+)
+
+
+class _StubEngineClient(object):
+    tsid = None
+
+
+class _StubEngineQuery(object):
+    """ mimics the query api of an engine that only accepts known sessions """
+
+    class PasswordRequired(Exception):
+        pass
+
+    class TractorQueryError(Exception):
+        pass
+
+    def __init__(self, client):
+        self.client = client
+        self.sessions = set()
+        self.params = {}
+        self.logins = 0
+
+    def setEngineClientParam(self, **kwargs):
+        self.params = kwargs
+
+    def jobs(self, search):
+        return self._query()
+
+    def commands(self, search):
+        return self._query()
+
+    def _query(self):
+        if self.client.tsid is None:
+            if not self.params:
+                raise self.PasswordRequired()
+            self.logins += 1
+            self.client.tsid = "session{}".format(self.logins)
+            self.sessions.add(self.client.tsid)
+        elif self.client.tsid not in self.sessions:
+            raise self.TractorQueryError("unknown session")
+        return []
+
+
+class TestEngineSession(TestCase):
+
+    def setUp(self):
+        self._cache_dir = tempfile.mkdtemp()
+        self._client = _StubEngineClient()
+        self._query = _StubEngineQuery(self._client)
+        self._patches = [
+            patch("jobtronaut.query.ModuleEngineClient", new=self._client),
+            patch("jobtronaut.query.tractor_query", new=self._query),
+            patch("jobtronaut.constants.TRACTOR_ENGINE", new="localhost:5600"),
+            patch("jobtronaut.constants.TRACTOR_ENGINE_SESSION_CACHE_DIR_TEMPLATE", new=self._cache_dir),
+            patch("jobtronaut.constants.TRACTOR_ENGINE_SESSION_TTL", new=3600)
+        ]
+        for _patch in self._patches:
+            _patch.start()
+
+    def tearDown(self):
+        for _patch in reversed(self._patches):
+            _patch.stop()
+        shutil.rmtree(self._cache_dir)
+
+    def _new_process(self):
+        """ simulate a new process, which neither knows the session nor the validation state """
+        self._client.tsid = None
+        return patch("jobtronaut.query._SESSION", new=_EngineSession())
+
+    def test_initialize_engine(self):
+        """ check if a session gets validated only once and will be reused by successive processes """
+        with self._new_process() as session:
+            for _ in range(3):
+                initialize_engine()
+            self.assertEqual(1, session.round_trips)
+            self.assertEqual(1, self._query.logins)
+            self.assertEqual("localhost", self._query.params["hostname"])
+            self.assertEqual(5600, self._query.params["port"])
+
+        with self._new_process() as session:
+            initialize_engine()
+            initialize_engine()
+            self.assertEqual(1, session.round_trips)
+            self.assertEqual(1, self._query.logins)
+
+        # an expired session on the engine requires a new login
+        self._query.sessions.clear()
+        with self._new_process() as session:
+            initialize_engine()
+            self.assertEqual(2, session.round_trips)
+            self.assertEqual(2, self._query.logins)
+            self.assertIn(self._client.tsid, self._query.sessions)
+
+        with self._new_process() as session:
+            initialize_engine(invalidate_session=True)
+            self.assertEqual(1, session.round_trips)
+            self.assertEqual(3, self._query.logins)
+
+    def test_expired_session(self):
+        """ check if a long running process logs in again once the engine rejects its session """
+        with self._new_process() as session:
+            initialize_engine()
+            self.assertEqual([], run_query(self._query.commands, "jid=1"))
+            self.assertEqual(1, self._query.logins)
+
+            self._query.sessions.clear()
+            self.assertEqual([], run_query(self._query.commands, "jid=1"))
+            self.assertEqual(2, self._query.logins)
+            self.assertEqual(3, session.round_trips)
+
+            # queries that fail for other reasons won't be retried
+            def _invalid(search):
+                raise self._query.TractorQueryError("invalid search")
+
+            with self.assertRaises(self._query.TractorQueryError):
+                run_query(_invalid, "jid=")
+            self.assertEqual(2, self._query.logins)
+
+    def test_session_ttl(self):
+        """ check if the session gets validated again after the TTL elapsed and the cache keeps its timestamp """
+        with self._new_process() as session:
+            initialize_engine()
+            path = _EngineSession._get_cache_path("localhost:5600", "unknown_user")
+            mtime = int(time.time()) - 60
+            os.utime(path, (mtime, mtime))
+
+            with patch("time.time", return_value=time.time() + 3601):
+                initialize_engine()
+                initialize_engine()
+            self.assertEqual(2, session.round_trips)
+            self.assertEqual(1, self._query.logins)
+
+        with self._new_process() as session:
+            initialize_engine()
+            self.assertEqual(1, session.round_trips)
+            self.assertEqual(1, self._query.logins)
+        self.assertEqual(mtime, os.path.getmtime(path))
+
+    def test_disabled_cache(self):
+        """ check if we login again in each process when caching sessions on disk is disabled """
+        with patch("jobtronaut.constants.TRACTOR_ENGINE_SESSION_TTL", new=0):
+            for logins in (1, 2):
+                with self._new_process() as session:
+                    initialize_engine()
+                    initialize_engine()
+                    self.assertEqual(1, session.round_trips)
+                    self.assertEqual(logins, self._query.logins)
+
+    def test_foreign_cache(self):
+        """ check if sessions within a directory of somebody else or others can write to won't be used """
+        planted = "planted_session"
+        self._query.sessions.add(planted)
+        path = _EngineSession._get_cache_path("localhost:5600", "unknown_user")
+
+        for mode, uid in ((0770, os.getuid()), (0700, os.getuid() + 1)):
+            os.chmod(self._cache_dir, mode)
+            with open(path, "w") as f:
+                f.write(planted)
+
+            with patch("os.getuid", return_value=uid), self._new_process():
+                initialize_engine()
+            self.assertNotEqual(planted, self._client.tsid)
+            with open(path, "r") as f:
+                self.assertEqual(planted, f.read())
+
+        self.assertEqual(2, self._query.logins)
@@ -22,7 +22,13 @@
 #  OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.                                 #
 # ######################################################################################################################
 
+import errno
+import getpass
 import logging
+import os
+import socket
+import stat
+import tempfile
 import time
 
 from .constants import LOGGING_NAMESPACE
@@ -69,4 +75,55 @@ class CallIntervalLimiter(object):
             )
             result = self._default
 
-        return result
\ No newline at end of file
+        return result
+
+
+def resolve_path_template(template):
+    """ Resolves the placeholders {user}, {host} and {tmpdir} of a path template.
+
+    Args:
+        template (str): path template
+
+    Returns:
+        str: resolved path or an empty string if no template was configured
+
+    """
+    if not template:
+        return ""
+    return template.format(
+        user=getpass.getuser(),
+        host=socket.gethostname(),
+        tmpdir=tempfile.gettempdir()
+    )
+
+
+def ensure_private_directory(path):
+    """ Creates a directory only the current user has access to or checks an existing one.
+
+    We load code and credentials from our caches, so nobody else must be able to place files in them.
+
+    Args:
+        path (str): path to the directory
+
+    Returns:
+        bool: True if the directory belongs to the current user and is neither group nor world writable
+
+    """
+    try:
+        os.makedirs(path, 0700)
+    except OSError as error:
+        if error.errno != errno.EEXIST:
+            _LOG.debug("Unable to create directory '%s'.", path, exc_info=True)
+            return False
+
+    try:
+        # don't follow symlinks, somebody else might have created one pointing to their directory
+        status = os.lstat(path)
+    except OSError:
+        return False
+
+    if not stat.S_ISDIR(status.st_mode) or status.st_uid != os.getuid() \
+            or status.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        _LOG.warning("'%s' is no directory of the current user or writable by others. Ignore it.", path)
+        return False
+    return True